@@ -0,0 +1,36 @@
+"""
+Utility functions for Python programming.
+
+Subpackages are imported on first access, so `import vicutils` stays cheap
+and using one subpackage never loads the dependencies of another. This file
+is maintained by hand: the docs workflow leaves __init__ files that define
+__getattr__ alone.
+"""
+
+import importlib
+
+
+_SUBPACKAGES = ("geometry", "pdf", "printBin")
+
+
+def __getattr__(name: str):
+    """
+    Import a subpackage on first access.
+    
+    Args:
+        name: Subpackage name
+        
+    Returns:
+        The imported subpackage
+        
+    Raises:
+        AttributeError: If the name is not a subpackage
+    """
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the package's names, including subpackages not loaded yet."""
+    return sorted(set(globals()) | set(_SUBPACKAGES))
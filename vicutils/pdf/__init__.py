@@ -1,2 +1,104 @@
+"""
+PDF compaction: headless engine (pdf), batch CLI (cli), benchmarks
+(benchmark) and tkinter GUI (gui).
 
-from .pdf import *
+Names are resolved on first access, so importing the package is cheap and
+`from vicutils.pdf import compactPdfs` loads fitz but never tkinter or PIL.
+This file is maintained by hand: the docs workflow leaves __init__ files
+that define __getattr__ alone.
+"""
+
+import importlib
+
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    **dict.fromkeys((
+        "A4_WIDTH",
+        "A4_HEIGHT",
+        "PAGE_SIZES",
+        "PdfSource",
+        "parsePageRange",
+        "PdfInput",
+        "LayoutMode",
+        "RenderMode",
+        "PageOrder",
+        "Orientation",
+        "CompactionConfig",
+        "CompactionProgress",
+        "COMPACTION_PHASES",
+        "CompactionResult",
+        "CompactionHooks",
+        "CompactionCancelled",
+        "GridSolution",
+        "solveGrid",
+        "calculateOptimalGrid",
+        "DocumentInfo",
+        "setMetadataCachePath",
+        "saveMetadataCache",
+        "getDocumentInfo",
+        "mergePdfPages",
+        "RenderCache",
+        "RENDER_CHUNK_PAGES",
+        "COMPOSE_CHUNK_SHEETS",
+        "resolveOutputPath",
+        "compactPdfs",
+        "setAsyncConcurrency",
+        "iterCompactPdfsAsync",
+        "compactPdfsAsync",
+    ), "pdf"),
+    **dict.fromkeys(("BatchJob", "loadManifest", "runBatch"), "cli"),
+    **dict.fromkeys((
+        "SYNTHETIC_KINDS",
+        "MIXED_PAGE_SIZES",
+        "makeSyntheticPdf",
+        "benchmarkWorkers",
+        "benchmarkRenderModes",
+        "benchmarkPacking",
+        "benchmarkImports",
+        "runSuite",
+        "REGRESSION_METRICS",
+        "compareResults",
+    ), "benchmark"),
+    **dict.fromkeys((
+        "TRANSLATIONS",
+        "PREVIEW_CACHE_SIZE",
+        "PdfCompactorApp",
+        "launchGui",
+    ), "gui"),
+}
+
+_SUBMODULES = ("pdf", "cli", "benchmark", "gui")
+
+# The GUI names stay importable by name but out of `import *`, which must
+# keep working on headless servers without tkinter or PIL
+__all__ = [name for name, module in _EXPORTS.items() if module != "gui"]
+
+
+def __getattr__(name: str):
+    """
+    Import the submodule defining a name on first access.
+    
+    Args:
+        name: Attribute name (an exported name or a submodule)
+        
+    Returns:
+        The attribute, cached in the package namespace afterwards
+        
+    Raises:
+        AttributeError: If the package has no such name
+    """
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the package's names, including those not loaded yet."""
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
@@ -0,0 +1,698 @@
+"""
+PDF Compaction Benchmarks
+
+Synthetic benchmarks for the PDF compaction pipeline. Input documents are
+generated locally with fitz, so no sample files are needed.
+
+Run from the command line:
+    
+    python -m vicutils.pdf.benchmark workers --pages 200 --workers 1 2 4 8
+    python -m vicutils.pdf.benchmark modes --pages 200
+    python -m vicutils.pdf.benchmark packing --pages 200
+    python -m vicutils.pdf.benchmark imports --repeat 5
+    python -m vicutils.pdf.benchmark suite --pages 10 100 1000 --output bench.json
+    python -m vicutils.pdf.benchmark compare bench.json baseline.json
+
+The suite runs every case in a fresh process so peak RSS is measured per
+case, and writes one JSON record per case. compare flags cases that got
+slower, bigger or hungrier than a stored baseline by more than a tolerance.
+imports times each vicutils import in a fresh interpreter and reports which
+heavy dependencies it pulled in.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import fitz
+
+from .pdf import (
+    A4_WIDTH,
+    A4_HEIGHT,
+    CompactionConfig,
+    LayoutMode,
+    RenderMode,
+    calculateOptimalGrid,
+    compactPdfs,
+    mergePdfPages
+)
+
+
+# Synthetic input kinds understood by makeSyntheticPdf
+SYNTHETIC_KINDS = ("text", "scanned", "mixed")
+
+# Page sizes cycled through by the "mixed" kind: A4 portrait and landscape,
+# US letter, a till receipt and a 16:9 slide
+MIXED_PAGE_SIZES = [
+    (A4_WIDTH, A4_HEIGHT),
+    (A4_HEIGHT, A4_WIDTH),
+    (612, 792),
+    (226, 600),
+    (720, 405)
+]
+
+# Number of distinct scan images cycled through by the "scanned" kind
+SCAN_VARIANTS = 8
+
+
+# Benchmarks are run as a script, nothing is re-exported by the package
+__all__ = []
+
+
+def _writeTextPage(page: fitz.Page, pageNum: int) -> None:
+    """
+    Fill a page with a title and lines of text.
+    
+    Args:
+        page: Page to write on
+        pageNum: Zero-based page number shown in the title
+    """
+    page.insert_text((30, 50), f"Page {pageNum + 1}", fontsize=24)
+    lineCount = max(1, int((page.rect.height - 90) // 15))
+    for line in range(lineCount):
+        page.insert_text(
+            (30, 80 + line * 15),
+            f"Line {line + 1}: the quick brown fox jumps over the lazy dog",
+            fontsize=10
+        )
+
+
+def _makeScanImages() -> List[bytes]:
+    """
+    Render a few text pages to JPEG images that stand in for scans.
+    
+    Returns:
+        List of SCAN_VARIANTS JPEG images
+    """
+    source = fitz.open()
+    images = []
+    for variant in range(SCAN_VARIANTS):
+        page = source.new_page(width=A4_WIDTH, height=A4_HEIGHT)
+        _writeTextPage(page, variant)
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+        images.append(pixmap.tobytes("jpeg", jpg_quality=80))
+    source.close()
+    return images
+
+
+def makeSyntheticPdf(path: str, pageCount: int, kind: str = "text") -> str:
+    """
+    Create a synthetic PDF with the given number of pages.
+    
+    Args:
+        path: Where to write the PDF
+        pageCount: Number of pages to generate
+        kind: "text" (A4 text pages), "scanned" (A4 pages holding a single
+            JPEG image) or "mixed" (text pages of MIXED_PAGE_SIZES)
+    
+    Returns:
+        The path of the written PDF
+        
+    Raises:
+        ValueError: If kind is unknown
+    """
+    if kind not in SYNTHETIC_KINDS:
+        raise ValueError(f"Unknown synthetic kind: {kind}")
+    
+    scanImages = _makeScanImages() if kind == "scanned" else None
+    
+    doc = fitz.open()
+    for pageNum in range(pageCount):
+        if kind == "mixed":
+            width, height = MIXED_PAGE_SIZES[pageNum % len(MIXED_PAGE_SIZES)]
+        else:
+            width, height = A4_WIDTH, A4_HEIGHT
+        page = doc.new_page(width=width, height=height)
+        
+        if kind == "scanned":
+            page.insert_image(page.rect, stream=scanImages[pageNum % SCAN_VARIANTS])
+        else:
+            _writeTextPage(page, pageNum)
+    doc.save(path, garbage=4, deflate=True)
+    doc.close()
+    return path
+
+
+def _digestPages(pdfPath: str, compression: int, workers: int) -> str:
+    """
+    Hash the rendered samples of every page of a PDF.
+    
+    Args:
+        pdfPath: PDF to render
+        compression: Compression percentage (25-100)
+        workers: Number of render processes
+    
+    Returns:
+        Hex digest of all page samples in order
+    """
+    digest = hashlib.sha256()
+    doc = fitz.open(pdfPath)
+    try:
+        for pixmap in mergePdfPages([doc], compression, stream=True, workers=workers):
+            digest.update(pixmap.samples)
+    finally:
+        doc.close()
+    return digest.hexdigest()
+
+
+def benchmarkWorkers(
+    pageCount: int = 200,
+    workerCounts: Sequence[int] = (1, 2, 4, 8),
+    compression: int = 100
+) -> List[Dict]:
+    """
+    Time compactPdfs with increasing render worker counts.
+    
+    Each run is also checked to render exactly the same samples as the
+    serial path.
+    
+    Args:
+        pageCount: Number of pages in the synthetic input
+        workerCounts: Worker counts to measure
+        compression: Compression percentage (25-100)
+    
+    Returns:
+        List of dicts with workers, seconds, speedup and identical keys
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tempDir:
+        inputPath = makeSyntheticPdf(os.path.join(tempDir, "input.pdf"), pageCount)
+        serialDigest = _digestPages(inputPath, compression, 1)
+        
+        for workers in workerCounts:
+            config = CompactionConfig(
+                rows=2,
+                columns=2,
+                compression=compression,
+                workers=workers,
+                outputDir=tempDir,
+                outputFilename=f"workers{workers}.pdf"
+            )
+            start = time.perf_counter()
+            compactPdfs(inputPath, config)
+            seconds = time.perf_counter() - start
+            
+            results.append({
+                'workers': workers,
+                'seconds': seconds,
+                'speedup': results[0]['seconds'] / seconds if results else 1.0,
+                'identical': _digestPages(inputPath, compression, workers) == serialDigest
+            })
+    return results
+
+
+def benchmarkRenderModes(
+    pageCount: int = 200,
+    rows: int = 2,
+    columns: int = 2,
+    compression: int = 100
+) -> List[Dict]:
+    """
+    Compare the raster and vector render modes on a text-heavy input.
+    
+    Args:
+        pageCount: Number of pages in the synthetic input
+        rows: Grid rows per output page
+        columns: Grid columns per output page
+        compression: Compression percentage used by the raster mode
+    
+    Returns:
+        List of dicts with mode, seconds, outputBytes and searchable keys
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tempDir:
+        inputPath = makeSyntheticPdf(os.path.join(tempDir, "input.pdf"), pageCount)
+        
+        for mode in RenderMode:
+            config = CompactionConfig(
+                rows=rows,
+                columns=columns,
+                compression=compression,
+                renderMode=mode,
+                outputDir=tempDir,
+                outputFilename=f"{mode.value}.pdf"
+            )
+            start = time.perf_counter()
+            outputPath = compactPdfs(inputPath, config)
+            seconds = time.perf_counter() - start
+            
+            outputDoc = fitz.open(outputPath)
+            searchable = "quick brown fox" in outputDoc[0].get_text()
+            outputDoc.close()
+            
+            results.append({
+                'mode': mode.value,
+                'seconds': seconds,
+                'outputBytes': os.path.getsize(outputPath),
+                'searchable': searchable
+            })
+    return results
+
+
+def benchmarkPacking(
+    pageCount: int = 200,
+    grids: Sequence[str] = ("2x2", "3x3", "4x4"),
+    compression: int = 50
+) -> List[Dict]:
+    """
+    Compare output page counts of GRID and PACKED layouts on mixed page sizes.
+    
+    Args:
+        pageCount: Number of pages in the synthetic "mixed" input
+        grids: Grid sizes as "ROWSxCOLUMNS" (the reference cell in PACKED mode)
+        compression: Compression percentage
+    
+    Returns:
+        List of dicts with grid, gridSheets, packedSheets, saved and seconds keys
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tempDir:
+        inputPath = makeSyntheticPdf(os.path.join(tempDir, "mixed.pdf"), pageCount, "mixed")
+        
+        for grid in grids:
+            rows, columns = (int(v) for v in grid.lower().split("x"))
+            sheets = {}
+            seconds = {}
+            for mode in (LayoutMode.GRID, LayoutMode.PACKED):
+                config = CompactionConfig(
+                    rows=rows,
+                    columns=columns,
+                    layoutMode=mode,
+                    compression=compression,
+                    outputDir=tempDir,
+                    outputFilename=f"{mode.value}-{grid}.pdf"
+                )
+                result = compactPdfs(inputPath, config, returnResult=True)
+                sheets[mode] = result.outputPages
+                seconds[mode] = result.wallSeconds
+            
+            results.append({
+                'grid': grid,
+                'gridSheets': sheets[LayoutMode.GRID],
+                'packedSheets': sheets[LayoutMode.PACKED],
+                'saved': 1 - sheets[LayoutMode.PACKED] / sheets[LayoutMode.GRID],
+                'seconds': seconds[LayoutMode.PACKED]
+            })
+    return results
+
+
+# Imports timed by benchmarkImports: label -> statement
+IMPORT_CASES = {
+    "vicutils": "import vicutils",
+    "vicutils.geometry": "import vicutils.geometry",
+    "vicutils.printBin": "import vicutils.printBin",
+    "vicutils.pdf": "import vicutils.pdf",
+    "vicutils.pdf.compactPdfs": "from vicutils.pdf import compactPdfs",
+    "vicutils.pdf.gui": "import vicutils.pdf.gui",
+}
+
+# Dependencies reported as loaded (or not) after each import
+HEAVY_MODULES = ("fitz", "PIL", "tkinter", "numpy")
+
+# Run in a fresh interpreter: time one import statement, then report the
+# time and the heavy modules it loaded as JSON
+_IMPORT_SCRIPT = """\
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': seconds,
+    'loaded': [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def benchmarkImports(
+    cases: Optional[Dict[str, str]] = None,
+    repeat: int = 5
+) -> List[Dict]:
+    """
+    Time vicutils imports, each in a fresh interpreter.
+    
+    Args:
+        cases: Label -> import statement (defaults to IMPORT_CASES)
+        repeat: Number of runs per case; the fastest one is reported
+    
+    Returns:
+        List of dicts with import, seconds, loaded and error keys (seconds
+        is None and error holds the last line of stderr when the import
+        failed, e.g. without tkinter)
+    """
+    cases = cases or IMPORT_CASES
+    
+    # Make this copy of vicutils importable from the child interpreters
+    packageRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [packageRoot, env.get('PYTHONPATH')]))
+    
+    results = []
+    for label, statement in cases.items():
+        script = _IMPORT_SCRIPT.format(statement=statement, heavy=HEAVY_MODULES)
+        best = None
+        loaded = []
+        error = None
+        for _ in range(max(1, repeat)):
+            run = subprocess.run(
+                [sys.executable, "-c", script], capture_output=True, text=True, env=env
+            )
+            if run.returncode != 0:
+                lines = run.stderr.strip().splitlines()
+                error = lines[-1] if lines else f"exit code {run.returncode}"
+                break
+            record = json.loads(run.stdout.strip().splitlines()[-1])
+            if best is None or record['seconds'] < best:
+                best = record['seconds']
+            loaded = record['loaded']
+        
+        results.append({
+            'import': label,
+            'seconds': None if error else best,
+            'loaded': loaded,
+            'error': error
+        })
+    return results
+
+
+def _peakRssBytes() -> Optional[int]:
+    """
+    Get the peak resident set size of the current process.
+    
+    Returns:
+        Peak RSS in bytes, or None where it cannot be measured
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def _runCase(case: Dict, inputPath: str, outputDir: str) -> Dict:
+    """
+    Run one benchmark case (called in a fresh worker process).
+    
+    Args:
+        case: Case description from _suiteCases
+        inputPath: Synthetic input PDF
+        outputDir: Directory for the output PDF
+        
+    Returns:
+        Measurements for the case
+    """
+    config = CompactionConfig(
+        rows=case['rows'],
+        columns=case['columns'],
+        targetPages=case['targetPages'],
+        layoutMode=LayoutMode(case['layoutMode']),
+        compression=case['compression'],
+        outputDir=outputDir,
+        outputFilename=f"{case['id']}.pdf"
+    )
+    result = compactPdfs(inputPath, config, returnResult=True)
+    os.remove(result.outputPath)
+    
+    return {
+        'seconds': result.wallSeconds,
+        'pagesPerSecond': result.pagesPerSecond,
+        'outputBytes': result.bytesOut,
+        'outputPages': result.outputPages,
+        'peakRssBytes': _peakRssBytes(),
+        'phaseSeconds': result.phaseSeconds
+    }
+
+
+def _suiteCases(
+    kinds: Sequence[str],
+    pageCounts: Sequence[int],
+    grids: Sequence[str],
+    compressions: Sequence[int]
+) -> List[Dict]:
+    """
+    Build the cartesian product of suite parameters.
+    
+    Args:
+        kinds: Synthetic input kinds
+        pageCounts: Input page counts
+        grids: Grid sizes as "ROWSxCOLUMNS"
+        compressions: Compression percentages
+        
+    Returns:
+        List of case dicts, each with a unique 'id'
+    """
+    cases = []
+    for kind, pages, grid, compression, mode in itertools.product(
+        kinds, pageCounts, grids, compressions, LayoutMode
+    ):
+        rows, columns = (int(v) for v in grid.lower().split("x"))
+        cases.append({
+            'id': f"{kind}-{pages}p-{mode.value}-{rows}x{columns}-c{compression}",
+            'kind': kind,
+            'pages': pages,
+            'layoutMode': mode.value,
+            'rows': rows,
+            'columns': columns,
+            # Same density as the grid, expressed as an output page count
+            'targetPages': math.ceil(pages / (rows * columns)),
+            'compression': compression
+        })
+    return cases
+
+
+def _timeGridCalculation(maxPages: int = 5000) -> Dict:
+    """
+    Time calculateOptimalGrid over a sweep of page and target counts.
+    
+    Args:
+        maxPages: Largest total page count in the sweep
+        
+    Returns:
+        Case record with id, calls and seconds keys
+    """
+    calls = 0
+    start = time.perf_counter()
+    for totalPages in range(1, maxPages + 1, 7):
+        for targetPages in (1, 2, 5, 10, 50):
+            calculateOptimalGrid(totalPages, targetPages)
+            calls += 1
+    return {
+        'id': "calculateOptimalGrid",
+        'calls': calls,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def runSuite(
+    kinds: Sequence[str] = SYNTHETIC_KINDS,
+    pageCounts: Sequence[int] = (10, 100, 1000),
+    grids: Sequence[str] = ("1x1", "2x2", "4x4"),
+    compressions: Sequence[int] = (25, 50, 100),
+    log=None
+) -> Dict:
+    """
+    Time compaction over every layout mode, compression level and grid size.
+    
+    Args:
+        kinds: Synthetic input kinds to generate
+        pageCounts: Input page counts (10 to 5000 is a sensible range)
+        grids: Grid sizes as "ROWSxCOLUMNS"
+        compressions: Compression percentages
+        log: Stream for progress lines (None for silent)
+        
+    Returns:
+        Dict with 'environment' and 'cases' (one record per case)
+    """
+    cases = _suiteCases(kinds, pageCounts, grids, compressions)
+    
+    with tempfile.TemporaryDirectory() as tempDir:
+        inputs = {}
+        for kind, pages in itertools.product(kinds, pageCounts):
+            inputs[(kind, pages)] = makeSyntheticPdf(
+                os.path.join(tempDir, f"{kind}-{pages}.pdf"), pages, kind
+            )
+        
+        for case in cases:
+            # A fresh process per case, so peak RSS belongs to this case only
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                case.update(executor.submit(
+                    _runCase, case, inputs[(case['kind'], case['pages'])], tempDir
+                ).result())
+            if log is not None:
+                print(
+                    f"{case['id']:<40} {case['seconds']:>8.3f}s "
+                    f"{case['pagesPerSecond']:>9.1f} pages/s "
+                    f"{case['outputBytes']:>11} bytes",
+                    file=log
+                )
+    
+    cases.append(_timeGridCalculation())
+    
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'pymupdf': fitz.VersionBind,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count()
+        },
+        'cases': cases
+    }
+
+
+# Metrics checked by compareResults; higher is worse for all of them
+REGRESSION_METRICS = ("seconds", "outputBytes", "outputPages", "peakRssBytes")
+
+
+def compareResults(current: Dict, baseline: Dict, tolerance: float = 0.1) -> List[Dict]:
+    """
+    Find cases that regressed against a baseline.
+    
+    Args:
+        current: Suite results (as returned by runSuite)
+        baseline: Stored suite results to compare against
+        tolerance: Allowed relative increase (0.1 = 10%)
+        
+    Returns:
+        List of regressions with id, metric, baseline, current and change keys
+    """
+    baselineCases = {case['id']: case for case in baseline['cases']}
+    regressions = []
+    
+    for case in current['cases']:
+        reference = baselineCases.get(case['id'])
+        if reference is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = reference.get(metric), case.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > tolerance:
+                regressions.append({
+                    'id': case['id'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': change
+                })
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+    
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+        
+    Returns:
+        Process exit code (1 if compare found regressions)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark vicutils.pdf compaction")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    workersParser = subparsers.add_parser("workers", help="Render scaling by worker count")
+    workersParser.add_argument("--pages", type=int, default=200)
+    workersParser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    workersParser.add_argument("--compression", type=int, default=100)
+    
+    modesParser = subparsers.add_parser("modes", help="Raster vs vector render mode")
+    modesParser.add_argument("--pages", type=int, default=200)
+    modesParser.add_argument("--rows", type=int, default=2)
+    modesParser.add_argument("--columns", type=int, default=2)
+    modesParser.add_argument("--compression", type=int, default=100)
+    
+    packingParser = subparsers.add_parser("packing", help="GRID vs PACKED output pages")
+    packingParser.add_argument("--pages", type=int, default=200)
+    packingParser.add_argument("--grids", nargs="+", default=["2x2", "3x3", "4x4"])
+    packingParser.add_argument("--compression", type=int, default=50)
+    
+    importsParser = subparsers.add_parser("imports", help="Import time of each subpackage")
+    importsParser.add_argument("--repeat", type=int, default=5)
+    
+    suiteParser = subparsers.add_parser("suite", help="Full suite, written as JSON")
+    suiteParser.add_argument("--kinds", nargs="+", default=list(SYNTHETIC_KINDS),
+                             choices=SYNTHETIC_KINDS)
+    suiteParser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    suiteParser.add_argument("--grids", nargs="+", default=["1x1", "2x2", "4x4"])
+    suiteParser.add_argument("--compression", type=int, nargs="+", default=[25, 50, 100])
+    suiteParser.add_argument("--output", default="bench.json")
+    
+    compareParser = subparsers.add_parser("compare", help="Flag regressions against a baseline")
+    compareParser.add_argument("current")
+    compareParser.add_argument("baseline")
+    compareParser.add_argument("--tolerance", type=float, default=0.1)
+    
+    args = parser.parse_args(argv)
+    
+    if args.benchmark == "workers":
+        print(f"{'workers':>8} {'seconds':>10} {'speedup':>8} {'identical':>10}")
+        for row in benchmarkWorkers(args.pages, args.workers, args.compression):
+            print(
+                f"{row['workers']:>8} {row['seconds']:>10.3f} "
+                f"{row['speedup']:>8.2f} {str(row['identical']):>10}"
+            )
+    elif args.benchmark == "modes":
+        print(f"{'mode':>8} {'seconds':>10} {'bytes':>12} {'searchable':>11}")
+        for row in benchmarkRenderModes(args.pages, args.rows, args.columns, args.compression):
+            print(
+                f"{row['mode']:>8} {row['seconds']:>10.3f} "
+                f"{row['outputBytes']:>12} {str(row['searchable']):>11}"
+            )
+    elif args.benchmark == "packing":
+        print(f"{'grid':>6} {'GRID':>8} {'PACKED':>8} {'saved':>7} {'seconds':>10}")
+        for row in benchmarkPacking(args.pages, args.grids, args.compression):
+            print(
+                f"{row['grid']:>6} {row['gridSheets']:>8} {row['packedSheets']:>8} "
+                f"{row['saved']:>7.1%} {row['seconds']:>10.3f}"
+            )
+    elif args.benchmark == "imports":
+        print(f"{'import':<26} {'ms':>9}  loaded")
+        for row in benchmarkImports(repeat=args.repeat):
+            if row['error']:
+                print(f"{row['import']:<26} {'failed':>9}  {row['error']}")
+                continue
+            print(
+                f"{row['import']:<26} {row['seconds'] * 1000:>9.1f}  "
+                f"{', '.join(row['loaded']) or '-'}"
+            )
+    elif args.benchmark == "suite":
+        results = runSuite(
+            args.kinds, args.pages, args.grids, args.compression, log=sys.stdout
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {len(results['cases'])} cases to {args.output}")
+    elif args.benchmark == "compare":
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        
+        regressions = compareResults(current, baseline, args.tolerance)
+        for row in regressions:
+            print(
+                f"REGRESSION {row['id']} {row['metric']}: "
+                f"{row['baseline']} -> {row['current']} ({row['change']:+.1%})"
+            )
+        if not regressions:
+            print("No regressions")
+        return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+PDF Compactor Batch CLI
+
+Runs many compaction jobs from a manifest file:
+    
+    python -m vicutils.pdf jobs.json --jobs 4 --resume
+
+A JSON manifest is a list of jobs (or an object with a "jobs" list). Each job
+has an "inputs" list of PDF paths, an optional "name", an optional "pages"
+selector applied to every input (see parsePageRange), and any
+CompactionConfig field. An input can also be an object with its own "path"
+and "pages":
+    
+    [
+        {"name": "invoices", "inputs": ["a.pdf", "b.pdf"], "rows": 2, "columns": 2},
+        {"inputs": ["c.pdf"], "layoutMode": "target_pages", "targetPages": 3},
+        {"inputs": [{"path": "d.pdf", "pages": "1-3,-1"}, "e.pdf"], "pages": "odd"}
+    ]
+
+A CSV manifest has one job per row, an "inputs" column with paths separated
+by ";", an optional "pages" column and one column per CompactionConfig
+field. Empty cells use defaults.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+from .pdf import (
+    CompactionConfig,
+    PdfInput,
+    compactPdfs,
+    parsePageRange,
+    resolveOutputPath,
+    setMetadataCachePath
+)
+
+
+__all__ = ['BatchJob', 'loadManifest', 'runBatch']
+
+
+@dataclass
+class BatchJob:
+    """
+    One compaction job from a manifest.
+    
+    Attributes:
+        name: Label used in reports
+        inputs: Input PDF paths, or PdfInputs for inputs with a page selector
+        config: Compaction configuration for the job
+    """
+    name: str
+    inputs: List[Union[str, PdfInput]]
+    config: CompactionConfig
+
+
+def _parseValue(fieldType, value):
+    """
+    Convert a manifest value to the type of a CompactionConfig field.
+    
+    Args:
+        fieldType: Annotated type of the field
+        value: Raw value from JSON or CSV
+    
+    Returns:
+        The converted value
+    """
+    # Unwrap Optional[X]
+    if typing.get_origin(fieldType) is typing.Union:
+        fieldType = next(arg for arg in typing.get_args(fieldType) if arg is not type(None))
+    
+    if isinstance(fieldType, type) and issubclass(fieldType, Enum):
+        return fieldType(value.lower() if isinstance(value, str) else value)
+    if fieldType is bool:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "y")
+        return bool(value)
+    if fieldType is int:
+        return int(value)
+    if fieldType is float:
+        return float(value)
+    if typing.get_origin(fieldType) is tuple:
+        if isinstance(value, str):
+            if "," not in value:
+                return value  # Named value, e.g. pageSize "letter"
+            value = value.split(",")
+        return tuple(float(v) for v in value)
+    return str(value)
+
+
+def _parseJob(entry: Dict, index: int, baseDir: str) -> BatchJob:
+    """
+    Build a BatchJob from a manifest entry.
+    
+    Relative input, output and render cache paths are resolved against the
+    manifest's directory.
+    
+    Args:
+        entry: Mapping of manifest keys to values
+        index: Position of the job in the manifest (for the default name)
+        baseDir: Directory of the manifest file
+    
+    Returns:
+        Parsed BatchJob
+    
+    Raises:
+        ValueError: If the entry has no inputs, an unknown option or a
+            malformed page selector
+    """
+    entry = dict(entry)
+    name = entry.pop('name', None) or f"job {index + 1}"
+    jobPages = entry.pop('pages', None) or None
+    
+    inputs = entry.pop('inputs', None)
+    if isinstance(inputs, str):
+        inputs = [path.strip() for path in inputs.split(";") if path.strip()]
+    if not inputs:
+        raise ValueError(f"{name}: no inputs")
+    
+    parsedInputs = []
+    for item in inputs:
+        if isinstance(item, dict):
+            path, pages = item.get('path'), item.get('pages', jobPages)
+        else:
+            path, pages = item, jobPages
+        if not path:
+            raise ValueError(f"{name}: input without a path")
+        path = os.path.join(baseDir, path)
+        if pages:
+            parsePageRange(pages, 0)  # Reject malformed selectors early
+            parsedInputs.append(PdfInput(path, pages))
+        else:
+            parsedInputs.append(path)
+    
+    configFields = {field.name: field.type for field in fields(CompactionConfig)}
+    kwargs = {}
+    for key, value in entry.items():
+        if key not in configFields:
+            raise ValueError(f"{name}: unknown option '{key}'")
+        if value is None or value == "":
+            continue
+        kwargs[key] = _parseValue(configFields[key], value)
+    
+    for key in ('outputDir', 'renderCacheDir'):
+        if kwargs.get(key):
+            kwargs[key] = os.path.join(baseDir, kwargs[key])
+    
+    return BatchJob(name, parsedInputs, CompactionConfig(**kwargs))
+
+
+def loadManifest(manifestPath: str, errors: Optional[List[str]] = None) -> List[BatchJob]:
+    """
+    Read compaction jobs from a JSON or CSV manifest.
+    
+    Args:
+        manifestPath: Path of the manifest (.json or .csv)
+        errors: If given, invalid jobs are skipped and their error messages
+            appended to this list instead of raising
+    
+    Returns:
+        List of valid jobs in manifest order
+    
+    Raises:
+        ValueError: If the manifest (or, without errors, one of its jobs)
+            is invalid
+    """
+    baseDir = os.path.dirname(os.path.abspath(manifestPath))
+    
+    with open(manifestPath, "r", encoding="utf-8", newline="") as f:
+        if manifestPath.lower().endswith(".csv"):
+            entries = list(csv.DictReader(f))
+        else:
+            entries = json.load(f)
+            if isinstance(entries, dict):
+                entries = entries.get('jobs', [])
+    
+    jobs = []
+    for index, entry in enumerate(entries):
+        try:
+            jobs.append(_parseJob(entry, index, baseDir))
+        except (TypeError, ValueError) as e:
+            if errors is None:
+                raise ValueError(str(e)) from e
+            errors.append(str(e))
+    return jobs
+
+
+def _isUpToDate(job: BatchJob) -> bool:
+    """
+    Check whether a job's output is newer than all of its inputs.
+    
+    Args:
+        job: The job to check
+    
+    Returns:
+        True if the output exists and is newer than every input
+    """
+    outputPath = resolveOutputPath(job.inputs, job.config)
+    if not os.path.exists(outputPath):
+        return False
+    outputTime = os.path.getmtime(outputPath)
+    paths = [item.source if isinstance(item, PdfInput) else item for item in job.inputs]
+    return all(
+        os.path.exists(path) and os.path.getmtime(path) < outputTime
+        for path in paths
+    )
+
+
+def _runJob(job: BatchJob, metadataCache: Optional[str]) -> Dict:
+    """
+    Run one job in a worker process.
+    
+    Args:
+        job: The job to run
+        metadataCache: Path of the persistent metadata cache, if any
+    
+    Returns:
+        Dict with outputPath, seconds and pages keys
+    """
+    if metadataCache:
+        setMetadataCachePath(metadataCache)
+    
+    result = compactPdfs(job.inputs, job.config, returnResult=True)
+    return {
+        'outputPath': result.outputPath,
+        'seconds': result.wallSeconds,
+        'pages': result.placedImages
+    }
+
+
+def runBatch(
+    jobs: List[BatchJob],
+    concurrency: int = 1,
+    resume: bool = False,
+    metadataCache: Optional[str] = None,
+    out=None,
+    errors: Optional[List[str]] = None
+) -> Dict[str, List[str]]:
+    """
+    Run compaction jobs concurrently, reporting each one as it finishes.
+    
+    A failing job is reported and skipped; the rest of the batch keeps going.
+    
+    Args:
+        jobs: Jobs to run
+        concurrency: Number of jobs run at the same time
+        resume: Skip jobs whose output is newer than all of their inputs
+        metadataCache: Path of a persistent metadata cache shared by runs
+        out: Stream for the report (defaults to sys.stdout)
+        errors: Error messages of manifest entries that could not be loaded
+            (see loadManifest), reported and counted as failed jobs
+    
+    Returns:
+        Dict with 'done', 'skipped' and 'failed' lists of job names ('failed'
+        also holds the messages of entries that could not be loaded)
+    """
+    out = out or sys.stdout
+    summary = {'done': [], 'skipped': [], 'failed': []}
+    
+    for error in errors or []:
+        summary['failed'].append(error)
+        print(f"[failed] {error}", file=out)
+    
+    pending = []
+    for job in jobs:
+        if resume and _isUpToDate(job):
+            summary['skipped'].append(job.name)
+            print(f"[skipped] {job.name}: up to date", file=out)
+        else:
+            pending.append(job)
+    
+    batchStart = time.perf_counter()
+    totalPages = 0
+    
+    with ProcessPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(_runJob, job, metadataCache): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                summary['failed'].append(job.name)
+                print(f"[failed] {job.name}: {e}", file=out)
+                continue
+            
+            summary['done'].append(job.name)
+            totalPages += result['pages']
+            rate = result['pages'] / result['seconds'] if result['seconds'] else 0.0
+            print(
+                f"[ok] {job.name}: {result['seconds']:.2f}s, "
+                f"{result['pages']} pages, {rate:.1f} pages/s -> {result['outputPath']}",
+                file=out
+            )
+    
+    batchSeconds = time.perf_counter() - batchStart
+    rate = totalPages / batchSeconds if batchSeconds else 0.0
+    print(
+        f"{len(summary['done'])} done, {len(summary['skipped'])} skipped, "
+        f"{len(summary['failed'])} failed in {batchSeconds:.2f}s ({rate:.1f} pages/s)",
+        file=out
+    )
+    return summary
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point.
+    
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+    
+    Returns:
+        Process exit code (1 if any job failed)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m vicutils.pdf",
+        description="Compact PDFs in batch from a JSON or CSV manifest"
+    )
+    parser.add_argument("manifest", help="Path of the .json or .csv job manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of jobs run concurrently")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip jobs whose output is newer than all inputs")
+    parser.add_argument("--metadata-cache", default=None,
+                        help="JSON file used to cache page counts across runs")
+    args = parser.parse_args(argv)
+    
+    errors = []
+    try:
+        jobs = loadManifest(args.manifest, errors)
+    except (OSError, ValueError) as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return 2
+    
+    if args.metadata_cache:
+        setMetadataCachePath(args.metadata_cache)
+    
+    summary = runBatch(
+        jobs, args.jobs, args.resume, args.metadata_cache, errors=errors
+    )
+    return 1 if summary['failed'] else 0
@@ -0,0 +1,1595 @@
+"""
+PDF Compactor GUI Module
+
+Graphical user interface for PDF compaction using tkinter, on top of the
+headless engine in the pdf module.
+"""
+
+import os
+import tkinter as tk
+from tkinter import filedialog, messagebox, Toplevel, Canvas, Listbox, MULTIPLE, colorchooser
+from tkinter import ttk, StringVar, IntVar, BooleanVar
+from PIL import Image, ImageTk
+import platform
+import queue
+import threading
+import fitz
+
+from collections import OrderedDict
+
+from .pdf import (
+    COMPACTION_PHASES,
+    PAGE_SIZES,
+    CompactionCancelled,
+    CompactionConfig,
+    LayoutMode,
+    Orientation,
+    PageOrder,
+    PdfInput,
+    _RenderSettings,
+    _composePackedSheet,
+    _composeSheet,
+    _getLayoutParameters,
+    _inputPageSizes,
+    _packSheets,
+    _renderPage,
+    _sheetGeometries,
+    _slotSizes,
+    _solveTargetGrid,
+    compactPdfs,
+    getDocumentInfo,
+    parsePageRange
+)
+
+
+# Language translations
+TRANSLATIONS = {
+    'en': {
+        'title': "PDF Compactor",
+        'input_files': "📁 Input Files",
+        'add_pdfs': "➕ Add PDFs",
+        'remove': "🗑️ Remove",
+        'move_up': "↑ Move Up",
+        'move_down': "↓ Move Down",
+        'clear_all': "🗑️ Clear All",
+        'layout_params': "⚙️ Layout Parameters",
+        'layout_mode': "Layout Mode:",
+        'grid_mode': "Grid (Rows × Columns)",
+        'target_pages_mode': "Target Pages",
+        'rows': "Rows (p):",
+        'columns': "Columns (n):",
+        'target_pages': "Target Pages:",
+        'compression': "Compression (%):",
+        'separation': "Separation (pages):",
+        'advanced_options': "🔧 Advanced Options",
+        'page_order': "Page Order:",
+        'horizontal': "Horizontal",
+        'vertical': "Vertical",
+        'page_size': "Page Size:",
+        'orientation': "Orientation:",
+        'portrait': "Portrait",
+        'landscape': "Landscape",
+        'auto': "Auto",
+        'quality_preset': "Quality Preset:",
+        'low': "Low",
+        'medium': "Medium",
+        'high': "High",
+        'maximum': "Maximum",
+        'grid': "Grid:",
+        'show': "Show",
+        'hide': "Hide",
+        'choose_color': "Choose Color",
+        'maintain_aspect': "Maintain aspect ratio",
+        'add_page_numbers': "Add page numbers",
+        'output_options': "💾 Output Options",
+        'folder': "Folder:",
+        'filename': "Filename:",
+        'browse': "📂 Browse",
+        'preview': "👁️ Preview",
+        'create_pdf': "✅ Create PDF",
+        'ready': "Ready",
+        'confirm': "Confirm",
+        'clear_all_confirm': "Clear all files?",
+        'error': "Error",
+        'success': "Success",
+        'no_files_error': "Please add at least one PDF file",
+        'preview_failed': "Failed to generate preview",
+        'pdf_failed': "Failed to create PDF",
+        'pdf_created': "PDF created successfully!",
+        'saved_to': "Saved to:",
+        'added_files': "Added {0} file(s)",
+        'removed_files': "Removed selected files",
+        'cleared_files': "Cleared all files",
+        'page_range': "Pages (e.g. 1-3,7,-1 or odd):",
+        'apply_range': "Apply to selected",
+        'invalid_range': "Invalid page range",
+        'range_applied': "Page range set for {0} file(s)",
+        'preview_generating': "Generating preview...",
+        'preview_success': "Preview generated successfully",
+        'creating_pdf': "Creating PDF...",
+        'pdf_saved': "PDF saved: {0}",
+        'default_folder': "Default: VicOutput in source folder",
+        'default_filename': "Default: vicOutput.pdf",
+        'preview_title': "PDF Preview",
+        'language': "Language:",
+        'calculated_grid': "Calculated grid: {0}×{1} ({2} pages)",
+        'cancel': "✖ Cancel",
+        'cancelling': "Cancelling...",
+        'cancelled': "Cancelled",
+        'progress': "Rendered {0}/{1} pages, {2}/{3} sheets written"
+    },
+    'fr': {
+        'title': "Compacteur PDF",
+        'input_files': "📁 Fichiers d'entrée",
+        'add_pdfs': "➕ Ajouter PDFs",
+        'remove': "🗑️ Supprimer",
+        'move_up': "↑ Monter",
+        'move_down': "↓ Descendre",
+        'clear_all': "🗑️ Tout effacer",
+        'layout_params': "⚙️ Paramètres de mise en page",
+        'layout_mode': "Mode de mise en page:",
+        'grid_mode': "Grille (Rangées × Colonnes)",
+        'target_pages_mode': "Pages cibles",
+        'rows': "Rangées (p):",
+        'columns': "Colonnes (n):",
+        'target_pages': "Pages cibles:",
+        'compression': "Compression (%):",
+        'separation': "Séparation (pages):",
+        'advanced_options': "🔧 Options avancées",
+        'page_order': "Ordre des pages:",
+        'horizontal': "Horizontal",
+        'vertical': "Vertical",
+        'page_size': "Format de page:",
+        'orientation': "Orientation:",
+        'portrait': "Portrait",
+        'landscape': "Paysage",
+        'auto': "Auto",
+        'quality_preset': "Préréglage qualité:",
+        'low': "Basse",
+        'medium': "Moyenne",
+        'high': "Haute",
+        'maximum': "Maximum",
+        'grid': "Grille:",
+        'show': "Afficher",
+        'hide': "Masquer",
+        'choose_color': "Choisir couleur",
+        'maintain_aspect': "Maintenir le ratio d'aspect",
+        'add_page_numbers': "Ajouter numéros de page",
+        'output_options': "💾 Options de sortie",
+        'folder': "Dossier:",
+        'filename': "Nom du fichier:",
+        'browse': "📂 Parcourir",
+        'preview': "👁️ Aperçu",
+        'create_pdf': "✅ Créer PDF",
+        'ready': "Prêt",
+        'confirm': "Confirmer",
+        'clear_all_confirm': "Effacer tous les fichiers?",
+        'error': "Erreur",
+        'success': "Succès",
+        'no_files_error': "Veuillez ajouter au moins un fichier PDF",
+        'preview_failed': "Échec de génération de l'aperçu",
+        'pdf_failed': "Échec de création du PDF",
+        'pdf_created': "PDF créé avec succès!",
+        'saved_to': "Enregistré dans:",
+        'added_files': "{0} fichier(s) ajouté(s)",
+        'removed_files': "Fichiers sélectionnés supprimés",
+        'cleared_files': "Tous les fichiers effacés",
+        'page_range': "Pages (ex. 1-3,7,-1 ou odd):",
+        'apply_range': "Appliquer à la sélection",
+        'invalid_range': "Plage de pages invalide",
+        'range_applied': "Plage de pages définie pour {0} fichier(s)",
+        'preview_generating': "Génération de l'aperçu...",
+        'preview_success': "Aperçu généré avec succès",
+        'creating_pdf': "Création du PDF...",
+        'pdf_saved': "PDF enregistré: {0}",
+        'default_folder': "Par défaut: VicOutput dans le dossier source",
+        'default_filename': "Par défaut: vicOutput.pdf",
+        'preview_title': "Aperçu PDF",
+        'language': "Langue:",
+        'calculated_grid': "Grille calculée: {0}×{1} ({2} pages)",
+        'cancel': "✖ Annuler",
+        'cancelling': "Annulation...",
+        'cancelled': "Annulé",
+        'progress': "{0}/{1} pages rendues, {2}/{3} feuilles écrites"
+    }
+}
+
+
+# Maximum number of rendered page thumbnails kept for previews
+PREVIEW_CACHE_SIZE = 256
+
+
+class PdfCompactorApp:
+    """Main application class for PDF Compactor GUI."""
+    
+    def __init__(self, root):
+        """
+        Initialize the PDF Compactor application.
+        
+        Args:
+            root: tkinter root window
+        """
+        self.root = root
+        self.currentLanguage = 'en'
+        
+        # Preview caches, kept across previews and language changes
+        self.thumbnailCache = OrderedDict()
+        
+        # Page selector of each input file (path -> selector)
+        self.pageRanges = {}
+        
+        # Background job state
+        self.jobQueue = queue.Queue()
+        self.cancelEvent = None
+        
+        self._setupWindow()
+        self._setupVariables()
+        self._setupUi()
+        
+    def _setupWindow(self):
+        """Configure window based on platform."""
+        # Set window size
+        windowWidth = 700
+        windowHeight = 700
+        
+        # Center window on screen
+        screenWidth = self.root.winfo_screenwidth()
+        screenHeight = self.root.winfo_screenheight()
+        x = (screenWidth - windowWidth) // 2
+        y = (screenHeight - windowHeight) // 2
+        
+        self.root.geometry(f"{windowWidth}x{windowHeight}+{x}+{y}")
+        self.root.configure(bg="#2C3E50")
+        
+        # Allow window resizing
+        self.root.minsize(650, 650)
+        
+        # Platform-specific font configurations
+        system = platform.system()
+        if system == "Darwin":  # macOS
+            try:
+                self.root.option_add("*Font", ("SF Pro", 12))
+            except:
+                self.root.option_add("*Font", ("Helvetica", 12))
+        elif system == "Windows":
+            try:
+                self.root.option_add("*Font", ("Segoe UI", 10))
+            except:
+                self.root.option_add("*Font", ("Arial", 10))
+        else:  # Linux
+            try:
+                self.root.option_add("*Font", ("Ubuntu", 10))
+            except:
+                self.root.option_add("*Font", ("Sans", 10))
+        
+        self.root.title(self._translate('title'))
+            
+    def _setupVariables(self):
+        """Initialize all tkinter variables."""
+        self.gridOption = StringVar(value=self._translate('show'))
+        self.gridColor = StringVar(value="#000000")
+        self.outputFolder = StringVar()
+        self.pdfName = StringVar()
+        self.pageRange = StringVar()
+        self.pageOrder = StringVar(value=self._translate('horizontal'))
+        self.pageSize = StringVar(value="A4")
+        self.orientation = StringVar(value=self._translate('portrait'))
+        self.maintainAspect = BooleanVar(value=True)
+        self.addPageNumbers = BooleanVar(value=False)
+        self.quality = StringVar(value=self._translate('high'))
+        self.languageVar = StringVar(value='en')
+        self.layoutMode = StringVar(value='grid')
+        
+        # Numeric values
+        self.rows = IntVar(value=1)
+        self.cols = IntVar(value=1)
+        self.separation = IntVar(value=0)
+        self.targetPages = IntVar(value=1)
+        
+    def _translate(self, key):
+        """
+        Translate key to current language.
+        
+        Args:
+            key: Translation key
+            
+        Returns:
+            Translated string
+        """
+        return TRANSLATIONS.get(self.currentLanguage, TRANSLATIONS['en']).get(key, key)
+        
+    def _changeLanguage(self, event=None):
+        """Change application language and rebuild UI."""
+        self.currentLanguage = self.languageVar.get()
+        savedFiles = list(self.listboxFiles.get(0, tk.END))
+        
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        self._setupUi()
+        
+        for file in savedFiles:
+            self.listboxFiles.insert(tk.END, file)
+        
+        # Keep controls locked if a background job is still running
+        if self.cancelEvent is not None:
+            self._setBusy(True)
+        
+        self.root.title(self._translate('title'))
+        
+    def _setupUi(self):
+        """Create the complete user interface."""
+        # Main container with scrollbar
+        mainContainer = tk.Frame(self.root, bg="#2C3E50")
+        mainContainer.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Canvas and scrollbar
+        canvas = tk.Canvas(mainContainer, bg="#2C3E50", highlightthickness=0)
+        scrollbar = tk.Scrollbar(mainContainer, orient="vertical", command=canvas.yview)
+        scrollableFrame = tk.Frame(canvas, bg="#2C3E50")
+        
+        scrollableFrame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvasWindow = canvas.create_window((0, 0), window=scrollableFrame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Center content
+        def centerContent(event):
+            canvas.itemconfig(canvasWindow, width=event.width)
+        canvas.bind('<Configure>', centerContent)
+        
+        # Mouse wheel scrolling
+        def onMousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas.bind_all("<MouseWheel>", onMousewheel)
+        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
+        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Build UI sections
+        self._createHeader(scrollableFrame)
+        self._createFilesSection(scrollableFrame)
+        self._createBasicParamsSection(scrollableFrame)
+        self._createAdvancedOptionsSection(scrollableFrame)
+        self._createOutputSection(scrollableFrame)
+        self._createActionButtons(scrollableFrame)
+        self._createStatusBar()
+        
+    def _createHeader(self, parent):
+        """Create title and language selector."""
+        headerFrame = tk.Frame(parent, bg="#2C3E50")
+        headerFrame.pack(fill=tk.X, pady=(0, 10))
+        
+        titleLabel = tk.Label(
+            headerFrame,
+            text=self._translate('title'),
+            font=("Arial", 18, "bold"),
+            bg="#2C3E50",
+            fg="white"
+        )
+        titleLabel.pack(side=tk.LEFT, padx=(0, 20))
+        
+        langFrame = tk.Frame(headerFrame, bg="#2C3E50")
+        langFrame.pack(side=tk.RIGHT)
+        
+        tk.Label(
+            langFrame,
+            text=self._translate('language'),
+            bg="#2C3E50",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        langMenu = ttk.Combobox(
+            langFrame,
+            textvariable=self.languageVar,
+            values=['en', 'fr'],
+            state="readonly",
+            width=8
+        )
+        langMenu.set(self.currentLanguage)
+        langMenu.pack(side=tk.LEFT)
+        langMenu.bind("<<ComboboxSelected>>", self._changeLanguage)
+        
+    def _createFilesSection(self, parent):
+        """Create file selection section."""
+        filesFrame = tk.LabelFrame(
+            parent,
+            text=self._translate('input_files'),
+            bg="#34495E",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=10,
+            pady=10
+        )
+        filesFrame.pack(fill=tk.BOTH, expand=False, pady=5)
+        
+        # Listbox with scrollbar
+        listContainer = tk.Frame(filesFrame, bg="#34495E")
+        listContainer.pack(fill=tk.BOTH, expand=False)
+        
+        scrollbar = tk.Scrollbar(listContainer)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.listboxFiles = Listbox(
+            listContainer,
+            selectmode=MULTIPLE,
+            height=4,
+            yscrollcommand=scrollbar.set,
+            bg="#ECF0F1",
+            font=("Courier", 9)
+        )
+        self.listboxFiles.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.listboxFiles.bind("<<ListboxSelect>>", self._showPageRange)
+        scrollbar.config(command=self.listboxFiles.yview)
+        
+        # Page selection of the selected files
+        rangeFrame = tk.Frame(filesFrame, bg="#34495E")
+        rangeFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            rangeFrame,
+            text=self._translate('page_range'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Entry(
+            rangeFrame,
+            textvariable=self.pageRange,
+            width=20
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            rangeFrame,
+            text=self._translate('apply_range'),
+            command=self._applyPageRange,
+            bg="#3498DB",
+            fg="white",
+            padx=8,
+            pady=3
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Action buttons
+        buttonFrame = tk.Frame(filesFrame, bg="#34495E")
+        buttonFrame.pack(pady=5)
+        
+        buttons = [
+            (self._translate('add_pdfs'), self._selectInputFiles, "#3498DB"),
+            (self._translate('remove'), self._removeSelectedFiles, "#E74C3C"),
+            (self._translate('move_up'), self._moveUp, "#95A5A6"),
+            (self._translate('move_down'), self._moveDown, "#95A5A6"),
+            (self._translate('clear_all'), self._clearAll, "#C0392B")
+        ]
+        
+        for text, command, color in buttons:
+            tk.Button(
+                buttonFrame,
+                text=text,
+                command=command,
+                bg=color,
+                fg="white",
+                padx=10,
+                pady=5
+            ).pack(side=tk.LEFT, padx=2)
+        
+    def _createBasicParamsSection(self, parent):
+        """Create basic layout parameters section."""
+        paramsFrame = tk.LabelFrame(
+            parent,
+            text=self._translate('layout_params'),
+            bg="#34495E",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=10,
+            pady=10
+        )
+        paramsFrame.pack(fill=tk.X, pady=5)
+        
+        # Layout mode selector
+        modeFrame = tk.Frame(paramsFrame, bg="#34495E")
+        modeFrame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(
+            modeFrame,
+            text=self._translate('layout_mode'),
+            bg="#34495E",
+            fg="white",
+            width=15,
+            anchor='w'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        modeMenu = ttk.Combobox(
+            modeFrame,
+            textvariable=self.layoutMode,
+            values=[mode.value for mode in LayoutMode],
+            state="readonly",
+            width=25
+        )
+        modeMenu.pack(side=tk.LEFT, padx=5)
+        modeMenu.bind("<<ComboboxSelected>>", self._toggleLayoutMode)
+        
+        # Create frames for both modes
+        self.gridControlsFrame = tk.Frame(paramsFrame, bg="#34495E")
+        self.targetPagesFrame = tk.Frame(paramsFrame, bg="#34495E")
+        
+        # Grid mode controls
+        self._createGridControls()
+        
+        # Target pages mode controls
+        self._createTargetPagesControls()
+        
+        # Show grid mode by default
+        self.gridControlsFrame.pack(fill=tk.X)
+        
+        # Separation (common to both modes)
+        self._createSeparationControl(paramsFrame)
+    
+    def _createGridControls(self):
+        """Create grid mode controls (rows and columns)."""
+        # Rows
+        rowFrame = tk.Frame(self.gridControlsFrame, bg="#34495E")
+        rowFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            rowFrame,
+            text=self._translate('rows'),
+            bg="#34495E",
+            fg="white",
+            width=15,
+            anchor='w'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            rowFrame,
+            text="−",
+            command=lambda: self._adjustValue(self.rows, -1, 1, None),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        self.rowsLabel = tk.Label(
+            rowFrame,
+            text="1",
+            bg="#ECF0F1",
+            width=5,
+            relief=tk.SUNKEN
+        )
+        self.rowsLabel.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            rowFrame,
+            text="+",
+            command=lambda: self._adjustValue(self.rows, 1, 1, None),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        # Columns
+        colFrame = tk.Frame(self.gridControlsFrame, bg="#34495E")
+        colFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            colFrame,
+            text=self._translate('columns'),
+            bg="#34495E",
+            fg="white",
+            width=15,
+            anchor='w'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            colFrame,
+            text="−",
+            command=lambda: self._adjustValue(self.cols, -1, 1, None),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        self.colsLabel = tk.Label(
+            colFrame,
+            text="1",
+            bg="#ECF0F1",
+            width=5,
+            relief=tk.SUNKEN
+        )
+        self.colsLabel.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            colFrame,
+            text="+",
+            command=lambda: self._adjustValue(self.cols, 1, 1, None),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+    
+    def _createTargetPagesControls(self):
+        """Create target pages mode controls."""
+        targetFrame = tk.Frame(self.targetPagesFrame, bg="#34495E")
+        targetFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            targetFrame,
+            text=self._translate('target_pages'),
+            bg="#34495E",
+            fg="white",
+            width=15,
+            anchor='w'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            targetFrame,
+            text="−",
+            command=lambda: self._adjustValue(self.targetPages, -1, 1, 1000),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        self.targetLabel = tk.Label(
+            targetFrame,
+            text="1",
+            bg="#ECF0F1",
+            width=5,
+            relief=tk.SUNKEN
+        )
+        self.targetLabel.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            targetFrame,
+            text="+",
+            command=lambda: self._adjustValue(self.targetPages, 1, 1, 1000),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        # Calculated grid info
+        self.calcGridLabel = tk.Label(
+            self.targetPagesFrame,
+            text="",
+            bg="#34495E",
+            fg="#3498DB",
+            font=("Arial", 9, "italic")
+        )
+        self.calcGridLabel.pack(fill=tk.X, pady=3)
+    
+    def _createSeparationControl(self, parent):
+        """Create separation pages control."""
+        sepFrame = tk.Frame(parent, bg="#34495E")
+        sepFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            sepFrame,
+            text=self._translate('separation'),
+            bg="#34495E",
+            fg="white",
+            width=15,
+            anchor='w'
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            sepFrame,
+            text="−",
+            command=lambda: self._adjustValue(self.separation, -1, 0, 20),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+        
+        self.sepLabel = tk.Label(
+            sepFrame,
+            text="0",
+            bg="#ECF0F1",
+            width=5,
+            relief=tk.SUNKEN
+        )
+        self.sepLabel.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            sepFrame,
+            text="+",
+            command=lambda: self._adjustValue(self.separation, 1, 0, 20),
+            bg="#95A5A6",
+            fg="white",
+            width=3
+        ).pack(side=tk.LEFT, padx=2)
+    
+    def _toggleLayoutMode(self, event=None):
+        """Switch between grid (or packed) and target pages mode."""
+        if self.layoutMode.get() != 'target_pages':
+            self.targetPagesFrame.pack_forget()
+            self.gridControlsFrame.pack(fill=tk.X, before=self.targetPagesFrame.master.winfo_children()[-1])
+        else:  # target_pages
+            self.gridControlsFrame.pack_forget()
+            self.targetPagesFrame.pack(fill=tk.X, before=self.targetPagesFrame.master.winfo_children()[-1])
+            self._updateCalculatedGrid()
+    
+    def _updateCalculatedGrid(self):
+        """Update the calculated grid display for target pages mode."""
+        inputPdfs = self._getInputs()
+        if not inputPdfs:
+            self.calcGridLabel.config(text="")
+            return
+        
+        try:
+            solution = _solveTargetGrid(self._getConfigFromGui(), inputPdfs)
+            self.calcGridLabel.config(text=self._translate('calculated_grid').format(
+                solution.rows, solution.columns, solution.outputPages
+            ))
+        except:
+            self.calcGridLabel.config(text="")
+    
+    def _adjustValue(self, var, delta, minVal, maxVal):
+        """
+        Adjust numeric value with +/- buttons.
+        
+        Args:
+            var: IntVar to modify
+            delta: Amount to add/subtract
+            minVal: Minimum allowed value
+            maxVal: Maximum allowed value (None for no limit)
+        """
+        newVal = var.get() + delta
+        if maxVal is None or minVal <= newVal <= maxVal:
+            if newVal >= minVal:
+                var.set(newVal)
+                
+                # Update corresponding label
+                if var == self.rows:
+                    self.rowsLabel.config(text=str(newVal))
+                elif var == self.cols:
+                    self.colsLabel.config(text=str(newVal))
+                elif var == self.separation:
+                    self.sepLabel.config(text=str(newVal))
+                    if self.layoutMode.get() == 'target_pages':
+                        self._updateCalculatedGrid()
+                elif var == self.targetPages:
+                    self.targetLabel.config(text=str(newVal))
+                    self._updateCalculatedGrid()
+            
+    def _createAdvancedOptionsSection(self, parent):
+        """Create advanced options section."""
+        advancedFrame = tk.LabelFrame(
+            parent,
+            text=self._translate('advanced_options'),
+            bg="#34495E",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=10,
+            pady=10
+        )
+        advancedFrame.pack(fill=tk.X, pady=5)
+        
+        # Page order
+        orderFrame = tk.Frame(advancedFrame, bg="#34495E")
+        orderFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            orderFrame,
+            text=self._translate('page_order'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        orderMenu = ttk.Combobox(
+            orderFrame,
+            textvariable=self.pageOrder,
+            values=[self._translate('horizontal'), self._translate('vertical')],
+            state="readonly",
+            width=12
+        )
+        orderMenu.pack(side=tk.LEFT, padx=5)
+        
+        # Output page size and orientation
+        pageSizeFrame = tk.Frame(advancedFrame, bg="#34495E")
+        pageSizeFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            pageSizeFrame,
+            text=self._translate('page_size'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        pageSizeMenu = ttk.Combobox(
+            pageSizeFrame,
+            textvariable=self.pageSize,
+            values=[name.title() for name in PAGE_SIZES],
+            state="readonly",
+            width=8
+        )
+        pageSizeMenu.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(
+            pageSizeFrame,
+            text=self._translate('orientation'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        orientationMenu = ttk.Combobox(
+            pageSizeFrame,
+            textvariable=self.orientation,
+            values=[
+                self._translate('portrait'),
+                self._translate('landscape'),
+                self._translate('auto')
+            ],
+            state="readonly",
+            width=10
+        )
+        orientationMenu.pack(side=tk.LEFT, padx=5)
+        
+        # Quality preset
+        qualityFrame = tk.Frame(advancedFrame, bg="#34495E")
+        qualityFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            qualityFrame,
+            text=self._translate('quality_preset'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        qualityMenu = ttk.Combobox(
+            qualityFrame,
+            textvariable=self.quality,
+            values=[
+                self._translate('low'),
+                self._translate('medium'),
+                self._translate('high'),
+                self._translate('maximum')
+            ],
+            state="readonly",
+            width=12
+        )
+        qualityMenu.pack(side=tk.LEFT, padx=5)
+        
+        # Grid options
+        gridOptFrame = tk.Frame(advancedFrame, bg="#34495E")
+        gridOptFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            gridOptFrame,
+            text=self._translate('grid'),
+            bg="#34495E",
+            fg="white"
+        ).pack(side=tk.LEFT, padx=5)
+        
+        gridMenu = ttk.Combobox(
+            gridOptFrame,
+            textvariable=self.gridOption,
+            values=[self._translate('show'), self._translate('hide')],
+            state="readonly",
+            width=8
+        )
+        gridMenu.pack(side=tk.LEFT, padx=5)
+        
+        self.colorDisplay = tk.Label(
+            gridOptFrame,
+            width=3,
+            bg=self.gridColor.get(),
+            relief=tk.RAISED
+        )
+        self.colorDisplay.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            gridOptFrame,
+            text=self._translate('choose_color'),
+            command=self._chooseGridColor,
+            bg="#9B59B6",
+            fg="white",
+            padx=8,
+            pady=3
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Checkboxes
+        checkFrame = tk.Frame(advancedFrame, bg="#34495E")
+        checkFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Checkbutton(
+            checkFrame,
+            text=self._translate('maintain_aspect'),
+            variable=self.maintainAspect,
+            bg="#34495E",
+            fg="white",
+            selectcolor="#2C3E50"
+        ).pack(side=tk.LEFT, padx=10)
+        
+        tk.Checkbutton(
+            checkFrame,
+            text=self._translate('add_page_numbers'),
+            variable=self.addPageNumbers,
+            bg="#34495E",
+            fg="white",
+            selectcolor="#2C3E50"
+        ).pack(side=tk.LEFT, padx=10)
+        
+    def _createOutputSection(self, parent):
+        """Create output options section."""
+        outputFrame = tk.LabelFrame(
+            parent,
+            text=self._translate('output_options'),
+            bg="#34495E",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=10,
+            pady=10
+        )
+        outputFrame.pack(fill=tk.X, pady=5)
+        
+        # Output folder
+        folderFrame = tk.Frame(outputFrame, bg="#34495E")
+        folderFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            folderFrame,
+            text=self._translate('folder'),
+            bg="#34495E",
+            fg="white",
+            width=10
+        ).pack(side=tk.LEFT)
+        
+        self.folderEntry = tk.Entry(folderFrame, textvariable=self.outputFolder)
+        self.folderEntry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.folderEntry.delete(0, tk.END)
+        self.folderEntry.insert(0, self._translate('default_folder'))
+        self.folderEntry.config(fg='gray')
+        self.folderEntry.bind('<FocusIn>', self._clearPlaceholderFolder)
+        self.folderEntry.bind('<FocusOut>', self._restorePlaceholderFolder)
+        
+        tk.Button(
+            folderFrame,
+            text=self._translate('browse'),
+            command=self._selectOutputFolder,
+            bg="#1ABC9C",
+            fg="white",
+            padx=10,
+            pady=5
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # PDF name
+        nameFrame = tk.Frame(outputFrame, bg="#34495E")
+        nameFrame.pack(fill=tk.X, pady=3)
+        
+        tk.Label(
+            nameFrame,
+            text=self._translate('filename'),
+            bg="#34495E",
+            fg="white",
+            width=10
+        ).pack(side=tk.LEFT)
+        
+        self.nameEntry = tk.Entry(nameFrame, textvariable=self.pdfName)
+        self.nameEntry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.nameEntry.delete(0, tk.END)
+        self.nameEntry.insert(0, self._translate('default_filename'))
+        self.nameEntry.config(fg='gray')
+        self.nameEntry.bind('<FocusIn>', self._clearPlaceholderName)
+        self.nameEntry.bind('<FocusOut>', self._restorePlaceholderName)
+        
+    def _createActionButtons(self, parent):
+        """Create preview and create PDF action buttons."""
+        actionFrame = tk.Frame(parent, bg="#2C3E50")
+        actionFrame.pack(pady=15)
+        
+        self.previewButton = tk.Button(
+            actionFrame,
+            text=self._translate('preview'),
+            command=self._previewPdf,
+            bg="#E67E22",
+            fg="white",
+            padx=20,
+            pady=10,
+            font=("Arial", 11, "bold")
+        )
+        self.previewButton.pack(side=tk.LEFT, padx=10)
+        
+        self.createButton = tk.Button(
+            actionFrame,
+            text=self._translate('create_pdf'),
+            command=self._createFinalOutput,
+            bg="#27AE60",
+            fg="white",
+            padx=20,
+            pady=10,
+            font=("Arial", 11, "bold")
+        )
+        self.createButton.pack(side=tk.LEFT, padx=10)
+        
+    def _createStatusBar(self):
+        """Create status bar, progress bar and cancel button at bottom of window."""
+        statusFrame = tk.Frame(self.root, bg="#34495E")
+        statusFrame.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.cancelButton = tk.Button(
+            statusFrame,
+            text=self._translate('cancel'),
+            command=self._cancelJob,
+            bg="#E74C3C",
+            fg="white",
+            padx=8,
+            state=tk.DISABLED
+        )
+        self.cancelButton.pack(side=tk.RIGHT, padx=2, pady=2)
+        
+        self.progressBar = ttk.Progressbar(
+            statusFrame,
+            orient=tk.HORIZONTAL,
+            mode='determinate',
+            length=150
+        )
+        self.progressBar.pack(side=tk.RIGHT, padx=5)
+        
+        self.statusBar = tk.Label(
+            statusFrame,
+            text=self._translate('ready'),
+            bd=1,
+            relief=tk.SUNKEN,
+            anchor=tk.W,
+            bg="#34495E",
+            fg="white"
+        )
+        self.statusBar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+    def _updateStatus(self, message):
+        """
+        Update status bar message.
+        
+        Args:
+            message: Status message to display
+        """
+        self.statusBar.config(text=message)
+        self.root.update_idletasks()
+        
+    def _runInBackground(self, work, onDone, onError):
+        """
+        Run a job on a worker thread, keeping the window responsive.
+        
+        The worker never touches tkinter: it reports through self.jobQueue,
+        which is polled from the main loop.
+        
+        Args:
+            work: Callable taking (cancelEvent, progressCallback) and
+                returning the job result
+            onDone: Called on the main thread with the job result
+            onError: Called on the main thread with the raised exception
+        """
+        self.cancelEvent = threading.Event()
+        cancelEvent = self.cancelEvent
+        jobQueue = self.jobQueue
+        
+        def reportProgress(progress):
+            jobQueue.put(('progress', progress))
+        
+        def target():
+            try:
+                result = work(cancelEvent, reportProgress)
+            except Exception as e:
+                jobQueue.put(('error', e))
+            else:
+                jobQueue.put(('done', result))
+        
+        self._setBusy(True)
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(100, self._pollJob, onDone, onError)
+        
+    def _pollJob(self, onDone, onError):
+        """
+        Process messages posted by the background job.
+        
+        Args:
+            onDone: Called with the job result when the job finishes
+            onError: Called with the exception if the job fails
+        """
+        try:
+            while True:
+                kind, payload = self.jobQueue.get_nowait()
+                if kind == 'progress':
+                    self._showProgress(payload)
+                    continue
+                
+                self._setBusy(False)
+                self.cancelEvent = None
+                if kind == 'done':
+                    onDone(payload)
+                elif isinstance(payload, CompactionCancelled):
+                    self._updateStatus(self._translate('cancelled'))
+                else:
+                    onError(payload)
+                return
+        except queue.Empty:
+            pass
+        
+        self.root.after(100, self._pollJob, onDone, onError)
+        
+    def _showProgress(self, progress):
+        """
+        Show compaction progress in the status bar.
+        
+        Args:
+            progress: CompactionProgress reported by compactPdfs
+        """
+        self.progressBar.config(
+            mode='determinate',
+            maximum=max(1, progress.totalSheets),
+            value=progress.sheetsWritten
+        )
+        self._updateStatus(self._translate('progress').format(
+            progress.pagesRendered,
+            progress.totalPages,
+            progress.sheetsWritten,
+            progress.totalSheets
+        ))
+        
+    def _setBusy(self, busy):
+        """
+        Enable or disable controls while a background job is running.
+        
+        Args:
+            busy: True when a job starts, False when it ends
+        """
+        actionState = tk.DISABLED if busy else tk.NORMAL
+        self.previewButton.config(state=actionState)
+        self.createButton.config(state=actionState)
+        self.cancelButton.config(state=tk.NORMAL if busy else tk.DISABLED)
+        
+        if busy:
+            self.progressBar.config(mode='indeterminate', value=0)
+            self.progressBar.start(10)
+        else:
+            self.progressBar.stop()
+            self.progressBar.config(mode='determinate', value=0)
+        
+    def _cancelJob(self):
+        """Ask the running background job to stop."""
+        if self.cancelEvent is not None:
+            self.cancelEvent.set()
+            self.cancelButton.config(state=tk.DISABLED)
+            self._updateStatus(self._translate('cancelling'))
+        
+    def _selectInputFiles(self):
+        """Open file dialog to select PDF files."""
+        files = filedialog.askopenfilenames(
+            filetypes=[("PDF Files", "*.pdf"), ("All Files", "*.*")]
+        )
+        for file in files:
+            if file not in self.listboxFiles.get(0, tk.END):
+                self.listboxFiles.insert(tk.END, file)
+        
+        self._updateStatus(self._translate('added_files').format(len(files)))
+        
+        if self.layoutMode.get() == 'target_pages':
+            self._updateCalculatedGrid()
+        
+    def _removeSelectedFiles(self):
+        """Remove selected files from the list."""
+        selected = self.listboxFiles.curselection()
+        for index in reversed(selected):
+            self.pageRanges.pop(self.listboxFiles.get(index), None)
+            self.listboxFiles.delete(index)
+        
+        self._updateStatus(self._translate('removed_files'))
+        
+        if self.layoutMode.get() == 'target_pages':
+            self._updateCalculatedGrid()
+        
+    def _moveUp(self):
+        """Move selected file up in the list."""
+        selected = self.listboxFiles.curselection()
+        if not selected or selected[0] == 0:
+            return
+        
+        for index in selected:
+            item = self.listboxFiles.get(index)
+            self.listboxFiles.delete(index)
+            self.listboxFiles.insert(index - 1, item)
+            self.listboxFiles.selection_set(index - 1)
+            
+    def _moveDown(self):
+        """Move selected file down in the list."""
+        selected = self.listboxFiles.curselection()
+        if not selected or selected[-1] == self.listboxFiles.size() - 1:
+            return
+        
+        for index in reversed(selected):
+            item = self.listboxFiles.get(index)
+            self.listboxFiles.delete(index)
+            self.listboxFiles.insert(index + 1, item)
+            self.listboxFiles.selection_set(index + 1)
+            
+    def _clearAll(self):
+        """Clear all files from the list after confirmation."""
+        if self.listboxFiles.size() > 0:
+            if messagebox.askyesno(
+                self._translate('confirm'),
+                self._translate('clear_all_confirm')
+            ):
+                self.listboxFiles.delete(0, tk.END)
+                self.pageRanges.clear()
+                self._updateStatus(self._translate('cleared_files'))
+                
+                if self.layoutMode.get() == 'target_pages':
+                    self._updateCalculatedGrid()
+                
+    def _showPageRange(self, event=None):
+        """Show the page selector of the first selected file."""
+        selected = self.listboxFiles.curselection()
+        if selected:
+            self.pageRange.set(self.pageRanges.get(self.listboxFiles.get(selected[0]), ""))
+    
+    def _applyPageRange(self):
+        """Set the page selector of the selected files (blank = all pages)."""
+        spec = self.pageRange.get().strip()
+        try:
+            parsePageRange(spec, 0)
+        except ValueError as e:
+            messagebox.showerror(self._translate('invalid_range'), str(e))
+            return
+        
+        selected = self.listboxFiles.curselection()
+        for index in selected:
+            path = self.listboxFiles.get(index)
+            if spec:
+                self.pageRanges[path] = spec
+            else:
+                self.pageRanges.pop(path, None)
+        
+        self._updateStatus(self._translate('range_applied').format(len(selected)))
+        
+        if self.layoutMode.get() == 'target_pages':
+            self._updateCalculatedGrid()
+    
+    def _getInputs(self):
+        """
+        Get the input files with their page selectors.
+        
+        Returns:
+            List of PdfInput objects in list order
+        """
+        return [
+            PdfInput(path, self.pageRanges.get(path))
+            for path in self.listboxFiles.get(0, tk.END)
+        ]
+    
+    def _chooseGridColor(self):
+        """Open color picker for grid color selection."""
+        color = colorchooser.askcolor(color=self.gridColor.get())[1]
+        if color:
+            self.gridColor.set(color)
+            self.colorDisplay.config(bg=color)
+            
+    def _applyQualityPreset(self):
+        """
+        Get compression percentage from quality preset.
+        
+        Returns:
+            Integer compression percentage (25-100)
+        """
+        presets = {
+            self._translate('low'): 50,
+            self._translate('medium'): 75,
+            self._translate('high'): 100,
+            self._translate('maximum'): 100
+        }
+        return presets.get(self.quality.get(), 100)
+        
+    def _selectOutputFolder(self):
+        """Open folder selection dialog."""
+        folder = filedialog.askdirectory()
+        if folder:
+            self.outputFolder.set(folder)
+            self.folderEntry.delete(0, tk.END)
+            self.folderEntry.insert(0, folder)
+            self.folderEntry.config(fg='black')
+            
+    def _clearPlaceholderFolder(self, event):
+        """Clear folder placeholder text on focus."""
+        currentText = self.folderEntry.get()
+        if currentText == self._translate('default_folder'):
+            self.folderEntry.delete(0, tk.END)
+            self.folderEntry.config(fg='black')
+            
+    def _restorePlaceholderFolder(self, event):
+        """Restore folder placeholder text if empty."""
+        if not self.folderEntry.get():
+            self.folderEntry.insert(0, self._translate('default_folder'))
+            self.folderEntry.config(fg='gray')
+            
+    def _clearPlaceholderName(self, event):
+        """Clear filename placeholder text on focus."""
+        currentText = self.nameEntry.get()
+        if currentText == self._translate('default_filename'):
+            self.nameEntry.delete(0, tk.END)
+            self.nameEntry.config(fg='black')
+            
+    def _restorePlaceholderName(self, event):
+        """Restore filename placeholder text if empty."""
+        if not self.nameEntry.get():
+            self.nameEntry.insert(0, self._translate('default_filename'))
+            self.nameEntry.config(fg='gray')
+    
+    def _getConfigFromGui(self):
+        """
+        Build CompactionConfig from GUI settings.
+        
+        Returns:
+            CompactionConfig object with current GUI settings
+        """
+        # Parse grid color
+        try:
+            colorHex = self.gridColor.get()
+            gridColor = tuple(int(colorHex[i:i+2], 16)/255 for i in (1, 3, 5))
+        except:
+            gridColor = (0, 0, 0)
+        
+        # Determine page order
+        pageOrderValue = (
+            PageOrder.HORIZONTAL 
+            if self.pageOrder.get() == self._translate('horizontal')
+            else PageOrder.VERTICAL
+        )
+        
+        # Determine orientation
+        orientationValue = {
+            self._translate('landscape'): Orientation.LANDSCAPE,
+            self._translate('auto'): Orientation.AUTO
+        }.get(self.orientation.get(), Orientation.PORTRAIT)
+        
+        # Determine layout mode
+        layoutModeValue = LayoutMode(self.layoutMode.get())
+        
+        # Get output folder
+        outputDir = self.outputFolder.get()
+        if not outputDir or outputDir in [
+            self._translate('default_folder'),
+            TRANSLATIONS['en']['default_folder'],
+            TRANSLATIONS['fr']['default_folder']
+        ]:
+            outputDir = None
+        
+        # Get filename
+        filename = self.pdfName.get()
+        if not filename or filename in [
+            self._translate('default_filename'),
+            TRANSLATIONS['en']['default_filename'],
+            TRANSLATIONS['fr']['default_filename']
+        ]:
+            filename = None
+        
+        return CompactionConfig(
+            rows=self.rows.get(),
+            columns=self.cols.get(),
+            targetPages=self.targetPages.get(),
+            layoutMode=layoutModeValue,
+            compression=self._applyQualityPreset(),
+            separationPages=self.separation.get(),
+            pageOrder=pageOrderValue,
+            maintainAspectRatio=self.maintainAspect.get(),
+            showGrid=(self.gridOption.get() == self._translate('show')),
+            gridColor=gridColor,
+            addPageNumbers=self.addPageNumbers.get(),
+            outputDir=outputDir,
+            outputFilename=filename,
+            pageSize=self.pageSize.get(),
+            orientation=orientationValue
+        )
+    
+    def _previewPdf(self):
+        """Generate and display preview of first output page."""
+        inputPdfs = self._getInputs()
+        if not inputPdfs:
+            messagebox.showerror(
+                self._translate('error'),
+                self._translate('no_files_error')
+            )
+            return
+        
+        self._updateStatus(self._translate('preview_generating'))
+        config = self._getConfigFromGui()
+        
+        def work(cancelEvent, progressCallback):
+            rows, columns = _getLayoutParameters(config, inputPdfs)
+            sheet = None
+            count = columns * rows
+            if config.layoutMode == LayoutMode.PACKED:
+                sheets, _ = _packSheets(
+                    _slotSizes(_inputPageSizes(inputPdfs), config.separationPages),
+                    _sheetGeometries(config, rows, columns),
+                    config
+                )
+                sheet = sheets[0] if sheets else None
+                count = len(sheet.rects) if sheet else 0
+            previewPages = self._getPreviewPages(inputPdfs, config, count, cancelEvent)
+            return rows, columns, previewPages, sheet
+        
+        def onError(e):
+            messagebox.showerror(
+                self._translate('error'),
+                f"{self._translate('preview_failed')}:\n{str(e)}"
+            )
+            self._updateStatus(self._translate('preview_failed'))
+        
+        def onDone(result):
+            try:
+                self._showPreview(config, *result)
+            except Exception as e:
+                onError(e)
+        
+        self._runInBackground(work, onDone, onError)
+    
+    def _showPreview(self, config, rows, columns, previewPages, sheet=None):
+        """
+        Compose the preview sheet and show it in a new window.
+        
+        Args:
+            config: CompactionConfig used for the preview
+            rows: Number of grid rows
+            columns: Number of grid columns
+            previewPages: Pixmaps for the cells of the first sheet
+            sheet: Planned first output page in PACKED mode
+        """
+        # Compose the preview sheet in memory, exactly like compactPdfs
+        newDoc = fitz.open()
+        phaseSeconds = dict.fromkeys(COMPACTION_PHASES, 0.0)
+        if sheet is not None:
+            _composePackedSheet(newDoc, previewPages, sheet, config, None, phaseSeconds)
+        else:
+            _composeSheet(
+                newDoc,
+                previewPages,
+                _sheetGeometries(config, rows, columns),
+                config,
+                None,
+                phaseSeconds
+            )
+        pixPreview = newDoc[0].get_pixmap()
+        newDoc.close()
+        
+        # Create PIL image
+        img = Image.frombytes(
+            "RGB",
+            [pixPreview.width, pixPreview.height],
+            pixPreview.samples
+        )
+        img.thumbnail((800, 600), Image.Resampling.LANCZOS)
+        
+        # Show preview window
+        previewWin = Toplevel(self.root)
+        previewWin.title(self._translate('preview_title'))
+        previewWin.configure(bg="#2C3E50")
+        
+        canvas = Canvas(
+            previewWin,
+            width=img.width,
+            height=img.height,
+            bg="#2C3E50"
+        )
+        canvas.pack(padx=10, pady=10)
+        
+        imgTk = ImageTk.PhotoImage(img)
+        canvas.create_image(0, 0, anchor=tk.NW, image=imgTk)
+        canvas.image = imgTk
+        
+        self._updateStatus(self._translate('preview_success'))
+    
+    def _getPreviewPages(self, inputPdfs, config, count, cancelEvent=None):
+        """
+        Get the page thumbnails shown on the first output page.
+        
+        Thumbnails are cached by (path, mtime, page index, zoom), so
+        previews that only change decorations (grid, colors, page numbers),
+        the grid size or the page selection re-render nothing that was
+        already seen.
+        
+        Args:
+            inputPdfs: List of PdfInput objects
+            config: Current CompactionConfig
+            count: Number of grid cells on an output page
+            cancelEvent: Optional threading.Event checked before each render
+            
+        Returns:
+            List of at most count fitz.Pixmap objects (None for separation pages)
+            
+        Raises:
+            CompactionCancelled: If cancelEvent was set
+        """
+        zoom = config.compression / 100.0
+        previewPages = []
+        
+        for docIdx, pdfInput in enumerate(inputPdfs):
+            if len(previewPages) >= count:
+                break
+            
+            path = pdfInput.source
+            mtime = os.path.getmtime(path)
+            selected = pdfInput.pageNumbers(getDocumentInfo(path).pageCount)
+            doc = None
+            try:
+                for pageNum in selected[:count - len(previewPages)]:
+                    key = (path, mtime, pageNum, zoom)
+                    pixmap = self.thumbnailCache.get(key)
+                    if pixmap is None:
+                        if cancelEvent is not None and cancelEvent.is_set():
+                            raise CompactionCancelled("Preview cancelled")
+                        if doc is None:
+                            doc = fitz.open(path)
+                        pixmap = _renderPage(
+                            doc[pageNum], _RenderSettings(config.compression)
+                        )
+                        self.thumbnailCache[key] = pixmap
+                        if len(self.thumbnailCache) > PREVIEW_CACHE_SIZE:
+                            self.thumbnailCache.popitem(last=False)
+                    else:
+                        self.thumbnailCache.move_to_end(key)
+                    previewPages.append(pixmap)
+            finally:
+                if doc is not None:
+                    doc.close()
+            
+            # Add separation pages between documents
+            if docIdx < len(inputPdfs) - 1:
+                previewPages.extend([None] * config.separationPages)
+        
+        return previewPages[:count]
+    
+    def _createFinalOutput(self):
+        """Create final PDF output using core library."""
+        inputPdfs = self._getInputs()
+        if not inputPdfs:
+            messagebox.showerror(
+                self._translate('error'),
+                self._translate('no_files_error')
+            )
+            return
+        
+        self._updateStatus(self._translate('creating_pdf'))
+        config = self._getConfigFromGui()
+        
+        def work(cancelEvent, progressCallback):
+            return compactPdfs(inputPdfs, config, progressCallback, cancelEvent)
+        
+        def onDone(outputPath):
+            self._updateStatus(
+                self._translate('pdf_saved').format(os.path.basename(outputPath))
+            )
+            
+            messagebox.showinfo(
+                self._translate('success'),
+                f"{self._translate('pdf_created')}\n\n"
+                f"{self._translate('saved_to')}\n{outputPath}"
+            )
+        
+        def onError(e):
+            messagebox.showerror(
+                self._translate('error'),
+                f"{self._translate('pdf_failed')}:\n{str(e)}"
+            )
+            self._updateStatus(self._translate('pdf_failed'))
+        
+        self._runInBackground(work, onDone, onError)
+
+
+def launchGui():
+    """
+    Launch the PDF Compactor GUI application.
+    
+    This is the main entry point for the GUI. Call this function to start
+    the interactive PDF compaction interface.
+    
+    Example:
+        >>> from vicutils.pdf import launchGui
+        >>> launchGui()
+    """
+    root = tk.Tk()
+    app = PdfCompactorApp(root)
+    root.mainloop()
@@ -1,34 +1,163 @@
 """
-PDF Compactor GUI Module
+PDF Compactor Engine
 Generated with Claude AI assistance
 
-Graphical user interface for PDF compaction using tkinter.
+Headless PDF compaction: layout, rendering and composition of output
+pages. Needs fitz (PyMuPDF) only; the tkinter GUI lives in the gui module.
 """
 
 import os
-import tkinter as tk
-from tkinter import filedialog, messagebox, Toplevel, Canvas, Listbox, MULTIPLE, colorchooser
-from tkinter import ttk, StringVar, IntVar, BooleanVar
-from PIL import Image, ImageTk
-import platform
-import tempfile
+import asyncio
+import atexit
+import hashlib
+import inspect
+import io
+import json
+import mmap
+import re
+import threading
+import time
 import fitz
 
 import math
-from dataclasses import dataclass
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import List, Tuple, Optional, Union
+from itertools import accumulate, islice
+from typing import (
+    AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional, Union
+)
 
 
 # A4 dimensions in points (1 point = 1/72 inch)
 A4_WIDTH = 595.276  # 210mm
 A4_HEIGHT = 841.890  # 297mm
 
+# Output page sizes in points, as (width, height) in portrait orientation
+PAGE_SIZES = {
+    "a3": (841.890, 1190.551),
+    "a4": (A4_WIDTH, A4_HEIGHT),
+    "a5": (419.528, 595.276),
+    "letter": (612.0, 792.0),
+    "legal": (612.0, 1008.0),
+}
+
+
+# Anything compactPdfs accepts as an input PDF: a path, an in-memory buffer
+# (bytes, bytearray, memoryview, mmap) or a readable binary stream
+PdfSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+# One page selector part: a page, or a range whose end may be left open
+_PAGE_RANGE_PATTERN = re.compile(r"(-?\d+)(?:(-)(-?\d+)?)?")
+
+
+def parsePageRange(spec: Optional[str], pageCount: int) -> List[int]:
+    """
+    Parse a page selector into zero-based page indices.
+    
+    A selector is a comma-separated list of 1-based pages ("7"), inclusive
+    ranges ("1-3", or "5-" up to the last page), pages counted from the end
+    ("-1" is the last page, "-3--1" the last three) and the words "odd" and
+    "even". Pages are returned in the order written; parts outside the
+    document are dropped. A blank selector selects every page.
+    
+    Args:
+        spec: Page selector
+        pageCount: Number of pages in the document
+        
+    Returns:
+        List of page indices
+        
+    Raises:
+        ValueError: If the selector is malformed
+        
+    Example:
+        >>> parsePageRange("1-3,7,-1", 10)
+        [0, 1, 2, 6, 9]
+    """
+    if spec is None or not spec.strip():
+        return list(range(pageCount))
+    
+    def toIndex(number: int) -> int:
+        if number == 0:
+            raise ValueError(f"Invalid page range: {spec!r} (pages start at 1)")
+        return number - 1 if number > 0 else pageCount + number
+    
+    pages = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if part in ("odd", "even"):
+            pages.extend(range(0 if part == "odd" else 1, pageCount, 2))
+            continue
+        
+        match = _PAGE_RANGE_PATTERN.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Invalid page range: {spec!r}")
+        
+        first = toIndex(int(match.group(1)))
+        if match.group(2) is None:
+            last = first
+        elif match.group(3) is None:
+            last = pageCount - 1
+        else:
+            last = toIndex(int(match.group(3)))
+        
+        # Clip to the document, keeping the direction of the range
+        low = max(min(first, last), 0)
+        high = min(max(first, last), pageCount - 1)
+        if low <= high:
+            selected = range(low, high + 1)
+            pages.extend(selected if first <= last else reversed(selected))
+    return pages
+
+
+@dataclass
+class PdfInput:
+    """
+    An input PDF with a page selection, accepted by compactPdfs.
+    
+    Attributes:
+        source: The PDF (see PdfSource)
+        pages: Page selector (see parsePageRange); None selects every page
+    """
+    source: PdfSource
+    pages: Optional[str] = None
+    
+    def pageNumbers(self, pageCount: int) -> Sequence[int]:
+        """
+        Get the selected page indices.
+        
+        Args:
+            pageCount: Number of pages in the document
+            
+        Returns:
+            Zero-based page indices in output order
+        """
+        if self.pages is None or not self.pages.strip():
+            return range(pageCount)
+        return parsePageRange(self.pages, pageCount)
+
+
+def _asPdfInput(source: Union[PdfSource, PdfInput]) -> PdfInput:
+    """Wrap a plain PDF source in a PdfInput selecting every page."""
+    return source if isinstance(source, PdfInput) else PdfInput(source)
+
 
 class LayoutMode(Enum):
     """Layout mode for PDF compaction."""
     GRID = "grid"  # Manual rows × columns
     TARGET_PAGES = "target_pages"  # Auto-calculate grid from target page count
+    PACKED = "packed"  # Bin-pack pages of different sizes at a common scale
+
+
+class RenderMode(Enum):
+    """How source pages are drawn onto output pages."""
+    RASTER = "raster"  # Render each page to an image (honours compression)
+    VECTOR = "vector"  # Embed each page as a vector XObject (text stays searchable)
 
 
 class PageOrder(Enum):
@@ -37,6 +166,13 @@ class PageOrder(Enum):
     VERTICAL = "vertical"  # Fill top-to-bottom, then left-to-right
 
 
+class Orientation(Enum):
+    """Orientation of output pages."""
+    PORTRAIT = "portrait"
+    LANDSCAPE = "landscape"
+    AUTO = "auto"  # Per output page, whichever fits its source pages best
+
+
 @dataclass
 class CompactionConfig:
     """
@@ -46,7 +182,10 @@ class CompactionConfig:
         rows: Number of rows per output page (grid mode)
         columns: Number of columns per output page (grid mode)
         targetPages: Target number of output pages (target_pages mode)
-        layoutMode: Layout mode to use (GRID or TARGET_PAGES)
+        layoutMode: Layout mode to use (GRID, TARGET_PAGES or PACKED). PACKED
+            keeps the pages' relative sizes at the largest common scale that
+            fits them in a rows × columns cell, packs them onto output pages
+            in order, and always maintains aspect ratios
         compression: Image quality percentage (25-100, where 100=original)
         separationPages: Number of blank pages to insert between input PDFs
         pageOrder: Order for placing pages (HORIZONTAL or VERTICAL)
@@ -56,6 +195,40 @@ class CompactionConfig:
         addPageNumbers: Whether to add page numbers to each cell
         outputDir: Directory for output file (None = auto-create VicOutput)
         outputFilename: Name of output file (None = auto-generate)
+        workers: Number of processes used to render pages (1 = in-process)
+        renderMode: RASTER renders pages to images, VECTOR embeds them as-is
+            (compression and workers are ignored in VECTOR mode)
+        targetDpi: If set, each page is rendered at the zoom that gives this
+            resolution in its grid cell, instead of the uniform compression zoom
+        jpegQuality: If set (1-100), cell images are stored as JPEG at this
+            quality instead of lossless images
+        deduplicate: Embed identical pages (same rendered samples, or same
+            content in VECTOR mode) once and reference them from every cell
+        composeWorkers: Number of processes that render and compose ranges of
+            output pages into partial documents, merged in order afterwards
+            (1 = compose in-process; needs file inputs, workers is ignored).
+            With deduplicate, each range embeds its duplicates once and the
+            final save merges identical images across ranges (not when
+            flushing)
+        flushEverySheets: If > 0, the output file is first written after this
+            many output pages and then appended to with incremental saves
+            every this many pages, so early pages are on disk before the last
+            ones are composed (file output only; the final garbage collection
+            pass is skipped, so without deduplicate identical images are only
+            shared within a flush). Written bytes are never rewritten, see
+            CompactionProgress.bytesFlushed
+        pageSize: Output page size in points, (width, height), or a name
+            from PAGE_SIZES ("a4", "letter", ...)
+        orientation: PORTRAIT or LANDSCAPE, or AUTO to choose per output
+            page the orientation and grid (rows and columns swapped or not)
+            under which its source pages cover the most area
+        minScale: Smallest common page scale in PACKED mode (pages larger
+            than the output page are still shrunk to fit it)
+        renderCacheDir: If set, rendered pages are stored in this directory
+            (see RenderCache) and reused by later runs on the same documents
+            at the same zoom, e.g. when compacting them into other grids
+        renderCacheBytes: Size limit of the render cache; least recently
+            used pages are evicted beyond it
     """
     rows: int = 1
     columns: int = 1
@@ -70,6 +243,18 @@ class CompactionConfig:
     addPageNumbers: bool = False
     outputDir: Optional[str] = None
     outputFilename: Optional[str] = None
+    workers: int = 1
+    renderMode: RenderMode = RenderMode.RASTER
+    targetDpi: Optional[int] = None
+    jpegQuality: Optional[int] = None
+    deduplicate: bool = False
+    composeWorkers: int = 1
+    flushEverySheets: int = 0
+    pageSize: Tuple[float, float] = (A4_WIDTH, A4_HEIGHT)
+    orientation: Orientation = Orientation.PORTRAIT
+    minScale: float = 0.1
+    renderCacheDir: Optional[str] = None
+    renderCacheBytes: int = 1 << 30
     
     def __post_init__(self):
         """Validate configuration values."""
@@ -78,14 +263,238 @@ class CompactionConfig:
         self.columns = max(1, self.columns)
         self.targetPages = max(1, self.targetPages)
         self.separationPages = max(0, self.separationPages)
+        self.workers = max(1, self.workers)
+        self.composeWorkers = max(1, self.composeWorkers)
+        self.flushEverySheets = max(0, self.flushEverySheets)
+        self.minScale = max(0.01, self.minScale)
+        self.renderCacheBytes = max(0, self.renderCacheBytes)
+        if isinstance(self.pageSize, str):
+            if self.pageSize.lower() not in PAGE_SIZES:
+                raise ValueError(f"Unknown page size: {self.pageSize}")
+            self.pageSize = PAGE_SIZES[self.pageSize.lower()]
+        if self.targetDpi is not None:
+            self.targetDpi = max(1, self.targetDpi)
+        if self.jpegQuality is not None:
+            self.jpegQuality = max(1, min(100, self.jpegQuality))
+
+
+@dataclass
+class CompactionProgress:
+    """
+    Progress of a running compaction, passed to progress callbacks.
+    
+    Attributes:
+        pagesRendered: Number of input pages placed so far
+        totalPages: Total number of input pages (excluding separation pages)
+        sheetsWritten: Number of output pages composed so far
+        totalSheets: Total number of output pages
+        sheetsFlushed: Number of output pages already written to the output
+            file (with flushEverySheets)
+        bytesFlushed: Size of the output file after the last flush. Later
+            flushes only append, so these bytes are final and hold the
+            first sheetsFlushed pages
+    """
+    pagesRendered: int
+    totalPages: int
+    sheetsWritten: int
+    totalSheets: int
+    sheetsFlushed: int = 0
+    bytesFlushed: int = 0
+
+
+# Phases timed by compactPdfs, in pipeline order
+COMPACTION_PHASES = ("open", "count", "render", "place", "grid", "save")
+
+
+@dataclass
+class CompactionResult:
+    """
+    Outcome of a compaction, returned by compactPdfs(returnResult=True).
+    
+    Attributes:
+        outputPath: Path of the created output PDF (None when written to a
+            caller-supplied stream)
+        placedImages: Number of input pages placed in cells
+        uniqueImages: Number of distinct page images embedded in the output,
+            counted across the whole job (also with composeWorkers)
+        wallSeconds: Total time spent in compactPdfs
+        phaseSeconds: Time per phase (see COMPACTION_PHASES). Rendering is
+            streamed, so "render" is the time spent waiting for pages
+        bytesIn: Total size of the inputs
+        bytesOut: Size of the output (0 if written to a non-seekable stream)
+        peakPixmapBytes: Largest amount of pixmap samples held at once
+        documentPages: Number of pages selected from each input document,
+            in input order
+        outputPages: Number of pages in the output
+        renderCacheHits: Pages loaded from the render cache instead of
+            being rendered
+        renderCacheMisses: Pages rendered and added to the render cache
+    """
+    outputPath: Optional[str]
+    placedImages: int = 0
+    uniqueImages: int = 0
+    wallSeconds: float = 0.0
+    phaseSeconds: Dict[str, float] = field(default_factory=dict)
+    bytesIn: int = 0
+    bytesOut: int = 0
+    peakPixmapBytes: int = 0
+    documentPages: List[int] = field(default_factory=list)
+    outputPages: int = 0
+    renderCacheHits: int = 0
+    renderCacheMisses: int = 0
+    
+    @property
+    def dedupRatio(self) -> float:
+        """Placed pages per embedded image (1.0 means nothing was shared)."""
+        return self.placedImages / self.uniqueImages if self.uniqueImages else 1.0
+    
+    @property
+    def pagesPerSecond(self) -> float:
+        """Input pages placed per second of wall time."""
+        return self.placedImages / self.wallSeconds if self.wallSeconds else 0.0
+
+
+class CompactionHooks:
+    """
+    Receives compaction metrics, e.g. to forward them to a metrics system.
+    
+    Subclass and override the methods you need, then pass an instance to
+    compactPdfs(hooks=...). Hooks are called on the compacting thread.
+    """
+    
+    def onSheet(self, progress: CompactionProgress) -> None:
+        """
+        Called after each output page is composed.
+        
+        Args:
+            progress: Current progress counters
+        """
+    
+    def onPhase(self, phase: str, seconds: float) -> None:
+        """
+        Called once per phase when the compaction finishes.
+        
+        Args:
+            phase: Phase name from COMPACTION_PHASES
+            seconds: Total time spent in that phase
+        """
+    
+    def onResult(self, result: CompactionResult) -> None:
+        """
+        Called with the final result of a successful compaction.
+        
+        Args:
+            result: Result with timings and counters
+        """
+
+
+class CompactionCancelled(Exception):
+    """Raised by compactPdfs when its cancel event is set."""
+
+
+@dataclass
+class GridSolution:
+    """
+    Grid chosen by solveGrid.
+    
+    Attributes:
+        rows: Number of grid rows
+        columns: Number of grid columns
+        outputPages: Predicted number of output pages
+        coverage: Fraction of the output pages' area covered by the scaled
+            source pages (0-1)
+    """
+    rows: int
+    columns: int
+    outputPages: int
+    coverage: float
+
+
+def solveGrid(
+    pageSizes: List[Optional[Tuple[float, float]]],
+    targetPages: int,
+    sheetSizes: Optional[List[Tuple[float, float]]] = None,
+    maintainAspectRatio: bool = True
+) -> GridSolution:
+    """
+    Find the grid giving the largest pages within a target output page count.
+    
+    Every (rows, columns) pair that fits all slots on at most targetPages
+    output pages is considered. For each row count only the fewest columns
+    matter, as extra cells never make pages larger. Candidates are scored by
+    the total area of the source pages scaled into their cells, so grids
+    whose cells match the real page shapes win; ties go to the squarer grid.
+    A page of aspect ratio r = w / h scaled into a cw × ch cell covers
+    min(cw² / r, ch² · r), so with the ratios sorted once each candidate is
+    scored by a bisection and two prefix sums, and a call costs
+    O(slots × log slots + slots / targetPages × log slots).
+    
+    Args:
+        pageSizes: (width, height) of each slot in points, or None for
+            separation pages
+        targetPages: Maximum number of output pages
+        sheetSizes: Output page sizes to try for each grid (the best one
+            counts); defaults to A4 portrait
+        maintainAspectRatio: If False, pages fill their cells, so the grid
+            with the largest cells wins
+        
+    Returns:
+        The best GridSolution
+        
+    Example:
+        >>> solveGrid([(A4_WIDTH, A4_HEIGHT)] * 24, 3)
+        GridSolution(rows=3, columns=3, outputPages=3, coverage=...)
+    """
+    slotCount = len(pageSizes)
+    if slotCount == 0 or targetPages <= 0:
+        return GridSolution(1, 1, slotCount, 0.0)
+    
+    sheetSizes = sheetSizes or [(A4_WIDTH, A4_HEIGHT)]
+    ratios = sorted(size[0] / size[1] for size in pageSizes if size is not None)
+    pageCount = len(ratios)
+    # ratioSums[i] = sum of the i smallest ratios; inverseSums[i] = sum of
+    # 1 / ratio over the ratios from index i on
+    ratioSums = [0.0, *accumulate(ratios)]
+    inverseSums = [*accumulate((1 / ratio for ratio in reversed(ratios)), initial=0.0)][::-1]
+    cellsNeeded = math.ceil(slotCount / targetPages)
+    
+    best = None
+    bestKey = None
+    for rows in range(1, cellsNeeded + 1):
+        columns = math.ceil(cellsNeeded / rows)
+        outputPages = math.ceil(slotCount / (rows * columns))
+        
+        for sheetWidth, sheetHeight in sheetSizes:
+            cellWidth = sheetWidth / columns
+            cellHeight = sheetHeight / rows
+            if maintainAspectRatio:
+                # Pages wider than the cell are width-constrained
+                split = bisect_left(ratios, cellWidth / cellHeight)
+                area = (
+                    cellWidth ** 2 * inverseSums[split]
+                    + cellHeight ** 2 * ratioSums[split]
+                )
+            else:
+                area = cellWidth * cellHeight * pageCount
+            
+            key = (round(area, 3), -abs(rows - columns))
+            if bestKey is None or key > bestKey:
+                bestKey = key
+                best = GridSolution(
+                    rows,
+                    columns,
+                    outputPages,
+                    area / (outputPages * sheetWidth * sheetHeight)
+                )
+    return best
 
 
 def calculateOptimalGrid(totalPages: int, targetPages: int) -> Tuple[int, int]:
     """
     Calculate optimal grid (rows × columns) for given target page count.
     
-    Attempts to create a grid as close to square as possible while fitting
-    all pages within the target number of output pages.
+    Assumes A4 portrait source and output pages; use solveGrid to account
+    for the real page sizes.
     
     Args:
         totalPages: Total number of input pages to distribute
@@ -96,246 +505,2130 @@ def calculateOptimalGrid(totalPages: int, targetPages: int) -> Tuple[int, int]:
         
     Example:
         >>> calculateOptimalGrid(24, 3)
-        (2, 4)  # 2×4 grid = 8 pages per output, 24/8 = 3 output pages
+        (3, 3)  # 3×3 cells have the A4 shape; 24 pages fit on 3 output pages
     """
     if targetPages <= 0 or totalPages <= 0:
         return 1, 1
     
-    # Calculate pages per output page
-    pagesPerOutput = math.ceil(totalPages / targetPages)
+    solution = solveGrid([(A4_WIDTH, A4_HEIGHT)] * totalPages, targetPages)
+    return solution.rows, solution.columns
+
+
+@dataclass
+class DocumentInfo:
+    """
+    Page metadata of a PDF file, as stored in the metadata cache.
     
-    # Find factors closest to square root for most balanced grid
-    sqrtVal = math.sqrt(pagesPerOutput)
-    bestRows = 1
-    bestCols = pagesPerOutput
-    minDiff = abs(bestRows - bestCols)
+    Attributes:
+        pageCount: Number of pages in the document
+        pageSizes: (width, height) of each page in points, rotation applied
+    """
+    pageCount: int
+    pageSizes: List[Tuple[float, float]]
+
+
+# Session-wide metadata cache: absolute path -> (size, mtime_ns, DocumentInfo)
+_documentInfoCache: Dict[str, Tuple[int, int, DocumentInfo]] = {}
+_documentInfoLock = threading.Lock()
+_metadataCachePath: Optional[str] = None
+_metadataCacheDirty = False
+
+
+def setMetadataCachePath(cachePath: Optional[str]) -> None:
+    """
+    Persist the document metadata cache to a JSON file.
     
-    # Try to find perfect factors
-    for rows in range(1, int(sqrtVal) + 2):
-        if pagesPerOutput % rows == 0:
-            cols = pagesPerOutput // rows
-            diff = abs(rows - cols)
-            if diff < minDiff:
-                minDiff = diff
-                bestRows = rows
-                bestCols = cols
+    Entries already in the file are loaded immediately. Newly parsed
+    documents are written back by saveMetadataCache, which compactPdfs
+    calls at the end of each job and which also runs at exit, so repeated
+    batch runs only parse files that changed. Pass None to keep the cache
+    in memory only.
     
-    # If no perfect factors, find closest approximation
-    if bestRows * bestCols != pagesPerOutput:
-        bestRows = int(sqrtVal)
-        bestCols = math.ceil(pagesPerOutput / bestRows)
+    Args:
+        cachePath: Path of the JSON cache file (None disables persistence)
+    """
+    global _metadataCachePath
     
-    return bestRows, bestCols
+    with _documentInfoLock:
+        if _metadataCachePath is None and cachePath is not None:
+            atexit.register(saveMetadataCache)
+        _metadataCachePath = cachePath
+        if cachePath is None:
+            return
+        
+        for path, entry in _readMetadataCache(cachePath).items():
+            _documentInfoCache.setdefault(path, entry)
 
 
-def _countTotalPages(pdfPaths: List[str], separationPages: int = 0) -> int:
+def _readMetadataCache(cachePath: str) -> Dict[str, Tuple[int, int, DocumentInfo]]:
     """
-    Count total pages across all PDFs including separation pages.
+    Read the entries of a metadata cache file.
     
     Args:
-        pdfPaths: List of PDF file paths
-        separationPages: Number of blank pages between PDFs
+        cachePath: Path of the JSON cache file
         
     Returns:
-        Total page count
+        Absolute path -> (size, mtime_ns, DocumentInfo); empty if the file
+        is missing or unreadable (it is then simply rebuilt)
     """
-    totalPages = 0
-    for pdfPath in pdfPaths:
-        doc = fitz.open(pdfPath)
-        totalPages += len(doc)
-        doc.close()
+    try:
+        with open(cachePath, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    return {
+        path: (
+            entry['size'],
+            entry['mtime'],
+            DocumentInfo(
+                entry['pageCount'],
+                [tuple(size) for size in entry['pageSizes']]
+            )
+        )
+        for path, entry in entries.items()
+    }
+
+
+def saveMetadataCache() -> None:
+    """
+    Write documents parsed since the last save to the metadata cache file.
+    
+    Entries written meanwhile by other processes sharing the file are
+    kept. Does nothing without a cache path (see setMetadataCachePath) or
+    when nothing new was parsed; persistence is best effort.
+    """
+    global _metadataCacheDirty
+    
+    with _documentInfoLock:
+        if _metadataCachePath is None or not _metadataCacheDirty:
+            return
+        
+        cacheEntries = _readMetadataCache(_metadataCachePath)
+        cacheEntries.update(_documentInfoCache)
+        entries = {
+            path: {
+                'size': size,
+                'mtime': mtime,
+                'pageCount': info.pageCount,
+                'pageSizes': info.pageSizes
+            }
+            for path, (size, mtime, info) in cacheEntries.items()
+        }
+        
+        # Write under a private name so concurrent writers never mix files
+        tempPath = f"{_metadataCachePath}.{os.getpid()}.tmp"
+        try:
+            cacheDir = os.path.dirname(os.path.abspath(_metadataCachePath))
+            os.makedirs(cacheDir, exist_ok=True)
+            with open(tempPath, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tempPath, _metadataCachePath)
+        except OSError:
+            return
+        _metadataCacheDirty = False
+
+
+def getDocumentInfo(pdfPath: str, doc: Optional[fitz.Document] = None) -> DocumentInfo:
+    """
+    Get page count and page sizes of a PDF, parsing it at most once.
+    
+    Results are cached by path, file size and modification time and shared
+    by compactPdfs, the layout calculation and the GUI.
+    
+    Args:
+        pdfPath: Path of the PDF file
+        doc: The file already opened, read on a cache miss instead of
+            opening the file again
+        
+    Returns:
+        DocumentInfo for the file
+    """
+    global _metadataCacheDirty
+    
+    path = os.path.abspath(pdfPath)
+    stat = os.stat(path)
+    
+    with _documentInfoLock:
+        cached = _documentInfoCache.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+    
+    ownsDoc = doc is None
+    if ownsDoc:
+        doc = fitz.open(path)
+    try:
+        info = DocumentInfo(
+            pageCount=len(doc),
+            pageSizes=[(page.rect.width, page.rect.height) for page in doc]
+        )
+    finally:
+        if ownsDoc:
+            doc.close()
+    
+    with _documentInfoLock:
+        _documentInfoCache[path] = (stat.st_size, stat.st_mtime_ns, info)
+        _metadataCacheDirty = True
+    
+    return info
+
+
+# Session-wide content digests: absolute path -> (size, mtime_ns, digest)
+_fileDigestCache: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _fileDigest(pdfPath: str) -> str:
+    """
+    Get the content digest of a file, reading it at most once per version.
+    
+    Args:
+        pdfPath: Path of the file
+        
+    Returns:
+        Hex digest of the file's bytes
+    """
+    path = os.path.abspath(pdfPath)
+    stat = os.stat(path)
     
-    # Add separation pages (n-1 separations for n PDFs)
-    if len(pdfPaths) > 1:
-        totalPages += (len(pdfPaths) - 1) * separationPages
+    with _documentInfoLock:
+        cached = _fileDigestCache.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
     
-    return totalPages
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    
+    with _documentInfoLock:
+        _fileDigestCache[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest()
 
 
 def _getLayoutParameters(
     config: CompactionConfig,
-    pdfPaths: List[str]
+    pdfPaths: List[Union[str, PdfInput]],
+    slotSizes: Optional[List[Optional[Tuple[float, float]]]] = None
 ) -> Tuple[int, int]:
     """
     Determine rows and columns based on layout mode.
     
+    In PACKED mode the grid only sets the reference cell size for scaling.
+    
     Args:
         config: Compaction configuration
-        pdfPaths: List of input PDF paths
+        pdfPaths: Input PDF paths (or PdfInputs of paths)
+        slotSizes: Size of every slot (see _slotSizes), if already known
+            (skips reading the page sizes)
         
     Returns:
         Tuple of (rows, columns)
     """
-    if config.layoutMode == LayoutMode.GRID:
+    if config.layoutMode in (LayoutMode.GRID, LayoutMode.PACKED):
         return config.rows, config.columns
     else:  # TARGET_PAGES mode
-        totalPages = _countTotalPages(pdfPaths, config.separationPages)
-        return calculateOptimalGrid(totalPages, config.targetPages)
+        solution = _solveTargetGrid(config, pdfPaths, slotSizes)
+        return solution.rows, solution.columns
 
 
-def mergePdfPages(
-    docs: List[fitz.Document],
-    compression: int,
-    separationPages: int = 0
-) -> List[Optional[fitz.Pixmap]]:
+def _solveTargetGrid(
+    config: CompactionConfig,
+    pdfPaths: List[Union[str, PdfInput]],
+    slotSizes: Optional[List[Optional[Tuple[float, float]]]] = None
+) -> GridSolution:
     """
-    Merge and compress pages from multiple PDF documents.
+    Solve the TARGET_PAGES grid for the real page and output page sizes.
     
     Args:
-        docs: List of opened fitz.Document objects
-        compression: Compression percentage (25-100)
-        separationPages: Number of blank pages to insert between documents
+        config: Compaction configuration
+        pdfPaths: Input PDF paths (or PdfInputs of paths)
+        slotSizes: Size of every slot (see _slotSizes), if already known
         
     Returns:
-        List of fitz.Pixmap objects (or None for blank separation pages)
+        GridSolution from solveGrid
     """
-    allPages = []
-    compression = max(25, min(100, compression))
+    if slotSizes is None:
+        slotSizes = _slotSizes(_inputPageSizes(pdfPaths), config.separationPages)
+    sheetSizes = list(dict.fromkeys(
+        (geometry.width, geometry.height) for geometry in _sheetGeometries(config, 1, 1)
+    ))
+    return solveGrid(slotSizes, config.targetPages, sheetSizes, config.maintainAspectRatio)
+
+
+@dataclass(frozen=True)
+class _SheetGeometry:
+    """
+    Size and grid of an output page.
     
-    for docIdx, doc in enumerate(docs):
-        for pageNum in range(len(doc)):
-            page = doc[pageNum]
-            
-            # Use compression factor for rendering
-            zoom = compression / 100.0
-            matrix = fitz.Matrix(zoom, zoom)
-            pixmap = page.get_pixmap(matrix=matrix, alpha=False)
-            
-            # Convert to RGB if needed (remove alpha channel)
-            if pixmap.alpha:
-                pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
-            
-            allPages.append(pixmap)
-        
-        # Add separation pages between documents
-        if docIdx < len(docs) - 1 and separationPages > 0:
-            for _ in range(separationPages):
-                allPages.append(None)
+    Attributes:
+        width: Page width in points
+        height: Page height in points
+        rows: Number of grid rows
+        columns: Number of grid columns
+    """
+    width: float
+    height: float
+    rows: int
+    columns: int
+    
+    @property
+    def cellWidth(self) -> float:
+        """Width of each grid cell in points."""
+        return self.width / self.columns
     
-    return allPages
+    @property
+    def cellHeight(self) -> float:
+        """Height of each grid cell in points."""
+        return self.height / self.rows
 
 
-def _placePageOnGrid(
-    newPage: fitz.Page,
-    pixmap: fitz.Pixmap,
-    index: int,
-    columns: int,
-    rows: int,
-    cellWidth: float,
-    cellHeight: float,
-    pageOrder: PageOrder,
-    maintainAspectRatio: bool,
-    addPageNumbers: bool
-) -> None:
+def _sheetGeometries(config: CompactionConfig, rows: int, columns: int) -> List[_SheetGeometry]:
     """
-    Place a page pixmap on the grid at the specified position.
+    List the output page geometries allowed by the configuration.
+    
+    AUTO orientation allows both orientations, each with the grid as given
+    and transposed, so every candidate holds the same number of cells.
     
     Args:
-        newPage: The output page to draw on
-        pixmap: The page image to place
-        index: Linear index of the page in the grid
-        columns: Number of columns in the grid
-        rows: Number of rows in the grid
-        cellWidth: Width of each grid cell
-        cellHeight: Height of each grid cell
-        pageOrder: Order for placing pages (HORIZONTAL or VERTICAL)
-        maintainAspectRatio: Whether to maintain aspect ratio
-        addPageNumbers: Whether to add page numbers
+        config: Compaction configuration (pageSize and orientation)
+        rows: Number of grid rows
+        columns: Number of grid columns
+        
+    Returns:
+        Candidate geometries, preferred one first
     """
-    # Calculate grid position based on page order
-    if pageOrder == PageOrder.HORIZONTAL:
-        xOffset = (index % columns) * cellWidth
-        yOffset = (index // columns) * cellHeight
-    else:  # VERTICAL
-        xOffset = (index // rows) * cellWidth
-        yOffset = (index % rows) * cellHeight
+    shortSide, longSide = sorted(config.pageSize)
+    portrait = (shortSide, longSide)
+    landscape = (longSide, shortSide)
     
-    # Calculate image rectangle
-    if maintainAspectRatio:
-        aspect = pixmap.width / pixmap.height
-        cellAspect = cellWidth / cellHeight
-        
-        if aspect > cellAspect:
-            # Width-constrained
-            newWidth = cellWidth
-            newHeight = cellWidth / aspect
-            yOffset += (cellHeight - newHeight) / 2
-        else:
-            # Height-constrained
-            newHeight = cellHeight
-            newWidth = cellHeight * aspect
-            xOffset += (cellWidth - newWidth) / 2
-        
-        imgRect = fitz.Rect(xOffset, yOffset, xOffset + newWidth, yOffset + newHeight)
-    else:
-        # Fill entire cell
-        imgRect = fitz.Rect(xOffset, yOffset, xOffset + cellWidth, yOffset + cellHeight)
+    if config.orientation == Orientation.PORTRAIT:
+        return [_SheetGeometry(*portrait, rows, columns)]
+    if config.orientation == Orientation.LANDSCAPE:
+        return [_SheetGeometry(*landscape, rows, columns)]
     
-    newPage.insert_image(imgRect, pixmap=pixmap)
+    grids = [(rows, columns)] if rows == columns else [(rows, columns), (columns, rows)]
+    return [
+        _SheetGeometry(*size, gridRows, gridColumns)
+        for gridRows, gridColumns in grids
+        for size in (portrait, landscape)
+    ]
+
+
+def _itemSize(item: Union[fitz.Pixmap, fitz.Page, None]) -> Optional[Tuple[float, float]]:
+    """Get the (width, height) of a rendered or source page (None for blanks)."""
+    if item is None:
+        return None
+    if isinstance(item, fitz.Page):
+        return item.rect.width, item.rect.height
+    return item.width, item.height
+
+
+def _usedArea(sizes: List[Optional[Tuple[float, float]]], geometry: _SheetGeometry) -> float:
+    """
+    Get the area covered by pages scaled to fit their cells.
     
-    # Add page number if requested
-    if addPageNumbers:
-        text = str(index + 1)
-        textRect = fitz.Rect(xOffset + 5, yOffset + 5, xOffset + 30, yOffset + 20)
-        newPage.insert_textbox(textRect, text, fontsize=10, color=(1, 0, 0))
+    Args:
+        sizes: (width, height) of each page, or None for separation pages
+        geometry: Output page geometry
+        
+    Returns:
+        Covered area in square points
+    """
+    area = 0.0
+    for size in sizes:
+        if size is None:
+            continue
+        width, height = size
+        scale = min(geometry.cellWidth / width, geometry.cellHeight / height)
+        area += width * height * scale * scale
+    return area
 
 
-def _drawGrid(
-    page: fitz.Page,
-    columns: int,
-    rows: int,
-    cellWidth: float,
-    cellHeight: float,
-    gridColor: Tuple[float, float, float]
-) -> None:
+def _chooseSheetGeometry(
+    geometries: List[_SheetGeometry],
+    sizes: List[Optional[Tuple[float, float]]],
+    maintainAspectRatio: bool
+) -> _SheetGeometry:
     """
-    Draw grid lines on the output page.
+    Pick the geometry under which a sheet's pages cover the most area.
     
     Args:
-        page: The page to draw on
+        geometries: Candidates from _sheetGeometries
+        sizes: (width, height) of each page, or None for separation pages
+        maintainAspectRatio: Whether pages keep their proportions (if not,
+            every candidate is filled completely and the first one is used)
+        
+    Returns:
+        The best geometry (the earliest one on ties)
+    """
+    if len(geometries) == 1 or not maintainAspectRatio:
+        return geometries[0]
+    return max(geometries, key=lambda geometry: _usedArea(sizes, geometry))
+
+
+def _renderCellSize(geometries: List[_SheetGeometry]) -> Tuple[float, float]:
+    """
+    Get a cell size no smaller than any candidate's, for render resolution.
+    
+    Args:
+        geometries: Candidates from _sheetGeometries
+        
+    Returns:
+        (width, height) in points
+    """
+    return (
+        max(geometry.cellWidth for geometry in geometries),
+        max(geometry.cellHeight for geometry in geometries)
+    )
+
+
+@dataclass
+class _PackedSheet:
+    """
+    Planned content of an output page in PACKED mode.
+    
+    Attributes:
+        width: Page width in points
+        height: Page height in points
+        rects: (x0, y0, x1, y1) of each consecutive slot placed on the page,
+            or None for separation pages
+    """
+    width: float
+    height: float
+    rects: List[Optional[Tuple[float, float, float, float]]]
+
+
+class _Skyline:
+    """
+    Skyline of a partly filled page, for bottom-left bin packing.
+    
+    The skyline is a list of [x, y, width] segments covering the page width,
+    y being the lowest free coordinate over that span (pages fill from the
+    top, so "bottom-left" is the top-left corner here).
+    """
+    
+    # Tolerance for floating point comparisons, in points
+    EPSILON = 1e-6
+    
+    def __init__(self, width: float, height: float):
+        """
+        Create an empty skyline.
+        
+        Args:
+            width: Page width in points
+            height: Page height in points
+        """
+        self.width = width
+        self.height = height
+        self.segments = [[0.0, 0.0, width]]
+    
+    def find(self, width: float, height: float) -> Optional[Tuple[int, float, float]]:
+        """
+        Find the highest, then leftmost, position a rectangle fits at.
+        
+        Args:
+            width: Rectangle width
+            height: Rectangle height
+            
+        Returns:
+            (segment index, x, y), or None if the rectangle doesn't fit
+        """
+        best = None
+        for index, (x, _, _) in enumerate(self.segments):
+            if x + width > self.width + self.EPSILON:
+                break
+            
+            # Resting height: the highest segment under the rectangle
+            y = 0.0
+            for segmentX, segmentY, _ in self.segments[index:]:
+                if segmentX >= x + width - self.EPSILON:
+                    break
+                y = max(y, segmentY)
+            
+            if y + height > self.height + self.EPSILON:
+                continue
+            if best is None or y < best[2] - self.EPSILON:
+                best = (index, x, y)
+        return best
+    
+    def place(self, index: int, x: float, y: float, width: float, height: float) -> None:
+        """
+        Raise the skyline under a rectangle placed by find.
+        
+        Args:
+            index: Segment index returned by find
+            x: Left edge returned by find
+            y: Top edge returned by find
+            width: Rectangle width
+            height: Rectangle height
+        """
+        right = x + width
+        segments = self.segments[:index] + [[x, y + height, width]]
+        for segmentX, segmentY, segmentWidth in self.segments[index:]:
+            segmentRight = segmentX + segmentWidth
+            if segmentRight <= right + self.EPSILON:
+                continue  # Fully covered by the new rectangle
+            if segmentX < right:
+                segments.append([right, segmentY, segmentRight - right])
+            else:
+                segments.append([segmentX, segmentY, segmentWidth])
+        
+        # Merge neighbours at the same height
+        merged = [segments[0]]
+        for segment in segments[1:]:
+            if abs(segment[1] - merged[-1][1]) <= self.EPSILON:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        self.segments = merged
+
+
+def _documentPageSizes(doc: fitz.Document, pageNumbers: Sequence[int]) -> List[Tuple[float, float]]:
+    """
+    Get the sizes of the selected pages of an open document.
+    
+    A whole file-backed document goes through the metadata cache; otherwise
+    only the selected pages are loaded.
+    
+    Args:
+        doc: The document
+        pageNumbers: Selected page indices
+        
+    Returns:
+        (width, height) of each selected page in points
+    """
+    if pageNumbers == range(len(doc)) and doc.name and os.path.exists(doc.name):
+        return getDocumentInfo(doc.name, doc).pageSizes
+    return [(rect.width, rect.height) for rect in (doc[pageNum].rect for pageNum in pageNumbers)]
+
+
+def _inputPageSizes(inputs: List[Union[PdfSource, PdfInput]]) -> List[List[Tuple[float, float]]]:
+    """
+    Get the sizes of the selected pages of file inputs, without opening them
+    when the metadata cache knows them.
+    
+    Args:
+        inputs: Input PDF paths, or PdfInputs of paths
+        
+    Returns:
+        (width, height) of each selected page of each input, in points
+    """
+    sizes = []
+    for source in inputs:
+        pdfInput = _asPdfInput(source)
+        pageSizes = getDocumentInfo(pdfInput.source).pageSizes
+        sizes.append([pageSizes[pageNum] for pageNum in pdfInput.pageNumbers(len(pageSizes))])
+    return sizes
+
+
+def _slotSizes(
+    pageSizes: List[List[Tuple[float, float]]],
+    separationPages: int
+) -> List[Optional[Tuple[float, float]]]:
+    """
+    Get the size of every grid slot of a job.
+    
+    Args:
+        pageSizes: Page sizes of each input document
+        separationPages: Number of blank pages to insert between documents
+        
+    Returns:
+        (width, height) of each slot, or None for separation pages
+    """
+    return [
+        None if slot is None else pageSizes[slot[0]][slot[1]]
+        for slot in _sourceSlots([range(len(sizes)) for sizes in pageSizes], separationPages)
+    ]
+
+
+def _packScale(
+    sizes: List[Optional[Tuple[float, float]]],
+    geometry: _SheetGeometry,
+    minScale: float
+) -> float:
+    """
+    Get the common scale of the pages in PACKED mode.
+    
+    It is the largest scale at which every page still fits a grid cell of
+    the reference geometry, so the rows and columns settings keep
+    controlling density, but never less than minScale. Pages larger than
+    the output page don't count (unless all of them are): _packSheet
+    shrinks each of those on its own until it fits, instead of one such
+    page shrinking every other page of the job.
+    
+    Args:
+        sizes: (width, height) of each slot, or None for separation pages
+        geometry: Reference geometry (the preferred one)
+        minScale: Smallest allowed scale
+        
+    Returns:
+        Scale factor applied to every page that fits the output page
+    """
+    pageSizes = [size for size in sizes if size is not None]
+    # 1% slack: page sizes are often rounded to whole points (A4 as 595×842)
+    fitting = [
+        size for size in pageSizes
+        if size[0] <= geometry.width * 1.01 and size[1] <= geometry.height * 1.01
+    ]
+    scale = min(
+        (
+            min(geometry.cellWidth / size[0], geometry.cellHeight / size[1])
+            for size in fitting or pageSizes
+        ),
+        default=1.0
+    )
+    return max(minScale, scale)
+
+
+def _packSheet(
+    sizes: List[Optional[Tuple[float, float]]],
+    start: int,
+    width: float,
+    height: float,
+    scale: float,
+    pageOrder: PageOrder
+) -> List[Optional[Tuple[float, float, float, float]]]:
+    """
+    Pack consecutive slots onto one page until the next one doesn't fit.
+    
+    A run of separation slots ends the page, so the next document starts
+    on a new one.
+    
+    Args:
+        sizes: (width, height) of each slot, or None for separation pages
+        start: Index of the first slot to place
+        width: Page width in points
+        height: Page height in points
+        scale: Common page scale (pages larger than the page are shrunk)
+        pageOrder: HORIZONTAL fills rows first, VERTICAL fills columns first
+        
+    Returns:
+        Rectangle of each slot placed, in slot order (at least one slot)
+    """
+    # Vertical order is horizontal packing on the transposed page
+    vertical = pageOrder == PageOrder.VERTICAL
+    skyline = _Skyline(height, width) if vertical else _Skyline(width, height)
+    
+    rects = []
+    placedAny = False
+    for index in range(start, len(sizes)):
+        size = sizes[index]
+        if size is None:
+            rects.append(None)
+            continue
+        if placedAny and rects[-1] is None:
+            break  # Separation pages were just consumed
+        
+        pageWidth, pageHeight = (size[1], size[0]) if vertical else size
+        pageScale = min(scale, skyline.width / pageWidth, skyline.height / pageHeight)
+        pageWidth *= pageScale
+        pageHeight *= pageScale
+        
+        position = skyline.find(pageWidth, pageHeight)
+        if position is None:
+            break
+        segment, x, y = position
+        skyline.place(segment, x, y, pageWidth, pageHeight)
+        
+        if vertical:
+            rects.append((y, x, y + pageHeight, x + pageWidth))
+        else:
+            rects.append((x, y, x + pageWidth, y + pageHeight))
+        placedAny = True
+    return rects
+
+
+def _packSheets(
+    sizes: List[Optional[Tuple[float, float]]],
+    geometries: List[_SheetGeometry],
+    config: CompactionConfig
+) -> Tuple[List[_PackedSheet], float]:
+    """
+    Plan PACKED output pages: skyline bin packing in stable page order.
+    
+    Pages keep their relative sizes (one common scale, see _packScale)
+    and are placed in order; a page that doesn't fit starts the next output page, so no page
+    is ever moved ahead of an earlier one. With several candidate
+    geometries (AUTO orientation), each output page uses the page size that
+    takes the most slots.
+    
+    Args:
+        sizes: (width, height) of each slot, or None for separation pages
+        geometries: Allowed geometries (see _sheetGeometries)
+        config: Compaction configuration (minScale, pageOrder)
+        
+    Returns:
+        (planned output pages, common page scale)
+    """
+    scale = _packScale(sizes, geometries[0], config.minScale)
+    pageSizes = list(dict.fromkeys((geometry.width, geometry.height) for geometry in geometries))
+    
+    sheets = []
+    start = 0
+    while start < len(sizes):
+        best = None
+        for width, height in pageSizes:
+            rects = _packSheet(sizes, start, width, height, scale, config.pageOrder)
+            if best is None or len(rects) > len(best.rects):
+                best = _PackedSheet(width, height, rects)
+        sheets.append(best)
+        start += len(best.rects)
+    return sheets, scale
+
+
+def mergePdfPages(
+    docs: List[fitz.Document],
+    compression: int,
+    separationPages: int = 0,
+    stream: bool = False,
+    workers: int = 1,
+    targetDpi: Optional[int] = None,
+    cellSize: Optional[Tuple[float, float]] = None,
+    pageScale: Optional[float] = None,
+    pageNumbers: Optional[List[Sequence[int]]] = None,
+    renderCache: Optional["RenderCache"] = None,
+    documentDigests: Optional[List[Optional[str]]] = None,
+    maintainAspectRatio: bool = True
+) -> Union[List[Optional[fitz.Pixmap]], Iterator[Optional[fitz.Pixmap]]]:
+    """
+    Merge and compress pages from multiple PDF documents.
+    
+    Args:
+        docs: List of opened fitz.Document objects
+        compression: Compression percentage (25-100)
+        separationPages: Number of blank pages to insert between documents
+        stream: If True, return a generator that renders pages lazily instead
+            of a list, so only the pages currently being consumed are in memory
+        workers: Number of processes used for rendering. Each worker opens
+            its own copy of the documents, so this requires documents opened
+            from a file; in-memory documents are rendered in-process.
+        targetDpi: Render each page at this resolution relative to cellSize
+            instead of at the uniform compression zoom
+        cellSize: (width, height) in points of the cell each page is drawn
+            into; required for targetDpi unless pageScale is given
+        pageScale: Scale every page is drawn at, used with targetDpi
+            instead of cellSize
+        pageNumbers: Indices of the pages to render from each document, in
+            order (None renders every page); other pages are never loaded
+        renderCache: If given, pages are loaded from this cache when they
+            were already rendered at the same zoom, and stored in it
+            otherwise; its hit and miss counters include worker processes
+        documentDigests: Content digest of each document for the cache
+            (None computes it for file-backed documents; documents with a
+            None digest bypass the cache)
+        maintainAspectRatio: Whether pages keep their aspect ratio in their
+            cell, which sets the cell scale targetDpi applies to
+        
+    Returns:
+        List (or generator when stream=True) of fitz.Pixmap objects
+        (or None for blank separation pages), in document order
+    """
+    settings = _RenderSettings(
+        max(25, min(100, compression)), targetDpi, cellSize, pageScale, maintainAspectRatio
+    )
+    if pageNumbers is None:
+        pageNumbers = [range(len(doc)) for doc in docs]
+    if renderCache is None:
+        documentDigests = None
+    elif documentDigests is None:
+        documentDigests = [_fileDigest(doc.name) if doc.name else None for doc in docs]
+    if workers > 1 and all(doc.name for doc in docs):
+        pages = _iterPdfPagesParallel(
+            docs, settings, separationPages, workers, pageNumbers,
+            renderCache, documentDigests
+        )
+    else:
+        pages = _iterPdfPages(
+            docs, settings, separationPages, pageNumbers, renderCache, documentDigests
+        )
+    return pages if stream else list(pages)
+
+
+@dataclass(frozen=True)
+class _RenderSettings:
+    """
+    How pages are rasterized (picklable, so it can be sent to workers).
+    
+    Attributes:
+        compression: Compression percentage (25-100), used as a uniform zoom
+        targetDpi: If set, zoom is chosen per page to reach this resolution
+            in a cell of cellSize points
+        cellSize: (width, height) of the destination cell in points
+        pageScale: If set, the scale pages are drawn at on the output page,
+            used with targetDpi instead of cellSize (PACKED mode)
+        maintainAspectRatio: Whether pages keep their aspect ratio in their
+            cell (drawn at the smaller of the two cell scales) or are
+            stretched to fill it
+    """
+    compression: int = 100
+    targetDpi: Optional[int] = None
+    cellSize: Optional[Tuple[float, float]] = None
+    pageScale: Optional[float] = None
+    maintainAspectRatio: bool = True
+    
+    def zoom(self, page: fitz.Page) -> float:
+        """
+        Get the render zoom for a page.
+        
+        Args:
+            page: The page to render
+            
+        Returns:
+            Zoom factor (1.0 = 72 dpi)
+        """
+        if self.targetDpi is not None and self.pageScale is not None:
+            return self.pageScale * self.targetDpi / 72.0
+        if self.targetDpi is None or self.cellSize is None:
+            return self.compression / 100.0
+        
+        # Scale the page is drawn at in its cell: the smaller cell scale when
+        # it keeps its aspect ratio, else the larger one, so that neither
+        # side of a stretched page ends up below the target resolution
+        cellWidth, cellHeight = self.cellSize
+        scales = (cellWidth / page.rect.width, cellHeight / page.rect.height)
+        scale = min(scales) if self.maintainAspectRatio else max(scales)
+        return scale * self.targetDpi / 72.0
+
+
+def _renderPage(page: fitz.Page, settings: _RenderSettings) -> fitz.Pixmap:
+    """
+    Render a single page to an RGB pixmap.
+    
+    Args:
+        page: The page to render
+        settings: Render settings giving the zoom
+        
+    Returns:
+        fitz.Pixmap without alpha channel
+    """
+    zoom = settings.zoom(page)
+    pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    
+    # Convert to RGB if needed (remove alpha channel)
+    if pixmap.alpha:
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+    
+    return pixmap
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered pages, shared by runs and processes.
+    
+    Pages are stored as PNG files named after the document's content
+    digest, the page index and the render zoom, so a page is only
+    rasterized once per zoom however many layouts it is compacted into.
+    Hits refresh the file's modification time, and once the directory
+    grows past maxBytes the least recently used pages are evicted.
+    
+    Attributes:
+        cacheDir: Directory holding the cached pages
+        maxBytes: Size limit of the directory
+        hits: Pages loaded from the cache by this instance
+        misses: Pages not found in the cache by this instance
+        bytesWritten: Bytes of pages stored by this instance
+    """
+    
+    # After eviction the cache is brought down to this fraction of
+    # maxBytes, so the directory isn't rescanned on every write
+    EVICT_RATIO = 0.9
+    
+    def __init__(self, cacheDir: str, maxBytes: int = 1 << 30, totalBytes: Optional[int] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            cacheDir: Directory holding the cached pages (created if needed)
+            maxBytes: Size limit of the directory
+            totalBytes: Estimated size of the directory, if known; it is
+                scanned on the first write otherwise
+        """
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.bytesWritten = 0
+        self._totalBytes = totalBytes
+        os.makedirs(cacheDir, exist_ok=True)
+    
+    def forWorker(self) -> "RenderCache":
+        """
+        Create an instance to send to a worker process.
+        
+        It shares this cache's size estimate, so workers only rescan the
+        directory when their writes take it past maxBytes, and starts with
+        fresh counters, to be added back with record().
+        
+        Returns:
+            A RenderCache on the same directory
+        """
+        if self._totalBytes is None:
+            self._totalBytes = sum(size for _, size, _ in self._entries())
+        return RenderCache(self.cacheDir, self.maxBytes, self._totalBytes)
+    
+    def record(self, hits: int, misses: int, bytesWritten: int) -> None:
+        """
+        Add the counters of a worker's instance (see forWorker) to this one.
+        
+        Workers started from the same estimate don't see each other's
+        writes, so the cache is evicted here too once they add up past
+        maxBytes.
+        
+        Args:
+            hits: Pages the worker loaded from the cache
+            misses: Pages the worker did not find in the cache
+            bytesWritten: Bytes of pages the worker stored
+        """
+        self.hits += hits
+        self.misses += misses
+        self.bytesWritten += bytesWritten
+        if self._totalBytes is not None:
+            self._totalBytes += bytesWritten
+            if self._totalBytes > self.maxBytes:
+                self._evict()
+    
+    @staticmethod
+    def key(documentDigest: str, pageNum: int, zoom: float) -> str:
+        """
+        Build the cache key of a rendered page.
+        
+        Args:
+            documentDigest: Content digest of the source document
+            pageNum: Zero-based page index
+            zoom: Render zoom factor
+            
+        Returns:
+            Key usable as a file name
+        """
+        return hashlib.blake2b(
+            f"{documentDigest}:{pageNum}:{zoom!r}".encode(), digest_size=20
+        ).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """Get the file path of a cache entry."""
+        return os.path.join(self.cacheDir, key + ".png")
+    
+    def get(self, key: str) -> Optional[fitz.Pixmap]:
+        """
+        Load a rendered page.
+        
+        Args:
+            key: Cache key (see key())
+            
+        Returns:
+            The cached pixmap, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pixmap = fitz.Pixmap(f.read())
+            os.utime(path)  # Mark as recently used
+        except Exception:
+            # Missing, evicted by another process or unreadable
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return pixmap
+    
+    def put(self, key: str, pixmap: fitz.Pixmap) -> None:
+        """
+        Store a rendered page, evicting old pages if the cache is full.
+        
+        Args:
+            key: Cache key (see key())
+            pixmap: The rendered page
+        """
+        data = pixmap.tobytes("png")
+        path = self._path(key)
+        
+        # Write under a private name so readers never see a partial file
+        tempPath = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tempPath, "wb") as f:
+                f.write(data)
+            os.replace(tempPath, path)
+        except OSError:
+            return  # Caching is best effort
+        
+        self.bytesWritten += len(data)
+        if self._totalBytes is None:
+            self._totalBytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._totalBytes += len(data)
+        if self._totalBytes > self.maxBytes:
+            self._evict()
+    
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        List the cached pages.
+        
+        Returns:
+            (mtime, size, path) of each cached page
+        """
+        entries = []
+        for entry in os.scandir(self.cacheDir):
+            if not entry.name.endswith(".png"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def _evict(self) -> None:
+        """Remove least recently used pages until the cache fits again."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        limit = self.maxBytes * self.EVICT_RATIO
+        
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._totalBytes = total
+
+
+def _renderCachedPage(
+    page: fitz.Page,
+    settings: _RenderSettings,
+    renderCache: Optional[RenderCache],
+    documentDigest: Optional[str]
+) -> fitz.Pixmap:
+    """
+    Render a page, going through the render cache when one is given.
+    
+    Args:
+        page: The page to render
+        settings: Render settings giving the zoom
+        renderCache: Render cache, or None
+        documentDigest: Content digest of the page's document (None
+            bypasses the cache)
+        
+    Returns:
+        fitz.Pixmap without alpha channel
+    """
+    if renderCache is None or documentDigest is None:
+        return _renderPage(page, settings)
+    
+    key = renderCache.key(documentDigest, page.number, settings.zoom(page))
+    pixmap = renderCache.get(key)
+    if pixmap is None:
+        pixmap = _renderPage(page, settings)
+        renderCache.put(key, pixmap)
+    return pixmap
+
+
+def _iterSourcePages(
+    docs: List[fitz.Document],
+    separationPages: int,
+    pageNumbers: Optional[List[Sequence[int]]] = None
+) -> Iterator[Optional[fitz.Page]]:
+    """
+    Iterate over source pages in order, yielding None for separation pages.
+    
+    Args:
+        docs: List of opened fitz.Document objects
+        separationPages: Number of blank pages to insert between documents
+        pageNumbers: Selected page indices of each document (None for all)
+        
+    Yields:
+        fitz.Page for each page, or None for blank separation pages
+    """
+    if pageNumbers is None:
+        pageNumbers = [range(len(doc)) for doc in docs]
+    for slot in _sourceSlots(pageNumbers, separationPages):
+        yield None if slot is None else docs[slot[0]][slot[1]]
+
+
+def _sourceSlots(
+    pageNumbers: List[Sequence[int]],
+    separationPages: int
+) -> Iterator[Optional[Tuple[int, int]]]:
+    """
+    Iterate over the grid slots of a job without loading any page.
+    
+    Args:
+        pageNumbers: Selected page indices of each input document
+        separationPages: Number of blank pages to insert between documents
+        
+    Yields:
+        (document index, page number) for each page, or None for blank
+        separation pages
+    """
+    for docIdx, selected in enumerate(pageNumbers):
+        for pageNum in selected:
+            yield docIdx, pageNum
+        
+        # Add separation pages between documents
+        if docIdx < len(pageNumbers) - 1 and separationPages > 0:
+            for _ in range(separationPages):
+                yield None
+
+
+def _iterPdfPages(
+    docs: List[fitz.Document],
+    settings: _RenderSettings,
+    separationPages: int,
+    pageNumbers: List[Sequence[int]],
+    renderCache: Optional[RenderCache] = None,
+    documentDigests: Optional[List[Optional[str]]] = None
+) -> Iterator[Optional[fitz.Pixmap]]:
+    """
+    Render pages one by one, yielding None for separation pages.
+    
+    Args:
+        docs: List of opened fitz.Document objects
+        settings: Render settings
+        separationPages: Number of blank pages to insert between documents
+        pageNumbers: Selected page indices of each document
+        renderCache: Render cache, or None
+        documentDigests: Content digest of each document (None bypasses
+            the cache)
+        
+    Yields:
+        fitz.Pixmap for each page, or None for blank separation pages
+    """
+    for slot in _sourceSlots(pageNumbers, separationPages):
+        if slot is None:
+            yield None
+            continue
+        docIdx, pageNum = slot
+        yield _renderCachedPage(
+            docs[docIdx][pageNum],
+            settings,
+            renderCache,
+            documentDigests[docIdx] if documentDigests else None
+        )
+
+
+# Pages rendered per worker task in parallel mode
+RENDER_CHUNK_PAGES = 8
+
+
+def _renderPageRange(
+    pdfPath: str,
+    pageNumbers: Sequence[int],
+    settings: _RenderSettings,
+    renderCache: Optional[RenderCache] = None,
+    documentDigest: Optional[str] = None
+) -> Tuple[List[Tuple[int, int, int, int, bytes]], int, int, int]:
+    """
+    Render a run of pages in a worker process.
+    
+    Args:
+        pdfPath: Path of the PDF to open in this process
+        pageNumbers: Indices of the pages to render, in order
+        settings: Render settings
+        renderCache: Render cache from RenderCache.forWorker (this process
+            counts its own hits)
+        documentDigest: Content digest of the PDF for the cache
+        
+    Returns:
+        Tuple of (pages, cacheHits, cacheMisses, cacheBytesWritten), where
+        pages is a list of (width, height, xres, yres, samples) tuples, one
+        per page
+    """
+    doc = fitz.open(pdfPath)
+    try:
+        rendered = []
+        for pageNum in pageNumbers:
+            pixmap = _renderCachedPage(doc[pageNum], settings, renderCache, documentDigest)
+            rendered.append(
+                (pixmap.width, pixmap.height, pixmap.xres, pixmap.yres, pixmap.samples)
+            )
+        if renderCache is None:
+            return rendered, 0, 0, 0
+        return rendered, renderCache.hits, renderCache.misses, renderCache.bytesWritten
+    finally:
+        doc.close()
+
+
+def _iterPdfPagesParallel(
+    docs: List[fitz.Document],
+    settings: _RenderSettings,
+    separationPages: int,
+    workers: int,
+    pageNumbers: List[Sequence[int]],
+    renderCache: Optional[RenderCache] = None,
+    documentDigests: Optional[List[Optional[str]]] = None
+) -> Iterator[Optional[fitz.Pixmap]]:
+    """
+    Render pages in a process pool, yielding them in document order.
+    
+    Only a bounded number of chunks are in flight at any time, so memory
+    stays proportional to the worker count rather than the document size.
+    
+    Args:
+        docs: List of opened fitz.Document objects (must be file-backed)
+        settings: Render settings
+        separationPages: Number of blank pages to insert between documents
+        workers: Number of worker processes
+        pageNumbers: Selected page indices of each document
+        renderCache: Render cache shared with the workers (see
+            RenderCache.forWorker), receiving their counters, or None
+        documentDigests: Content digest of each document (None bypasses
+            the cache)
+        
+    Yields:
+        fitz.Pixmap for each page, or None for blank separation pages
+    """
+    maxPending = workers * 2
+    pending = deque()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for docIdx, doc in enumerate(docs):
+                selected = pageNumbers[docIdx]
+                for start in range(0, len(selected), RENDER_CHUNK_PAGES):
+                    pending.append(executor.submit(
+                        _renderPageRange,
+                        doc.name,
+                        selected[start:start + RENDER_CHUNK_PAGES],
+                        settings,
+                        renderCache.forWorker() if renderCache is not None else None,
+                        documentDigests[docIdx] if documentDigests else None
+                    ))
+                    while len(pending) >= maxPending:
+                        yield from _collectRenderedChunk(pending.popleft(), renderCache)
+                
+                # Separation pages are queued as already-completed chunks so
+                # they keep their position in the output order
+                if docIdx < len(docs) - 1 and separationPages > 0:
+                    blanks = Future()
+                    blanks.set_result(([None] * separationPages, 0, 0, 0))
+                    pending.append(blanks)
+            
+            while pending:
+                yield from _collectRenderedChunk(pending.popleft(), renderCache)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _collectRenderedChunk(
+    future: Future,
+    renderCache: Optional[RenderCache] = None
+) -> Iterator[Optional[fitz.Pixmap]]:
+    """
+    Rebuild pixmaps from a worker's raw sample buffers.
+    
+    Args:
+        future: Future holding the result of _renderPageRange
+        renderCache: Render cache to add the worker's counters to
+        
+    Yields:
+        fitz.Pixmap for each rendered page, or None for separation pages
+    """
+    rendered, hits, misses, bytesWritten = future.result()
+    if renderCache is not None:
+        renderCache.record(hits, misses, bytesWritten)
+    
+    for item in rendered:
+        if item is None:
+            yield None
+            continue
+        width, height, xres, yres, samples = item
+        pixmap = fitz.Pixmap(fitz.csRGB, width, height, samples, False)
+        pixmap.set_dpi(xres, yres)
+        yield pixmap
+
+
+def _timedIter(
+    items: Iterable,
+    phaseSeconds: Dict[str, float],
+    phase: str
+) -> Iterator:
+    """
+    Iterate while adding the time spent producing each item to a phase.
+    
+    Args:
+        items: Iterable to consume (closed when this generator is closed)
+        phaseSeconds: Phase timings to update
+        phase: Phase name to add time to
+        
+    Yields:
+        The items of the iterable
+    """
+    iterator = iter(items)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                phaseSeconds[phase] += time.perf_counter() - start
+            yield item
+            item = None
+    finally:
+        if hasattr(iterator, 'close'):
+            iterator.close()
+
+
+def _iterPageGroups(
+    pages: Iterable[Optional[fitz.Pixmap]],
+    pagesPerOutput: int
+) -> Iterator[List[Optional[fitz.Pixmap]]]:
+    """
+    Split a page stream into consecutive groups, one per output page.
+    
+    Args:
+        pages: Iterable of page pixmaps (None for separation pages)
+        pagesPerOutput: Number of pages placed on each output page
+        
+    Yields:
+        Lists of at most pagesPerOutput pixmaps
+    """
+    pages = iter(pages)
+    while True:
+        pageGroup = list(islice(pages, pagesPerOutput))
+        if not pageGroup:
+            return
+        yield pageGroup
+        # Don't hold this group while the next one is rendered
+        pageGroup = None
+
+
+def _composeSheet(
+    outputDoc: fitz.Document,
+    pageGroup: List[Union[fitz.Pixmap, fitz.Page, None]],
+    geometries: List[_SheetGeometry],
+    config: CompactionConfig,
+    imageCache: Optional[Dict[bytes, int]],
+    phaseSeconds: Dict[str, float]
+) -> int:
+    """
+    Append one output page and place a group of pages on it.
+    
+    Args:
+        outputDoc: Document the new page is appended to
+        pageGroup: Pixmaps or source pages (None for separation pages)
+        geometries: Allowed output page geometries (see _sheetGeometries)
+        config: Compaction configuration
+        imageCache: Digest -> xref map used for deduplication, or None
+        phaseSeconds: Phase timings to add "place" and "grid" time to
+        
+    Returns:
+        Number of pages placed (separation pages excluded)
+    """
+    geometry = _chooseSheetGeometry(
+        geometries,
+        [_itemSize(item) for item in pageGroup],
+        config.maintainAspectRatio
+    )
+    rows, columns = geometry.rows, geometry.columns
+    cellWidth, cellHeight = geometry.cellWidth, geometry.cellHeight
+    
+    # Create new output page
+    newPage = outputDoc.new_page(width=geometry.width, height=geometry.height)
+    
+    # Place each page in the group
+    placed = 0
+    phaseStart = time.perf_counter()
+    for idx, pixmap in enumerate(pageGroup):
+        if pixmap is not None:  # Skip separation pages
+            _placePageOnGrid(
+                newPage,
+                pixmap,
+                idx,
+                columns,
+                rows,
+                cellWidth,
+                cellHeight,
+                config.pageOrder,
+                config.maintainAspectRatio,
+                config.addPageNumbers,
+                config.jpegQuality,
+                imageCache
+            )
+            placed += 1
+    phaseSeconds["place"] += time.perf_counter() - phaseStart
+    
+    # Draw grid if requested
+    if config.showGrid:
+        phaseStart = time.perf_counter()
+        _drawGrid(newPage, columns, rows, cellWidth, cellHeight, config.gridColor)
+        phaseSeconds["grid"] += time.perf_counter() - phaseStart
+    
+    return placed
+
+
+def _composePackedSheet(
+    outputDoc: fitz.Document,
+    pageGroup: List[Union[fitz.Pixmap, fitz.Page, None]],
+    sheet: _PackedSheet,
+    config: CompactionConfig,
+    imageCache: Optional[Dict[bytes, int]],
+    phaseSeconds: Dict[str, float]
+) -> int:
+    """
+    Append one PACKED output page and draw its pages where planned.
+    
+    Args:
+        outputDoc: Document the new page is appended to
+        pageGroup: Pixmaps or source pages (None for separation pages)
+        sheet: Plan of the output page from _packSheets
+        config: Compaction configuration
+        imageCache: Digest -> xref map used for deduplication, or None
+        phaseSeconds: Phase timings to add "place" and "grid" time to
+        
+    Returns:
+        Number of pages placed (separation pages excluded)
+    """
+    newPage = outputDoc.new_page(width=sheet.width, height=sheet.height)
+    
+    placed = 0
+    phaseStart = time.perf_counter()
+    for idx, (pixmap, rect) in enumerate(zip(pageGroup, sheet.rects)):
+        if pixmap is not None:
+            _drawPage(
+                newPage,
+                pixmap,
+                fitz.Rect(rect),
+                str(idx + 1) if config.addPageNumbers else None,
+                config.jpegQuality,
+                imageCache
+            )
+            placed += 1
+    phaseSeconds["place"] += time.perf_counter() - phaseStart
+    
+    # Outline each page instead of drawing grid lines
+    if config.showGrid:
+        phaseStart = time.perf_counter()
+        for rect in sheet.rects:
+            if rect is not None:
+                newPage.draw_rect(fitz.Rect(rect), color=config.gridColor)
+        phaseSeconds["grid"] += time.perf_counter() - phaseStart
+    
+    return placed
+
+
+# Output pages composed per worker task in parallel composition mode
+COMPOSE_CHUNK_SHEETS = 4
+
+
+def _composeSheetRange(
+    pdfPaths: List[str],
+    pageNumbers: List[Sequence[int]],
+    firstSheet: int,
+    sheetCount: int,
+    rows: int,
+    columns: int,
+    config: CompactionConfig,
+    documentDigests: Optional[List[Optional[str]]] = None,
+    renderCache: Optional[RenderCache] = None,
+    plan: Optional[List[_PackedSheet]] = None,
+    firstSlot: int = 0,
+    packScale: Optional[float] = None
+) -> Tuple[bytes, int, List[bytes], int, int, int]:
+    """
+    Render and compose a range of output pages in a worker process.
+    
+    Args:
+        pdfPaths: Paths of the input PDFs to open in this process
+        pageNumbers: Selected page indices of each input PDF
+        firstSheet: Index of the first output page of the range
+        sheetCount: Number of output pages in the range
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        config: Compaction configuration
+        documentDigests: Content digest of each input PDF, used with
+            renderCache
+        renderCache: Render cache from RenderCache.forWorker, or None
+        plan: PACKED mode: the planned output pages of the range (see
+            _packSheets), whose slots start at slot firstSlot
+        firstSlot: Index of the first slot of the range (PACKED mode)
+        packScale: Common page scale of the plan (PACKED mode)
+        
+    Returns:
+        (pdfBytes, placedPages, imageDigests, cacheHits, cacheMisses,
+        cacheBytesWritten) for the partial document, where imageDigests
+        are the digests of the distinct images (or source pages, in VECTOR
+        mode) embedded when config.deduplicate is set
+    """
+    docs = [fitz.open(path) for path in pdfPaths]
+    partDoc = fitz.open()
+    try:
+        pagesPerOutput = rows * columns
+        if plan is None:
+            slots = islice(
+                _sourceSlots(pageNumbers, config.separationPages),
+                firstSheet * pagesPerOutput,
+                (firstSheet + sheetCount) * pagesPerOutput
+            )
+        else:
+            slots = islice(
+                _sourceSlots(pageNumbers, config.separationPages),
+                firstSlot,
+                firstSlot + sum(len(sheet.rects) for sheet in plan)
+            )
+        
+        geometries = _sheetGeometries(config, rows, columns)
+        imageCache = {} if config.deduplicate else None
+        canonicalPages = {}
+        if config.renderMode == RenderMode.VECTOR:
+            pages = (None if slot is None else docs[slot[0]][slot[1]] for slot in slots)
+            if config.deduplicate:
+                pages = _dedupSourcePages(pages, canonicalPages)
+        else:
+            settings = _RenderSettings(
+                config.compression,
+                config.targetDpi,
+                _renderCellSize(geometries),
+                packScale,
+                config.maintainAspectRatio
+            )
+            pages = (
+                None if slot is None else _renderCachedPage(
+                    docs[slot[0]][slot[1]],
+                    settings,
+                    renderCache,
+                    documentDigests[slot[0]] if documentDigests else None
+                )
+                for slot in slots
+            )
+        
+        placed = 0
+        phaseSeconds = dict.fromkeys(COMPACTION_PHASES, 0.0)
+        if plan is None:
+            for pageGroup in _iterPageGroups(pages, pagesPerOutput):
+                placed += _composeSheet(
+                    partDoc, pageGroup, geometries, config, imageCache, phaseSeconds
+                )
+        else:
+            for sheet, pageGroup in _iterPlannedGroups(pages, plan):
+                placed += _composePackedSheet(
+                    partDoc, pageGroup, sheet, config, imageCache, phaseSeconds
+                )
+        
+        if not config.deduplicate:
+            imageDigests = []
+        elif config.renderMode == RenderMode.VECTOR:
+            imageDigests = list(canonicalPages)
+        else:
+            imageDigests = list(imageCache)
+        
+        if renderCache is None:
+            return partDoc.tobytes(deflate=True), placed, imageDigests, 0, 0, 0
+        return (
+            partDoc.tobytes(deflate=True),
+            placed,
+            imageDigests,
+            renderCache.hits,
+            renderCache.misses,
+            renderCache.bytesWritten
+        )
+    finally:
+        partDoc.close()
+        for doc in docs:
+            doc.close()
+
+
+def _iterComposedParts(
+    pdfPaths: List[str],
+    pageNumbers: List[Sequence[int]],
+    totalSheets: int,
+    rows: int,
+    columns: int,
+    config: CompactionConfig,
+    documentDigests: Optional[List[Optional[str]]] = None,
+    renderCache: Optional[RenderCache] = None,
+    plan: Optional[List[_PackedSheet]] = None,
+    packScale: Optional[float] = None
+) -> Iterator[Tuple[bytes, int, List[bytes], int, int, int]]:
+    """
+    Compose ranges of output pages in a process pool, yielding them in order.
+    
+    Like _iterPdfPagesParallel, only a bounded number of ranges are in
+    flight at any time.
+    
+    Args:
+        pdfPaths: Paths of the input PDFs
+        pageNumbers: Selected page indices of each input PDF
+        totalSheets: Total number of output pages
+        rows: Number of rows in the grid
+        columns: Number of columns in the grid
+        config: Compaction configuration (composeWorkers gives the pool size)
+        documentDigests: Content digest of each input PDF for the render
+            cache, or None
+        renderCache: Render cache shared with the workers (see
+            RenderCache.forWorker), or None
+        plan: PACKED mode: every planned output page (see _packSheets)
+        packScale: Common page scale of the plan (PACKED mode)
+        
+    Yields:
+        (pdfBytes, placedPages, imageDigests, cacheHits, cacheMisses,
+        cacheBytesWritten) for each range, in page order (see
+        _composeSheetRange)
+    """
+    maxPending = config.composeWorkers * 2
+    pending = deque()
+    
+    with ProcessPoolExecutor(max_workers=config.composeWorkers) as executor:
+        try:
+            firstSlot = 0
+            for firstSheet in range(0, totalSheets, COMPOSE_CHUNK_SHEETS):
+                sheetCount = min(COMPOSE_CHUNK_SHEETS, totalSheets - firstSheet)
+                sheets = None if plan is None else plan[firstSheet:firstSheet + sheetCount]
+                pending.append(executor.submit(
+                    _composeSheetRange,
+                    pdfPaths,
+                    pageNumbers,
+                    firstSheet,
+                    sheetCount,
+                    rows,
+                    columns,
+                    config,
+                    documentDigests,
+                    renderCache.forWorker() if renderCache is not None else None,
+                    sheets,
+                    firstSlot,
+                    packScale
+                ))
+                if sheets is not None:
+                    firstSlot += sum(len(sheet.rects) for sheet in sheets)
+                while len(pending) >= maxPending:
+                    yield pending.popleft().result()
+            
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _flushOutput(
+    outputDoc: fitz.Document,
+    outputPath: str,
+    flushed: bool
+) -> fitz.Document:
+    """
+    Write the pages composed so far to the output file.
+    
+    The first flush saves the whole document; later flushes only append the
+    changes with an incremental save. The document is reopened from disk
+    after every flush, because MuPDF rewrites the previous incremental
+    section of a document it saved itself: reopening makes each flush a
+    pure append, so the bytes written so far stay final.
+    
+    Args:
+        outputDoc: The output document
+        outputPath: Path of the output file
+        flushed: Whether the document was already flushed once
+        
+    Returns:
+        The document to keep composing into, reopened from the output file
+    """
+    if flushed:
+        _saveIncremental(outputDoc)
+    else:
+        outputDoc.save(outputPath, deflate=True)
+    outputDoc.close()
+    return fitz.open(outputPath)
+
+
+def _saveIncremental(outputDoc: fitz.Document) -> None:
+    """
+    Append the changes to a document to its file, compressing new streams.
+    
+    saveIncr() writes new streams (the inserted cell images) uncompressed,
+    so the incremental save asks for deflate explicitly.
+    
+    Args:
+        outputDoc: Document opened from the output file
+    """
+    outputDoc.save(
+        outputDoc.name,
+        incremental=True,
+        deflate=True,
+        encryption=fitz.PDF_ENCRYPT_KEEP
+    )
+
+
+def _iterPlannedGroups(
+    pages: Iterable[Optional[fitz.Pixmap]],
+    plan: List[_PackedSheet]
+) -> Iterator[Tuple[_PackedSheet, List[Optional[fitz.Pixmap]]]]:
+    """
+    Split a page stream into the groups planned by _packSheets.
+    
+    Args:
+        pages: Iterable of page pixmaps (None for separation pages)
+        plan: Planned output pages
+        
+    Yields:
+        (planned output page, its pixmaps) pairs
+    """
+    pages = iter(pages)
+    for sheet in plan:
+        yield sheet, list(islice(pages, len(sheet.rects)))
+
+
+def _placePageOnGrid(
+    newPage: fitz.Page,
+    pixmap: Union[fitz.Pixmap, fitz.Page],
+    index: int,
+    columns: int,
+    rows: int,
+    cellWidth: float,
+    cellHeight: float,
+    pageOrder: PageOrder,
+    maintainAspectRatio: bool,
+    addPageNumbers: bool,
+    jpegQuality: Optional[int] = None,
+    imageCache: Optional[Dict[bytes, int]] = None
+) -> None:
+    """
+    Place a page on the grid at the specified position.
+    
+    Args:
+        newPage: The output page to draw on
+        pixmap: The page image to place, or the source page itself to
+            embed it as vector content (RenderMode.VECTOR)
+        index: Linear index of the page in the grid
+        columns: Number of columns in the grid
+        rows: Number of rows in the grid
+        cellWidth: Width of each grid cell
+        cellHeight: Height of each grid cell
+        pageOrder: Order for placing pages (HORIZONTAL or VERTICAL)
+        maintainAspectRatio: Whether to maintain aspect ratio
+        addPageNumbers: Whether to add page numbers
+        jpegQuality: If set, store the pixmap as a JPEG of this quality
+        imageCache: If given, maps pixmap digests to image xrefs already in
+            the output document; identical pixmaps reuse that image
+    """
+    # Calculate grid position based on page order
+    if pageOrder == PageOrder.HORIZONTAL:
+        xOffset = (index % columns) * cellWidth
+        yOffset = (index // columns) * cellHeight
+    else:  # VERTICAL
+        xOffset = (index // rows) * cellWidth
+        yOffset = (index % rows) * cellHeight
+    
+    isVector = isinstance(pixmap, fitz.Page)
+    
+    # Calculate image rectangle
+    if maintainAspectRatio:
+        if isVector:
+            aspect = pixmap.rect.width / pixmap.rect.height
+        else:
+            aspect = pixmap.width / pixmap.height
+        cellAspect = cellWidth / cellHeight
+        
+        if aspect > cellAspect:
+            # Width-constrained
+            newWidth = cellWidth
+            newHeight = cellWidth / aspect
+            yOffset += (cellHeight - newHeight) / 2
+        else:
+            # Height-constrained
+            newHeight = cellHeight
+            newWidth = cellHeight * aspect
+            xOffset += (cellWidth - newWidth) / 2
+        
+        imgRect = fitz.Rect(xOffset, yOffset, xOffset + newWidth, yOffset + newHeight)
+    else:
+        # Fill entire cell
+        imgRect = fitz.Rect(xOffset, yOffset, xOffset + cellWidth, yOffset + cellHeight)
+    
+    _drawPage(
+        newPage,
+        pixmap,
+        imgRect,
+        str(index + 1) if addPageNumbers else None,
+        jpegQuality,
+        imageCache
+    )
+
+
+def _drawPage(
+    newPage: fitz.Page,
+    pixmap: Union[fitz.Pixmap, fitz.Page],
+    imgRect: fitz.Rect,
+    label: Optional[str],
+    jpegQuality: Optional[int],
+    imageCache: Optional[Dict[bytes, int]]
+) -> None:
+    """
+    Draw a page image (or vector page) into a rectangle.
+    
+    Args:
+        newPage: The output page to draw on
+        pixmap: The page image, or the source page itself (VECTOR mode)
+        imgRect: Where to draw the page
+        label: Page number drawn in the top-left corner, if any
+        jpegQuality: If set, store the pixmap as a JPEG of this quality
+        imageCache: Digest -> xref map used for deduplication, or None
+    """
+    if isinstance(pixmap, fitz.Page):
+        # The rectangle already has the right proportions, so the source
+        # page is stretched to it exactly like the raster path
+        newPage.show_pdf_page(
+            imgRect, pixmap.parent, pixmap.number, keep_proportion=False
+        )
+    else:
+        _insertPixmap(newPage, imgRect, pixmap, jpegQuality, imageCache)
+    
+    # Add page number if requested
+    if label is not None:
+        textRect = fitz.Rect(imgRect.x0 + 5, imgRect.y0 + 5, imgRect.x0 + 30, imgRect.y0 + 20)
+        newPage.insert_textbox(textRect, label, fontsize=10, color=(1, 0, 0))
+
+
+def _insertPixmap(
+    newPage: fitz.Page,
+    imgRect: fitz.Rect,
+    pixmap: fitz.Pixmap,
+    jpegQuality: Optional[int],
+    imageCache: Optional[Dict[bytes, int]]
+) -> None:
+    """
+    Insert a pixmap, reusing an identical image already in the document.
+    
+    Args:
+        newPage: The output page to draw on
+        imgRect: Where to draw the image
+        pixmap: The page image
+        jpegQuality: If set, store the image as a JPEG of this quality
+        imageCache: Digest -> xref map of images already embedded (None
+            disables deduplication)
+    """
+    key = None
+    if imageCache is not None:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{pixmap.width}x{pixmap.height}:{jpegQuality}".encode())
+        digest.update(pixmap.samples_mv)
+        key = digest.digest()
+        
+        xref = imageCache.get(key)
+        if xref:
+            newPage.insert_image(imgRect, xref=xref)
+            return
+    
+    if jpegQuality is not None:
+        xref = newPage.insert_image(
+            imgRect, stream=pixmap.tobytes("jpeg", jpg_quality=jpegQuality)
+        )
+    else:
+        xref = newPage.insert_image(imgRect, pixmap=pixmap)
+    
+    if key is not None:
+        imageCache[key] = xref
+
+
+_OBJECT_REFERENCE_PATTERN = re.compile(rb"(\d+) (\d+) R")
+
+
+def _objectDigest(doc: fitz.Document, xref: int, objectDigests: Dict[int, bytes]) -> bytes:
+    """
+    Digest a PDF object and everything it references, recursively.
+    
+    References are replaced by the digest of their target, so two objects
+    digest the same exactly when their object graphs hold the same bytes,
+    whatever their xref numbers. Streams (content of Form XObjects, image
+    samples, embedded font programs) are digested raw.
+    
+    Args:
+        doc: Document holding the object
+        xref: Xref number of the object
+        objectDigests: Xref -> digest of objects of doc already digested
+        
+    Returns:
+        Digest bytes of the object graph rooted at xref
+    """
+    if xref in objectDigests:
+        return objectDigests[xref]
+    # A reference cycle digests as its xref, which only ever makes two
+    # pages compare different
+    objectDigests[xref] = b"cycle %d" % xref
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(_resolveReferences(doc, doc.xref_object(xref, compressed=True).encode(), objectDigests))
+    if doc.xref_is_stream(xref):
+        digest.update(doc.xref_stream_raw(xref) or b"")
+    objectDigests[xref] = digest.digest()
+    return objectDigests[xref]
+
+
+def _resolveReferences(doc: fitz.Document, source: bytes, objectDigests: Dict[int, bytes]) -> bytes:
+    """
+    Replace each indirect reference in an object's source by its digest.
+    
+    Args:
+        doc: Document holding the object
+        source: PDF source of the object
+        objectDigests: Xref -> digest of objects of doc already digested
+        
+    Returns:
+        The source with references replaced by hex digests
+    """
+    return _OBJECT_REFERENCE_PATTERN.sub(
+        lambda match: _objectDigest(doc, int(match.group(1)), objectDigests).hex().encode(),
+        source
+    )
+
+
+def _pageResources(doc: fitz.Document, xref: int) -> bytes:
+    """
+    Source of a page's /Resources, following inheritance from the page tree.
+    
+    Args:
+        doc: Document holding the page
+        xref: Xref number of the page object
+        
+    Returns:
+        The /Resources value as PDF source, empty if the page has none
+    """
+    while True:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != "null":
+            return value.encode()
+        kind, parent = doc.xref_get_key(xref, "Parent")
+        if kind != "xref":
+            return b""
+        xref = int(parent.split()[0])
+
+
+def _pageContentDigest(page: fitz.Page, objectDigests: Dict[int, bytes]) -> bytes:
+    """
+    Digest everything a page draws: geometry, content and resources.
+    
+    Resources are digested recursively, so pages whose content only invokes
+    a Form XObject (as show_pdf_page and n-up tools write them) compare by
+    the form's content, and fonts compare by their embedded programs.
+    
+    Args:
+        page: The source page
+        objectDigests: Xref -> digest of objects of the page's document
+            already digested, shared between pages of one document
+        
+    Returns:
+        Digest bytes identical for pages that draw the same thing
+    """
+    doc = page.parent
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{page.rect.width:.2f}x{page.rect.height:.2f}r{page.rotation}".encode())
+    digest.update(page.read_contents())
+    digest.update(_resolveReferences(doc, _pageResources(doc, page.xref), objectDigests))
+    return digest.digest()
+
+
+def _dedupSourcePages(
+    pages: Iterable[Optional[fitz.Page]],
+    canonicalPages: Dict[bytes, fitz.Page]
+) -> Iterator[Optional[fitz.Page]]:
+    """
+    Replace each page by the first page seen with the same content.
+    
+    show_pdf_page reuses the XObject of a source page it has already shown,
+    so mapping duplicates to one canonical page embeds its content once.
+    
+    Args:
+        pages: Source pages (None for separation pages)
+        canonicalPages: Digest -> first page with that content, filled in
+        
+    Yields:
+        Canonical page for each input page, or None for separation pages
+    """
+    # Object digests are per document, since xref numbers are; the document
+    # is kept with them so its id cannot be reused while they are
+    objectDigests = {}
+    for page in pages:
+        if page is None:
+            yield None
+        else:
+            _, documentDigests = objectDigests.setdefault(id(page.parent), (page.parent, {}))
+            yield canonicalPages.setdefault(_pageContentDigest(page, documentDigests), page)
+
+
+def _drawGrid(
+    page: fitz.Page,
+    columns: int,
+    rows: int,
+    cellWidth: float,
+    cellHeight: float,
+    gridColor: Tuple[float, float, float]
+) -> None:
+    """
+    Draw grid lines across the whole output page.
+    
+    Args:
+        page: The page to draw on
         columns: Number of columns
         rows: Number of rows
         cellWidth: Width of each cell
         cellHeight: Height of each cell
         gridColor: RGB color tuple (0-1 range)
     """
-    # Draw vertical lines
-    for x in range(1, columns):
-        page.draw_line(
-            fitz.Point(x * cellWidth, 0),
-            fitz.Point(x * cellWidth, A4_HEIGHT),
-            color=gridColor
-        )
+    # Draw vertical lines
+    for x in range(1, columns):
+        page.draw_line(
+            fitz.Point(x * cellWidth, 0),
+            fitz.Point(x * cellWidth, page.rect.height),
+            color=gridColor
+        )
+    
+    # Draw horizontal lines
+    for y in range(1, rows):
+        page.draw_line(
+            fitz.Point(0, y * cellHeight),
+            fitz.Point(page.rect.width, y * cellHeight),
+            color=gridColor
+        )
+
+
+def _isPath(source: PdfSource) -> bool:
+    """Check whether an input is a file path rather than in-memory data."""
+    return isinstance(source, (str, os.PathLike))
+
+
+def _openInput(source: PdfSource) -> Tuple[fitz.Document, int]:
+    """
+    Open an input PDF from a path, an in-memory buffer or a stream.
+    
+    Buffers are handed to fitz without copying where it accepts them.
+    
+    Args:
+        source: Input PDF (see PdfSource)
+        
+    Returns:
+        Tuple of (opened document, input size in bytes)
+        
+    Raises:
+        TypeError: If the input type is not supported
+    """
+    if _isPath(source):
+        return fitz.open(source), os.path.getsize(source)
+    
+    # mmap also has read(), so buffers are checked before streams
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        data = source
+    elif isinstance(source, io.BytesIO):
+        data = source.getbuffer()
+    elif hasattr(source, 'read'):
+        data = source.read()
+    else:
+        raise TypeError(f"Unsupported PDF input: {type(source).__name__}")
+    
+    size = memoryview(data).nbytes
+    try:
+        return fitz.open(stream=data, filetype="pdf"), size
+    except TypeError:
+        # Older PyMuPDF versions only take bytes
+        return fitz.open(stream=bytes(data), filetype="pdf"), size
+
+
+def _digestSource(source: PdfSource) -> Tuple[PdfSource, str]:
+    """
+    Compute the content digest of an input for the render cache.
+    
+    Streams other than io.BytesIO can only be read once, so they are read
+    here and returned as bytes to be opened instead.
+    
+    Args:
+        source: Input PDF (see PdfSource)
+        
+    Returns:
+        Tuple of (source to open, hex content digest)
+        
+    Raises:
+        TypeError: If the input type is not supported
+    """
+    if _isPath(source):
+        return source, _fileDigest(source)
+    
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        data = source
+    elif isinstance(source, io.BytesIO):
+        data = source.getbuffer()
+    elif hasattr(source, 'read'):
+        source = data = source.read()
+    else:
+        raise TypeError(f"Unsupported PDF input: {type(source).__name__}")
+    
+    return source, hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def resolveOutputPath(
+    inputPdfPaths: List[Union[PdfSource, PdfInput]],
+    config: CompactionConfig
+) -> str:
+    """
+    Get the path compactPdfs writes its output to.
+    
+    Args:
+        inputPdfPaths: List of inputs; the default output folder is next to
+            the first input given as a path (or in the working directory)
+        config: Compaction configuration
+        
+    Returns:
+        Output PDF path (its directory may not exist yet)
+    """
+    if config.outputDir:
+        outputDir = config.outputDir
+    else:
+        sources = [_asPdfInput(source).source for source in inputPdfPaths]
+        firstPath = next((path for path in sources if _isPath(path)), "")
+        outputDir = os.path.join(os.path.dirname(firstPath), "VicOutput")
     
-    # Draw horizontal lines
-    for y in range(1, rows):
-        page.draw_line(
-            fitz.Point(0, y * cellHeight),
-            fitz.Point(A4_WIDTH, y * cellHeight),
-            color=gridColor
-        )
+    if config.outputFilename:
+        filename = config.outputFilename
+        if not filename.endswith('.pdf'):
+            filename += '.pdf'
+    else:
+        filename = "vicOutput.pdf"
+    
+    return os.path.join(outputDir, filename)
 
 
 def compactPdfs(
-    inputPdfPaths: Union[str, List[str]],
-    config: Optional[CompactionConfig] = None
-) -> str:
+    inputPdfPaths: Union[PdfSource, PdfInput, List[Union[PdfSource, PdfInput]]],
+    config: Optional[CompactionConfig] = None,
+    progressCallback: Optional[Callable[[CompactionProgress], None]] = None,
+    cancelEvent: Optional[threading.Event] = None,
+    returnResult: bool = False,
+    hooks: Optional[CompactionHooks] = None,
+    output: Optional[BinaryIO] = None
+) -> Union[str, BinaryIO, CompactionResult]:
     """
-    Compact multiple PDF pages onto single A4 pages in a grid layout.
+    Compact multiple PDF pages onto output pages (A4 by default) in a grid layout.
     
     This is the main function for programmatic PDF compaction. It takes one or
     more input PDFs and creates a single output PDF with pages arranged in a grid.
     
     Args:
-        inputPdfPaths: Single PDF path or list of PDF paths to compact
+        inputPdfPaths: Single PDF or list of PDFs to compact. Each one can be
+            a path, bytes, bytearray, memoryview, mmap or a readable binary
+            stream (see PdfSource), or a PdfInput selecting some of its
+            pages. Unselected pages are never loaded, rendered or counted
         config: CompactionConfig object (uses defaults if None)
+        progressCallback: Called with a CompactionProgress after each
+            output page is composed (after each composed range of pages
+            when config.composeWorkers > 1)
+        cancelEvent: threading.Event checked between output pages; when it
+            is set, the job stops, every open document is closed and
+            CompactionCancelled is raised without writing the output file
+        returnResult: If True, return a CompactionResult instead of the path
+        hooks: CompactionHooks receiving per-sheet progress, phase timings
+            and the final result
+        output: Writable binary stream (e.g. io.BytesIO) to write the PDF to
+            instead of a file; outputDir and outputFilename are then ignored
         
     Returns:
-        Path to the created output PDF file
+        Path to the created output PDF file, the output stream when one was
+        given, or a CompactionResult if returnResult is True
         
     Raises:
-        FileNotFoundError: If any input PDF doesn't exist
-        ValueError: If inputPdfPaths is empty
+        FileNotFoundError: If any input PDF path doesn't exist
+        TypeError: If an input is of an unsupported type
+        ValueError: If inputPdfPaths is empty or a page selector is malformed
+        CompactionCancelled: If cancelEvent was set before completion
         
     Example:
         >>> from vicutils.pdf import compactPdfs, CompactionConfig, LayoutMode
@@ -351,1293 +2644,634 @@ def compactPdfs(
         ...     showGrid=True
         ... )
         >>> output = compactPdfs(["file1.pdf", "file2.pdf"], config)
+        >>> 
+        >>> # First three pages and the last page of each invoice
+        >>> output = compactPdfs([PdfInput(path, "1-3,-1") for path in invoices])
     """
-    # Handle single path input
-    if isinstance(inputPdfPaths, str):
+    # Handle single input
+    if not isinstance(inputPdfPaths, (list, tuple)):
         inputPdfPaths = [inputPdfPaths]
     
     if not inputPdfPaths:
         raise ValueError("No input PDF paths provided")
     
+    inputs = [_asPdfInput(source) for source in inputPdfPaths]
+    
     # Validate all input files exist
-    for path in inputPdfPaths:
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"PDF not found: {path}")
+    for pdfInput in inputs:
+        if _isPath(pdfInput.source) and not os.path.exists(pdfInput.source):
+            raise FileNotFoundError(f"PDF not found: {pdfInput.source}")
     
     # Use default config if none provided
     if config is None:
         config = CompactionConfig()
     
-    # Determine layout parameters
-    rows, columns = _getLayoutParameters(config, inputPdfPaths)
-    cellWidth = A4_WIDTH / columns
-    cellHeight = A4_HEIGHT / rows
+    wallStart = time.perf_counter()
+    phaseSeconds = dict.fromkeys(COMPACTION_PHASES, 0.0)
     
-    # Determine output path
-    if config.outputDir:
-        outputDir = config.outputDir
-    else:
-        outputDir = os.path.join(os.path.dirname(inputPdfPaths[0]), "VicOutput")
-    os.makedirs(outputDir, exist_ok=True)
+    # Determine output path (unless writing to a caller-supplied stream)
+    outputPath = None
+    if output is None:
+        outputPath = resolveOutputPath(inputPdfPaths, config)
+        os.makedirs(os.path.dirname(outputPath), exist_ok=True)
     
-    if config.outputFilename:
-        filename = config.outputFilename
-        if not filename.endswith('.pdf'):
-            filename += '.pdf'
-    else:
-        filename = "vicOutput.pdf"
+    # Open all input PDFs
+    docs = []
+    pageNumbers = []
+    pages = None
+    outputDoc = None
+    bytesIn = 0
+    bytesOut = 0
+    peakPixmapBytes = 0
+    uniqueImages = 0
+    partImageDigests = set()
+    flushed = False
+    completed = False
     
-    outputPath = os.path.join(outputDir, filename)
+    # Rendered pages are shared across runs through the render cache
+    renderCache = None
+    documentDigests = None
+    if config.renderCacheDir and config.renderMode == RenderMode.RASTER:
+        renderCache = RenderCache(config.renderCacheDir, config.renderCacheBytes)
+        documentDigests = []
     
-    # Open all input PDFs
-    docs = [fitz.open(path) for path in inputPdfPaths]
+    # Deduplication state: pixmap digest -> image xref (raster) or
+    # content digest -> canonical source page (vector)
+    imageCache = {} if config.deduplicate else None
+    canonicalPages = {}
     
     try:
-        # Merge and compress all pages
-        allPages = mergePdfPages(docs, config.compression, config.separationPages)
+        phaseStart = time.perf_counter()
+        for pdfInput in inputs:
+            source = pdfInput.source
+            if documentDigests is not None:
+                source, digest = _digestSource(source)
+                documentDigests.append(digest)
+            doc, size = _openInput(source)
+            docs.append(doc)
+            bytesIn += size
+            if _metadataCachePath is not None and _isPath(source):
+                # Record every file input in the persistent cache, whatever
+                # the layout mode needs from it
+                getDocumentInfo(source, doc)
+        phaseSeconds["open"] += time.perf_counter() - phaseStart
+        
+        # Determine layout parameters from the opened documents, counting
+        # only the selected pages
+        phaseStart = time.perf_counter()
+        pageNumbers = [pdfInput.pageNumbers(len(doc)) for pdfInput, doc in zip(inputs, docs)]
+        documentPages = [len(selected) for selected in pageNumbers]
+        totalPages = sum(documentPages)
+        if totalPages == 0:
+            selections = ", ".join(
+                f"{doc.name or f'input {index + 1}'} ({len(doc)} pages, pages={pdfInput.pages!r})"
+                for index, (pdfInput, doc) in enumerate(zip(inputs, docs))
+            )
+            raise ValueError(f"No pages selected from the inputs: {selections}")
+        totalSlots = totalPages + max(0, len(docs) - 1) * config.separationPages
+        slotSizes = None
+        if config.layoutMode != LayoutMode.GRID:
+            slotSizes = _slotSizes(
+                [_documentPageSizes(doc, selected) for doc, selected in zip(docs, pageNumbers)],
+                config.separationPages
+            )
+        rows, columns = _getLayoutParameters(config, inputs, slotSizes)
+        geometries = _sheetGeometries(config, rows, columns)
+        cellWidth, cellHeight = _renderCellSize(geometries)
+        
+        # PACKED mode plans every output page up front from the page sizes
+        plan = None
+        packScale = None
+        if config.layoutMode == LayoutMode.PACKED:
+            plan, packScale = _packSheets(slotSizes, geometries, config)
+        phaseSeconds["count"] += time.perf_counter() - phaseStart
+        
+        pagesPerOutput = rows * columns
+        totalSheets = math.ceil(totalSlots / pagesPerOutput) if plan is None else len(plan)
+        composeInWorkers = (
+            config.composeWorkers > 1
+            and all(_isPath(pdfInput.source) for pdfInput in inputs)
+        )
+        
+        if composeInWorkers:
+            # Workers render and compose whole ranges of output pages, so
+            # "render" is the time spent waiting for a composed range
+            pages = _iterComposedParts(
+                [doc.name for doc in docs],
+                pageNumbers,
+                totalSheets,
+                rows,
+                columns,
+                config,
+                documentDigests,
+                renderCache,
+                plan,
+                packScale
+            )
+        elif config.renderMode == RenderMode.VECTOR:
+            pages = _iterSourcePages(docs, config.separationPages, pageNumbers)
+            if config.deduplicate:
+                pages = _dedupSourcePages(pages, canonicalPages)
+        else:
+            # Render pages lazily so only one output page worth of pixmaps
+            # is held in memory at a time
+            pages = mergePdfPages(
+                docs,
+                config.compression,
+                config.separationPages,
+                stream=True,
+                workers=config.workers,
+                targetDpi=config.targetDpi,
+                cellSize=(cellWidth, cellHeight),
+                pageScale=packScale,
+                pageNumbers=pageNumbers,
+                renderCache=renderCache,
+                documentDigests=documentDigests,
+                maintainAspectRatio=config.maintainAspectRatio
+            )
+        pages = _timedIter(pages, phaseSeconds, "render")
         
         # Create output document
         outputDoc = fitz.open()
-        pagesPerOutput = rows * columns
         
-        # Process pages in groups
-        for i in range(0, len(allPages), pagesPerOutput):
-            # Create new A4 page
-            newPage = outputDoc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
-            pageGroup = allPages[i:i + pagesPerOutput]
+        # Progress counters
+        progress = CompactionProgress(
+            pagesRendered=0,
+            totalPages=totalPages,
+            sheetsWritten=0,
+            totalSheets=totalSheets
+        )
+        
+        # Incremental saves need a file to append to
+        flushEvery = config.flushEverySheets if output is None else 0
+        sheetsSinceFlush = 0
+        
+        # Process pages in groups (or composed ranges from the workers)
+        if composeInWorkers:
+            items = pages
+        elif plan is not None:
+            items = _iterPlannedGroups(pages, plan)
+        else:
+            items = _iterPageGroups(pages, pagesPerOutput)
+        for item in items:
+            if cancelEvent is not None and cancelEvent.is_set():
+                raise CompactionCancelled("Compaction cancelled")
             
-            # Place each page in the group
-            for idx, pixmap in enumerate(pageGroup):
-                if pixmap is not None:  # Skip separation pages
-                    _placePageOnGrid(
-                        newPage,
-                        pixmap,
-                        idx,
-                        columns,
-                        rows,
-                        cellWidth,
-                        cellHeight,
-                        config.pageOrder,
-                        config.maintainAspectRatio,
-                        config.addPageNumbers
+            if composeInWorkers:
+                pdfBytes, placed, partDigests, partHits, partMisses, partBytes = item
+                phaseStart = time.perf_counter()
+                partDoc = fitz.open("pdf", pdfBytes)
+                try:
+                    sheets = len(partDoc)
+                    outputDoc.insert_pdf(partDoc)
+                finally:
+                    partDoc.close()
+                phaseSeconds["place"] += time.perf_counter() - phaseStart
+                # Ranges deduplicate on their own: count each digest once
+                # across the job
+                partImageDigests.update(partDigests)
+                if renderCache is not None:
+                    renderCache.record(partHits, partMisses, partBytes)
+            else:
+                sheet = None
+                if plan is not None:
+                    sheet, item = item
+                
+                peakPixmapBytes = max(peakPixmapBytes, sum(
+                    len(pixmap.samples_mv)
+                    for pixmap in item
+                    if isinstance(pixmap, fitz.Pixmap)
+                ))
+                if sheet is None:
+                    placed = _composeSheet(
+                        outputDoc, item, geometries, config, imageCache, phaseSeconds
                     )
+                else:
+                    placed = _composePackedSheet(
+                        outputDoc, item, sheet, config, imageCache, phaseSeconds
+                    )
+                sheets = 1
+            
+            # Release the group's pixmaps before the next one is rendered
+            del item
+            
+            progress.pagesRendered += placed
+            progress.sheetsWritten += sheets
+            sheetsSinceFlush += sheets
+            
+            if flushEvery and sheetsSinceFlush >= flushEvery:
+                phaseStart = time.perf_counter()
+                if not flushed and imageCache:
+                    # Reopening the file invalidates the cached image xrefs
+                    uniqueImages += len(imageCache)
+                    imageCache.clear()
+                outputDoc = _flushOutput(outputDoc, outputPath, flushed)
+                flushed = True
+                sheetsSinceFlush = 0
+                progress.sheetsFlushed = progress.sheetsWritten
+                progress.bytesFlushed = os.path.getsize(outputPath)
+                phaseSeconds["save"] += time.perf_counter() - phaseStart
             
-            # Draw grid if requested
-            if config.showGrid:
-                _drawGrid(newPage, columns, rows, cellWidth, cellHeight, config.gridColor)
+            if progressCallback is not None:
+                progressCallback(replace(progress))
+            if hooks is not None:
+                hooks.onSheet(replace(progress))
+        
+        if cancelEvent is not None and cancelEvent.is_set():
+            raise CompactionCancelled("Compaction cancelled")
         
         # Save with compression
-        outputDoc.save(
-            outputPath,
-            garbage=4,  # Maximum garbage collection
-            deflate=True,  # Compress content streams
-            clean=True  # Clean and optimize
-        )
-        outputDoc.close()
+        phaseStart = time.perf_counter()
+        if flushed:
+            # Only append what was composed since the last flush
+            if sheetsSinceFlush:
+                _saveIncremental(outputDoc)
+            bytesOut = os.path.getsize(outputPath)
+        else:
+            startOffset = _streamOffset(output)
+            outputDoc.save(
+                output if output is not None else outputPath,
+                garbage=4,  # Maximum garbage collection
+                deflate=True,  # Compress content streams
+                clean=True  # Clean and optimize
+            )
+            if output is None:
+                bytesOut = os.path.getsize(outputPath)
+            elif startOffset is not None:
+                bytesOut = _streamOffset(output) - startOffset
+        phaseSeconds["save"] += time.perf_counter() - phaseStart
+        completed = True
         
     finally:
+        # Stop any pending render work (shuts down worker processes)
+        if pages is not None:
+            pages.close()
+        
+        if outputDoc is not None:
+            outputDoc.close()
+        
+        # Don't leave a partially flushed output behind
+        if flushed and not completed and os.path.exists(outputPath):
+            os.remove(outputPath)
+        
         # Clean up input documents
         for doc in docs:
             doc.close()
+        
+        # Persist the documents parsed by this job
+        saveMetadataCache()
     
-    return outputPath
-
-# Language translations
-TRANSLATIONS = {
-    'en': {
-        'title': "PDF Compactor",
-        'input_files': "📁 Input Files",
-        'add_pdfs': "➕ Add PDFs",
-        'remove': "🗑️ Remove",
-        'move_up': "↑ Move Up",
-        'move_down': "↓ Move Down",
-        'clear_all': "🗑️ Clear All",
-        'layout_params': "⚙️ Layout Parameters",
-        'layout_mode': "Layout Mode:",
-        'grid_mode': "Grid (Rows × Columns)",
-        'target_pages_mode': "Target Pages",
-        'rows': "Rows (p):",
-        'columns': "Columns (n):",
-        'target_pages': "Target Pages:",
-        'compression': "Compression (%):",
-        'separation': "Separation (pages):",
-        'advanced_options': "🔧 Advanced Options",
-        'page_order': "Page Order:",
-        'horizontal': "Horizontal",
-        'vertical': "Vertical",
-        'quality_preset': "Quality Preset:",
-        'low': "Low",
-        'medium': "Medium",
-        'high': "High",
-        'maximum': "Maximum",
-        'grid': "Grid:",
-        'show': "Show",
-        'hide': "Hide",
-        'choose_color': "Choose Color",
-        'maintain_aspect': "Maintain aspect ratio",
-        'add_page_numbers': "Add page numbers",
-        'output_options': "💾 Output Options",
-        'folder': "Folder:",
-        'filename': "Filename:",
-        'browse': "📂 Browse",
-        'preview': "👁️ Preview",
-        'create_pdf': "✅ Create PDF",
-        'ready': "Ready",
-        'confirm': "Confirm",
-        'clear_all_confirm': "Clear all files?",
-        'error': "Error",
-        'success': "Success",
-        'no_files_error': "Please add at least one PDF file",
-        'preview_failed': "Failed to generate preview",
-        'pdf_failed': "Failed to create PDF",
-        'pdf_created': "PDF created successfully!",
-        'saved_to': "Saved to:",
-        'added_files': "Added {0} file(s)",
-        'removed_files': "Removed selected files",
-        'cleared_files': "Cleared all files",
-        'preview_generating': "Generating preview...",
-        'preview_success': "Preview generated successfully",
-        'creating_pdf': "Creating PDF...",
-        'pdf_saved': "PDF saved: {0}",
-        'default_folder': "Default: VicOutput in source folder",
-        'default_filename': "Default: vicOutput.pdf",
-        'preview_title': "PDF Preview",
-        'language': "Language:",
-        'calculated_grid': "Calculated grid: {0}×{1}"
-    },
-    'fr': {
-        'title': "Compacteur PDF",
-        'input_files': "📁 Fichiers d'entrée",
-        'add_pdfs': "➕ Ajouter PDFs",
-        'remove': "🗑️ Supprimer",
-        'move_up': "↑ Monter",
-        'move_down': "↓ Descendre",
-        'clear_all': "🗑️ Tout effacer",
-        'layout_params': "⚙️ Paramètres de mise en page",
-        'layout_mode': "Mode de mise en page:",
-        'grid_mode': "Grille (Rangées × Colonnes)",
-        'target_pages_mode': "Pages cibles",
-        'rows': "Rangées (p):",
-        'columns': "Colonnes (n):",
-        'target_pages': "Pages cibles:",
-        'compression': "Compression (%):",
-        'separation': "Séparation (pages):",
-        'advanced_options': "🔧 Options avancées",
-        'page_order': "Ordre des pages:",
-        'horizontal': "Horizontal",
-        'vertical': "Vertical",
-        'quality_preset': "Préréglage qualité:",
-        'low': "Basse",
-        'medium': "Moyenne",
-        'high': "Haute",
-        'maximum': "Maximum",
-        'grid': "Grille:",
-        'show': "Afficher",
-        'hide': "Masquer",
-        'choose_color': "Choisir couleur",
-        'maintain_aspect': "Maintenir le ratio d'aspect",
-        'add_page_numbers': "Ajouter numéros de page",
-        'output_options': "💾 Options de sortie",
-        'folder': "Dossier:",
-        'filename': "Nom du fichier:",
-        'browse': "📂 Parcourir",
-        'preview': "👁️ Aperçu",
-        'create_pdf': "✅ Créer PDF",
-        'ready': "Prêt",
-        'confirm': "Confirmer",
-        'clear_all_confirm': "Effacer tous les fichiers?",
-        'error': "Erreur",
-        'success': "Succès",
-        'no_files_error': "Veuillez ajouter au moins un fichier PDF",
-        'preview_failed': "Échec de génération de l'aperçu",
-        'pdf_failed': "Échec de création du PDF",
-        'pdf_created': "PDF créé avec succès!",
-        'saved_to': "Enregistré dans:",
-        'added_files': "{0} fichier(s) ajouté(s)",
-        'removed_files': "Fichiers sélectionnés supprimés",
-        'cleared_files': "Tous les fichiers effacés",
-        'preview_generating': "Génération de l'aperçu...",
-        'preview_success': "Aperçu généré avec succès",
-        'creating_pdf': "Création du PDF...",
-        'pdf_saved': "PDF enregistré: {0}",
-        'default_folder': "Par défaut: VicOutput dans le dossier source",
-        'default_filename': "Par défaut: vicOutput.pdf",
-        'preview_title': "Aperçu PDF",
-        'language': "Langue:",
-        'calculated_grid': "Grille calculée: {0}×{1}"
-    }
-}
+    target = output if output is not None else outputPath
+    if not returnResult and hooks is None:
+        return target
+    
+    if not config.deduplicate:
+        uniqueImages = progress.pagesRendered
+    elif composeInWorkers:
+        uniqueImages = len(partImageDigests)
+    elif config.renderMode == RenderMode.VECTOR:
+        uniqueImages = len(canonicalPages)
+    else:
+        uniqueImages += len(imageCache)
+    
+    result = CompactionResult(
+        outputPath=outputPath,
+        placedImages=progress.pagesRendered,
+        uniqueImages=uniqueImages,
+        wallSeconds=time.perf_counter() - wallStart,
+        phaseSeconds=phaseSeconds,
+        bytesIn=bytesIn,
+        bytesOut=bytesOut,
+        peakPixmapBytes=peakPixmapBytes,
+        documentPages=documentPages,
+        outputPages=progress.sheetsWritten,
+        renderCacheHits=renderCache.hits if renderCache is not None else 0,
+        renderCacheMisses=renderCache.misses if renderCache is not None else 0
+    )
+    
+    if hooks is not None:
+        for phase, seconds in phaseSeconds.items():
+            hooks.onPhase(phase, seconds)
+        hooks.onResult(result)
+    
+    return result if returnResult else target
 
 
-class PdfCompactorApp:
-    """Main application class for PDF Compactor GUI."""
+def _streamOffset(stream: Optional[BinaryIO]) -> Optional[int]:
+    """
+    Get the current position of an output stream, if it has one.
     
-    def __init__(self, root):
-        """
-        Initialize the PDF Compactor application.
-        
-        Args:
-            root: tkinter root window
-        """
-        self.root = root
-        self.currentLanguage = 'en'
-        self._setupWindow()
-        self._setupVariables()
-        self._setupUi()
-        
-    def _setupWindow(self):
-        """Configure window based on platform."""
-        # Set window size
-        windowWidth = 700
-        windowHeight = 700
-        
-        # Center window on screen
-        screenWidth = self.root.winfo_screenwidth()
-        screenHeight = self.root.winfo_screenheight()
-        x = (screenWidth - windowWidth) // 2
-        y = (screenHeight - windowHeight) // 2
-        
-        self.root.geometry(f"{windowWidth}x{windowHeight}+{x}+{y}")
-        self.root.configure(bg="#2C3E50")
-        
-        # Allow window resizing
-        self.root.minsize(650, 650)
-        
-        # Platform-specific font configurations
-        system = platform.system()
-        if system == "Darwin":  # macOS
-            try:
-                self.root.option_add("*Font", ("SF Pro", 12))
-            except:
-                self.root.option_add("*Font", ("Helvetica", 12))
-        elif system == "Windows":
-            try:
-                self.root.option_add("*Font", ("Segoe UI", 10))
-            except:
-                self.root.option_add("*Font", ("Arial", 10))
-        else:  # Linux
-            try:
-                self.root.option_add("*Font", ("Ubuntu", 10))
-            except:
-                self.root.option_add("*Font", ("Sans", 10))
+    Args:
+        stream: Output stream (or None)
         
-        self.root.title(self._translate('title'))
-            
-    def _setupVariables(self):
-        """Initialize all tkinter variables."""
-        self.gridOption = StringVar(value=self._translate('show'))
-        self.gridColor = StringVar(value="#000000")
-        self.outputFolder = StringVar()
-        self.pdfName = StringVar()
-        self.pageOrder = StringVar(value=self._translate('horizontal'))
-        self.maintainAspect = BooleanVar(value=True)
-        self.addPageNumbers = BooleanVar(value=False)
-        self.quality = StringVar(value=self._translate('high'))
-        self.languageVar = StringVar(value='en')
-        self.layoutMode = StringVar(value='grid')
-        
-        # Numeric values
-        self.rows = IntVar(value=1)
-        self.cols = IntVar(value=1)
-        self.separation = IntVar(value=0)
-        self.targetPages = IntVar(value=1)
-        
-    def _translate(self, key):
+    Returns:
+        Stream position, or None if the stream is None or not seekable
+    """
+    if stream is None:
+        return None
+    try:
+        return stream.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+class _JobGate:
+    """
+    Resizable first-come, first-served limit on concurrent async jobs.
+    
+    A slot is requested as a concurrent Future that completes once the job
+    may run, so waiting jobs hold no thread and can be cancelled. Lowering
+    the limit lets running jobs finish but grants no new slot until fewer
+    than the new limit run.
+    """
+    
+    def __init__(self, limit: int):
         """
-        Translate key to current language.
+        Create a gate.
         
         Args:
-            key: Translation key
-            
-        Returns:
-            Translated string
+            limit: Number of jobs allowed to run at once
         """
-        return TRANSLATIONS.get(self.currentLanguage, TRANSLATIONS['en']).get(key, key)
-        
-    def _changeLanguage(self, event=None):
-        """Change application language and rebuild UI."""
-        self.currentLanguage = self.languageVar.get()
-        savedFiles = list(self.listboxFiles.get(0, tk.END))
-        
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        self._setupUi()
-        
-        for file in savedFiles:
-            self.listboxFiles.insert(tk.END, file)
-        
-        self.root.title(self._translate('title'))
-        
-    def _setupUi(self):
-        """Create the complete user interface."""
-        # Main container with scrollbar
-        mainContainer = tk.Frame(self.root, bg="#2C3E50")
-        mainContainer.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Canvas and scrollbar
-        canvas = tk.Canvas(mainContainer, bg="#2C3E50", highlightthickness=0)
-        scrollbar = tk.Scrollbar(mainContainer, orient="vertical", command=canvas.yview)
-        scrollableFrame = tk.Frame(canvas, bg="#2C3E50")
-        
-        scrollableFrame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvasWindow = canvas.create_window((0, 0), window=scrollableFrame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Center content
-        def centerContent(event):
-            canvas.itemconfig(canvasWindow, width=event.width)
-        canvas.bind('<Configure>', centerContent)
-        
-        # Mouse wheel scrolling
-        def onMousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", onMousewheel)
-        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Build UI sections
-        self._createHeader(scrollableFrame)
-        self._createFilesSection(scrollableFrame)
-        self._createBasicParamsSection(scrollableFrame)
-        self._createAdvancedOptionsSection(scrollableFrame)
-        self._createOutputSection(scrollableFrame)
-        self._createActionButtons(scrollableFrame)
-        self._createStatusBar()
-        
-    def _createHeader(self, parent):
-        """Create title and language selector."""
-        headerFrame = tk.Frame(parent, bg="#2C3E50")
-        headerFrame.pack(fill=tk.X, pady=(0, 10))
-        
-        titleLabel = tk.Label(
-            headerFrame,
-            text=self._translate('title'),
-            font=("Arial", 18, "bold"),
-            bg="#2C3E50",
-            fg="white"
-        )
-        titleLabel.pack(side=tk.LEFT, padx=(0, 20))
-        
-        langFrame = tk.Frame(headerFrame, bg="#2C3E50")
-        langFrame.pack(side=tk.RIGHT)
-        
-        tk.Label(
-            langFrame,
-            text=self._translate('language'),
-            bg="#2C3E50",
-            fg="white"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        langMenu = ttk.Combobox(
-            langFrame,
-            textvariable=self.languageVar,
-            values=['en', 'fr'],
-            state="readonly",
-            width=8
-        )
-        langMenu.set(self.currentLanguage)
-        langMenu.pack(side=tk.LEFT)
-        langMenu.bind("<<ComboboxSelected>>", self._changeLanguage)
-        
-    def _createFilesSection(self, parent):
-        """Create file selection section."""
-        filesFrame = tk.LabelFrame(
-            parent,
-            text=self._translate('input_files'),
-            bg="#34495E",
-            fg="white",
-            font=("Arial", 11, "bold"),
-            padx=10,
-            pady=10
-        )
-        filesFrame.pack(fill=tk.BOTH, expand=False, pady=5)
-        
-        # Listbox with scrollbar
-        listContainer = tk.Frame(filesFrame, bg="#34495E")
-        listContainer.pack(fill=tk.BOTH, expand=False)
-        
-        scrollbar = tk.Scrollbar(listContainer)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.listboxFiles = Listbox(
-            listContainer,
-            selectmode=MULTIPLE,
-            height=4,
-            yscrollcommand=scrollbar.set,
-            bg="#ECF0F1",
-            font=("Courier", 9)
-        )
-        self.listboxFiles.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.listboxFiles.yview)
-        
-        # Action buttons
-        buttonFrame = tk.Frame(filesFrame, bg="#34495E")
-        buttonFrame.pack(pady=5)
-        
-        buttons = [
-            (self._translate('add_pdfs'), self._selectInputFiles, "#3498DB"),
-            (self._translate('remove'), self._removeSelectedFiles, "#E74C3C"),
-            (self._translate('move_up'), self._moveUp, "#95A5A6"),
-            (self._translate('move_down'), self._moveDown, "#95A5A6"),
-            (self._translate('clear_all'), self._clearAll, "#C0392B")
-        ]
-        
-        for text, command, color in buttons:
-            tk.Button(
-                buttonFrame,
-                text=text,
-                command=command,
-                bg=color,
-                fg="white",
-                padx=10,
-                pady=5
-            ).pack(side=tk.LEFT, padx=2)
-        
-    def _createBasicParamsSection(self, parent):
-        """Create basic layout parameters section."""
-        paramsFrame = tk.LabelFrame(
-            parent,
-            text=self._translate('layout_params'),
-            bg="#34495E",
-            fg="white",
-            font=("Arial", 11, "bold"),
-            padx=10,
-            pady=10
-        )
-        paramsFrame.pack(fill=tk.X, pady=5)
-        
-        # Layout mode selector
-        modeFrame = tk.Frame(paramsFrame, bg="#34495E")
-        modeFrame.pack(fill=tk.X, pady=5)
-        
-        tk.Label(
-            modeFrame,
-            text=self._translate('layout_mode'),
-            bg="#34495E",
-            fg="white",
-            width=15,
-            anchor='w'
-        ).pack(side=tk.LEFT, padx=5)
-        
-        modeMenu = ttk.Combobox(
-            modeFrame,
-            textvariable=self.layoutMode,
-            values=['grid', 'target_pages'],
-            state="readonly",
-            width=25
-        )
-        modeMenu.pack(side=tk.LEFT, padx=5)
-        modeMenu.bind("<<ComboboxSelected>>", self._toggleLayoutMode)
-        
-        # Create frames for both modes
-        self.gridControlsFrame = tk.Frame(paramsFrame, bg="#34495E")
-        self.targetPagesFrame = tk.Frame(paramsFrame, bg="#34495E")
-        
-        # Grid mode controls
-        self._createGridControls()
-        
-        # Target pages mode controls
-        self._createTargetPagesControls()
-        
-        # Show grid mode by default
-        self.gridControlsFrame.pack(fill=tk.X)
-        
-        # Separation (common to both modes)
-        self._createSeparationControl(paramsFrame)
-    
-    def _createGridControls(self):
-        """Create grid mode controls (rows and columns)."""
-        # Rows
-        rowFrame = tk.Frame(self.gridControlsFrame, bg="#34495E")
-        rowFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            rowFrame,
-            text=self._translate('rows'),
-            bg="#34495E",
-            fg="white",
-            width=15,
-            anchor='w'
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            rowFrame,
-            text="−",
-            command=lambda: self._adjustValue(self.rows, -1, 1, None),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        self.rowsLabel = tk.Label(
-            rowFrame,
-            text="1",
-            bg="#ECF0F1",
-            width=5,
-            relief=tk.SUNKEN
-        )
-        self.rowsLabel.pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            rowFrame,
-            text="+",
-            command=lambda: self._adjustValue(self.rows, 1, 1, None),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        # Columns
-        colFrame = tk.Frame(self.gridControlsFrame, bg="#34495E")
-        colFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            colFrame,
-            text=self._translate('columns'),
-            bg="#34495E",
-            fg="white",
-            width=15,
-            anchor='w'
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            colFrame,
-            text="−",
-            command=lambda: self._adjustValue(self.cols, -1, 1, None),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        self.colsLabel = tk.Label(
-            colFrame,
-            text="1",
-            bg="#ECF0F1",
-            width=5,
-            relief=tk.SUNKEN
-        )
-        self.colsLabel.pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            colFrame,
-            text="+",
-            command=lambda: self._adjustValue(self.cols, 1, 1, None),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-    
-    def _createTargetPagesControls(self):
-        """Create target pages mode controls."""
-        targetFrame = tk.Frame(self.targetPagesFrame, bg="#34495E")
-        targetFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            targetFrame,
-            text=self._translate('target_pages'),
-            bg="#34495E",
-            fg="white",
-            width=15,
-            anchor='w'
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            targetFrame,
-            text="−",
-            command=lambda: self._adjustValue(self.targetPages, -1, 1, 1000),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        self.targetLabel = tk.Label(
-            targetFrame,
-            text="1",
-            bg="#ECF0F1",
-            width=5,
-            relief=tk.SUNKEN
-        )
-        self.targetLabel.pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            targetFrame,
-            text="+",
-            command=lambda: self._adjustValue(self.targetPages, 1, 1, 1000),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        # Calculated grid info
-        self.calcGridLabel = tk.Label(
-            self.targetPagesFrame,
-            text="",
-            bg="#34495E",
-            fg="#3498DB",
-            font=("Arial", 9, "italic")
-        )
-        self.calcGridLabel.pack(fill=tk.X, pady=3)
-    
-    def _createSeparationControl(self, parent):
-        """Create separation pages control."""
-        sepFrame = tk.Frame(parent, bg="#34495E")
-        sepFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            sepFrame,
-            text=self._translate('separation'),
-            bg="#34495E",
-            fg="white",
-            width=15,
-            anchor='w'
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            sepFrame,
-            text="−",
-            command=lambda: self._adjustValue(self.separation, -1, 0, 20),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-        
-        self.sepLabel = tk.Label(
-            sepFrame,
-            text="0",
-            bg="#ECF0F1",
-            width=5,
-            relief=tk.SUNKEN
-        )
-        self.sepLabel.pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            sepFrame,
-            text="+",
-            command=lambda: self._adjustValue(self.separation, 1, 0, 20),
-            bg="#95A5A6",
-            fg="white",
-            width=3
-        ).pack(side=tk.LEFT, padx=2)
-    
-    def _toggleLayoutMode(self, event=None):
-        """Switch between grid and target pages mode."""
-        if self.layoutMode.get() == 'grid':
-            self.targetPagesFrame.pack_forget()
-            self.gridControlsFrame.pack(fill=tk.X, before=self.targetPagesFrame.master.winfo_children()[-1])
-        else:  # target_pages
-            self.gridControlsFrame.pack_forget()
-            self.targetPagesFrame.pack(fill=tk.X, before=self.targetPagesFrame.master.winfo_children()[-1])
-            self._updateCalculatedGrid()
-    
-    def _updateCalculatedGrid(self):
-        """Update the calculated grid display for target pages mode."""
-        inputPdfs = list(self.listboxFiles.get(0, tk.END))
-        if not inputPdfs:
-            self.calcGridLabel.config(text="")
-            return
-        
-        try:
-            totalPages = _countTotalPages(inputPdfs, self.separation.get())
-            rows, cols = calculateOptimalGrid(totalPages, self.targetPages.get())
-            self.calcGridLabel.config(text=self._translate('calculated_grid').format(rows, cols))
-        except:
-            self.calcGridLabel.config(text="")
+        self.limit = limit
+        self.running = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
     
-    def _adjustValue(self, var, delta, minVal, maxVal):
+    def acquire(self) -> Future:
         """
-        Adjust numeric value with +/- buttons.
+        Request a slot.
         
-        Args:
-            var: IntVar to modify
-            delta: Amount to add/subtract
-            minVal: Minimum allowed value
-            maxVal: Maximum allowed value (None for no limit)
+        Returns:
+            Future completed when the slot is granted. Cancel it to give up
+            waiting; if cancel() fails the slot was granted and must be
+            released
         """
-        newVal = var.get() + delta
-        if maxVal is None or minVal <= newVal <= maxVal:
-            if newVal >= minVal:
-                var.set(newVal)
-                
-                # Update corresponding label
-                if var == self.rows:
-                    self.rowsLabel.config(text=str(newVal))
-                elif var == self.cols:
-                    self.colsLabel.config(text=str(newVal))
-                elif var == self.separation:
-                    self.sepLabel.config(text=str(newVal))
-                    if self.layoutMode.get() == 'target_pages':
-                        self._updateCalculatedGrid()
-                elif var == self.targetPages:
-                    self.targetLabel.config(text=str(newVal))
-                    self._updateCalculatedGrid()
-            
-    def _createAdvancedOptionsSection(self, parent):
-        """Create advanced options section."""
-        advancedFrame = tk.LabelFrame(
-            parent,
-            text=self._translate('advanced_options'),
-            bg="#34495E",
-            fg="white",
-            font=("Arial", 11, "bold"),
-            padx=10,
-            pady=10
-        )
-        advancedFrame.pack(fill=tk.X, pady=5)
-        
-        # Page order
-        orderFrame = tk.Frame(advancedFrame, bg="#34495E")
-        orderFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            orderFrame,
-            text=self._translate('page_order'),
-            bg="#34495E",
-            fg="white"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        orderMenu = ttk.Combobox(
-            orderFrame,
-            textvariable=self.pageOrder,
-            values=[self._translate('horizontal'), self._translate('vertical')],
-            state="readonly",
-            width=12
-        )
-        orderMenu.pack(side=tk.LEFT, padx=5)
-        
-        # Quality preset
-        qualityFrame = tk.Frame(advancedFrame, bg="#34495E")
-        qualityFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            qualityFrame,
-            text=self._translate('quality_preset'),
-            bg="#34495E",
-            fg="white"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        qualityMenu = ttk.Combobox(
-            qualityFrame,
-            textvariable=self.quality,
-            values=[
-                self._translate('low'),
-                self._translate('medium'),
-                self._translate('high'),
-                self._translate('maximum')
-            ],
-            state="readonly",
-            width=12
-        )
-        qualityMenu.pack(side=tk.LEFT, padx=5)
-        
-        # Grid options
-        gridOptFrame = tk.Frame(advancedFrame, bg="#34495E")
-        gridOptFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            gridOptFrame,
-            text=self._translate('grid'),
-            bg="#34495E",
-            fg="white"
-        ).pack(side=tk.LEFT, padx=5)
-        
-        gridMenu = ttk.Combobox(
-            gridOptFrame,
-            textvariable=self.gridOption,
-            values=[self._translate('show'), self._translate('hide')],
-            state="readonly",
-            width=8
-        )
-        gridMenu.pack(side=tk.LEFT, padx=5)
-        
-        self.colorDisplay = tk.Label(
-            gridOptFrame,
-            width=3,
-            bg=self.gridColor.get(),
-            relief=tk.RAISED
-        )
-        self.colorDisplay.pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            gridOptFrame,
-            text=self._translate('choose_color'),
-            command=self._chooseGridColor,
-            bg="#9B59B6",
-            fg="white",
-            padx=8,
-            pady=3
-        ).pack(side=tk.LEFT, padx=5)
-        
-        # Checkboxes
-        checkFrame = tk.Frame(advancedFrame, bg="#34495E")
-        checkFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Checkbutton(
-            checkFrame,
-            text=self._translate('maintain_aspect'),
-            variable=self.maintainAspect,
-            bg="#34495E",
-            fg="white",
-            selectcolor="#2C3E50"
-        ).pack(side=tk.LEFT, padx=10)
-        
-        tk.Checkbutton(
-            checkFrame,
-            text=self._translate('add_page_numbers'),
-            variable=self.addPageNumbers,
-            bg="#34495E",
-            fg="white",
-            selectcolor="#2C3E50"
-        ).pack(side=tk.LEFT, padx=10)
-        
-    def _createOutputSection(self, parent):
-        """Create output options section."""
-        outputFrame = tk.LabelFrame(
-            parent,
-            text=self._translate('output_options'),
-            bg="#34495E",
-            fg="white",
-            font=("Arial", 11, "bold"),
-            padx=10,
-            pady=10
-        )
-        outputFrame.pack(fill=tk.X, pady=5)
-        
-        # Output folder
-        folderFrame = tk.Frame(outputFrame, bg="#34495E")
-        folderFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            folderFrame,
-            text=self._translate('folder'),
-            bg="#34495E",
-            fg="white",
-            width=10
-        ).pack(side=tk.LEFT)
-        
-        self.folderEntry = tk.Entry(folderFrame, textvariable=self.outputFolder)
-        self.folderEntry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        self.folderEntry.delete(0, tk.END)
-        self.folderEntry.insert(0, self._translate('default_folder'))
-        self.folderEntry.config(fg='gray')
-        self.folderEntry.bind('<FocusIn>', self._clearPlaceholderFolder)
-        self.folderEntry.bind('<FocusOut>', self._restorePlaceholderFolder)
-        
-        tk.Button(
-            folderFrame,
-            text=self._translate('browse'),
-            command=self._selectOutputFolder,
-            bg="#1ABC9C",
-            fg="white",
-            padx=10,
-            pady=5
-        ).pack(side=tk.LEFT, padx=5)
-        
-        # PDF name
-        nameFrame = tk.Frame(outputFrame, bg="#34495E")
-        nameFrame.pack(fill=tk.X, pady=3)
-        
-        tk.Label(
-            nameFrame,
-            text=self._translate('filename'),
-            bg="#34495E",
-            fg="white",
-            width=10
-        ).pack(side=tk.LEFT)
-        
-        self.nameEntry = tk.Entry(nameFrame, textvariable=self.pdfName)
-        self.nameEntry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        self.nameEntry.delete(0, tk.END)
-        self.nameEntry.insert(0, self._translate('default_filename'))
-        self.nameEntry.config(fg='gray')
-        self.nameEntry.bind('<FocusIn>', self._clearPlaceholderName)
-        self.nameEntry.bind('<FocusOut>', self._restorePlaceholderName)
-        
-    def _createActionButtons(self, parent):
-        """Create preview and create PDF action buttons."""
-        actionFrame = tk.Frame(parent, bg="#2C3E50")
-        actionFrame.pack(pady=15)
-        
-        tk.Button(
-            actionFrame,
-            text=self._translate('preview'),
-            command=self._previewPdf,
-            bg="#E67E22",
-            fg="white",
-            padx=20,
-            pady=10,
-            font=("Arial", 11, "bold")
-        ).pack(side=tk.LEFT, padx=10)
-        
-        tk.Button(
-            actionFrame,
-            text=self._translate('create_pdf'),
-            command=self._createFinalOutput,
-            bg="#27AE60",
-            fg="white",
-            padx=20,
-            pady=10,
-            font=("Arial", 11, "bold")
-        ).pack(side=tk.LEFT, padx=10)
-        
-    def _createStatusBar(self):
-        """Create status bar at bottom of window."""
-        self.statusBar = tk.Label(
-            self.root,
-            text=self._translate('ready'),
-            bd=1,
-            relief=tk.SUNKEN,
-            anchor=tk.W,
-            bg="#34495E",
-            fg="white"
-        )
-        self.statusBar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-    def _updateStatus(self, message):
+        slot = Future()
+        with self._lock:
+            self._waiters.append(slot)
+        self._grant()
+        return slot
+    
+    def release(self) -> None:
+        """Give back a granted slot."""
+        with self._lock:
+            self.running -= 1
+        self._grant()
+    
+    def resize(self, limit: int) -> None:
         """
-        Update status bar message.
+        Change the limit, starting waiting jobs if it grew.
         
         Args:
-            message: Status message to display
+            limit: Number of jobs allowed to run at once
         """
-        self.statusBar.config(text=message)
-        self.root.update_idletasks()
-        
-    def _selectInputFiles(self):
-        """Open file dialog to select PDF files."""
-        files = filedialog.askopenfilenames(
-            filetypes=[("PDF Files", "*.pdf"), ("All Files", "*.*")]
-        )
-        for file in files:
-            if file not in self.listboxFiles.get(0, tk.END):
-                self.listboxFiles.insert(tk.END, file)
-        
-        self._updateStatus(self._translate('added_files').format(len(files)))
-        
-        if self.layoutMode.get() == 'target_pages':
-            self._updateCalculatedGrid()
-        
-    def _removeSelectedFiles(self):
-        """Remove selected files from the list."""
-        selected = self.listboxFiles.curselection()
-        for index in reversed(selected):
-            self.listboxFiles.delete(index)
-        
-        self._updateStatus(self._translate('removed_files'))
-        
-        if self.layoutMode.get() == 'target_pages':
-            self._updateCalculatedGrid()
+        with self._lock:
+            self.limit = limit
+        self._grant()
+    
+    def _grant(self) -> None:
+        """Hand free slots to the oldest waiters."""
+        granted = []
+        with self._lock:
+            while self._waiters and self.running < self.limit:
+                slot = self._waiters.popleft()
+                # Marks the slot as running, so it can no longer be cancelled
+                if slot.set_running_or_notify_cancel():
+                    self.running += 1
+                    granted.append(slot)
+        # Completing a future runs its callbacks, keep them out of the lock
+        for slot in granted:
+            slot.set_result(None)
+
+
+# Limits shared by every async caller (see setAsyncConcurrency)
+_asyncMaxJobs = max(1, (os.cpu_count() or 1) // 2)
+_asyncMaxWorkers = max(1, (os.cpu_count() or 1) // _asyncMaxJobs)
+_asyncGate = _JobGate(_asyncMaxJobs)
+_asyncLock = threading.Lock()
+
+
+def setAsyncConcurrency(maxJobs: int, maxWorkersPerJob: Optional[int] = None) -> None:
+    """
+    Set the global limits shared by every compactPdfsAsync caller.
+    
+    At most maxJobs compactions run at once across all callers and event
+    loops; later jobs wait for a free slot in submission order. Each job's
+    workers and composeWorkers are capped at maxWorkersPerJob, so one huge
+    job cannot take every core. Jobs already running keep their slot and
+    worker count; after lowering maxJobs, queued jobs wait until fewer than
+    maxJobs run, so the limit holds across the change.
+    
+    Args:
+        maxJobs: Number of compactions run concurrently
+        maxWorkersPerJob: Render/compose processes per job (None shares the
+            CPU count evenly between maxJobs jobs)
+    """
+    global _asyncMaxJobs, _asyncMaxWorkers
+    
+    with _asyncLock:
+        _asyncMaxJobs = max(1, maxJobs)
+        if maxWorkersPerJob is None:
+            maxWorkersPerJob = (os.cpu_count() or 1) // _asyncMaxJobs
+        _asyncMaxWorkers = max(1, maxWorkersPerJob)
+        _asyncGate.resize(_asyncMaxJobs)
+
+
+def _runJob(slot: Future, function: Callable, *args, **kwargs) -> Future:
+    """
+    Run a function on its own thread once its gate slot is granted.
+    
+    Args:
+        slot: Slot returned by _asyncGate.acquire()
+        function: Function to run
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
         
-    def _moveUp(self):
-        """Move selected file up in the list."""
-        selected = self.listboxFiles.curselection()
-        if not selected or selected[0] == 0:
+    Returns:
+        Future of the function's result. Cancelling it before the slot is
+        granted drops the job; the slot is released when the job ends
+    """
+    job = Future()
+    
+    def run() -> None:
+        # Free the slot before completing the job, so it is free by the time
+        # the caller sees the job end
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            _asyncGate.release()
+            job.set_exception(error)
+        else:
+            _asyncGate.release()
+            job.set_result(result)
+    
+    def start(_) -> None:
+        if slot.cancelled():
             return
-        
-        for index in selected:
-            item = self.listboxFiles.get(index)
-            self.listboxFiles.delete(index)
-            self.listboxFiles.insert(index - 1, item)
-            self.listboxFiles.selection_set(index - 1)
-            
-    def _moveDown(self):
-        """Move selected file down in the list."""
-        selected = self.listboxFiles.curselection()
-        if not selected or selected[-1] == self.listboxFiles.size() - 1:
+        if not job.set_running_or_notify_cancel():
+            # The job was cancelled while its slot was being granted
+            _asyncGate.release()
             return
-        
-        for index in reversed(selected):
-            item = self.listboxFiles.get(index)
-            self.listboxFiles.delete(index)
-            self.listboxFiles.insert(index + 1, item)
-            self.listboxFiles.selection_set(index + 1)
-            
-    def _clearAll(self):
-        """Clear all files from the list after confirmation."""
-        if self.listboxFiles.size() > 0:
-            if messagebox.askyesno(
-                self._translate('confirm'),
-                self._translate('clear_all_confirm')
-            ):
-                self.listboxFiles.delete(0, tk.END)
-                self._updateStatus(self._translate('cleared_files'))
-                
-                if self.layoutMode.get() == 'target_pages':
-                    self._updateCalculatedGrid()
-                
-    def _chooseGridColor(self):
-        """Open color picker for grid color selection."""
-        color = colorchooser.askcolor(color=self.gridColor.get())[1]
-        if color:
-            self.gridColor.set(color)
-            self.colorDisplay.config(bg=color)
-            
-    def _applyQualityPreset(self):
-        """
-        Get compression percentage from quality preset.
-        
-        Returns:
-            Integer compression percentage (25-100)
-        """
-        presets = {
-            self._translate('low'): 50,
-            self._translate('medium'): 75,
-            self._translate('high'): 100,
-            self._translate('maximum'): 100
-        }
-        return presets.get(self.quality.get(), 100)
-        
-    def _selectOutputFolder(self):
-        """Open folder selection dialog."""
-        folder = filedialog.askdirectory()
-        if folder:
-            self.outputFolder.set(folder)
-            self.folderEntry.delete(0, tk.END)
-            self.folderEntry.insert(0, folder)
-            self.folderEntry.config(fg='black')
-            
-    def _clearPlaceholderFolder(self, event):
-        """Clear folder placeholder text on focus."""
-        currentText = self.folderEntry.get()
-        if currentText == self._translate('default_folder'):
-            self.folderEntry.delete(0, tk.END)
-            self.folderEntry.config(fg='black')
-            
-    def _restorePlaceholderFolder(self, event):
-        """Restore folder placeholder text if empty."""
-        if not self.folderEntry.get():
-            self.folderEntry.insert(0, self._translate('default_folder'))
-            self.folderEntry.config(fg='gray')
-            
-    def _clearPlaceholderName(self, event):
-        """Clear filename placeholder text on focus."""
-        currentText = self.nameEntry.get()
-        if currentText == self._translate('default_filename'):
-            self.nameEntry.delete(0, tk.END)
-            self.nameEntry.config(fg='black')
-            
-    def _restorePlaceholderName(self, event):
-        """Restore filename placeholder text if empty."""
-        if not self.nameEntry.get():
-            self.nameEntry.insert(0, self._translate('default_filename'))
-            self.nameEntry.config(fg='gray')
+        threading.Thread(target=run, name="compactPdfs").start()
     
-    def _getConfigFromGui(self):
-        """
-        Build CompactionConfig from GUI settings.
-        
-        Returns:
-            CompactionConfig object with current GUI settings
-        """
-        # Parse grid color
-        try:
-            colorHex = self.gridColor.get()
-            gridColor = tuple(int(colorHex[i:i+2], 16)/255 for i in (1, 3, 5))
-        except:
-            gridColor = (0, 0, 0)
-        
-        # Determine page order
-        pageOrderValue = (
-            PageOrder.HORIZONTAL 
-            if self.pageOrder.get() == self._translate('horizontal')
-            else PageOrder.VERTICAL
-        )
+    # Giving up on the job while it waits also gives up its place in line
+    job.add_done_callback(lambda _: slot.cancel())
+    slot.add_done_callback(start)
+    return job
+
+
+async def iterCompactPdfsAsync(
+    inputPdfPaths: Union[PdfSource, PdfInput, List[Union[PdfSource, PdfInput]]],
+    config: Optional[CompactionConfig] = None,
+    output: Optional[BinaryIO] = None
+) -> AsyncIterator[Union[CompactionProgress, CompactionResult]]:
+    """
+    Run compactPdfs on its own thread, streaming its progress.
+    
+    The job waits for a slot under the global limits (see
+    setAsyncConcurrency) and runs off the event loop. A CompactionProgress
+    is yielded as soon as each output page is composed, and the
+    CompactionResult is the last item.
+    
+    To stream the output while it is being written, set
+    config.flushEverySheets: the first progress.bytesFlushed bytes of the
+    output file are then final (later flushes only append) and hold the
+    first progress.sheetsFlushed pages, so they can be sent on right away.
+    Without flushing, nothing is written until the end, because a PDF is
+    only readable once its cross-reference table is saved; individual pages
+    are never yielded as bytes, as a page's images and fonts are shared
+    objects that can't be sent separately.
+    
+    Cancelling the consuming task, or closing the generator early with
+    aclose(), stops the job at the next output page and waits for it to release its
+    documents and worker processes; a job still waiting for a slot is
+    simply dropped. No output file is left behind.
+    
+    Args:
+        inputPdfPaths: Inputs, as for compactPdfs
+        config: CompactionConfig object (uses defaults if None); its
+            workers and composeWorkers are capped by the global limits
+        output: Writable binary stream to write the PDF to instead of a file
         
-        # Determine layout mode
-        layoutModeValue = (
-            LayoutMode.GRID
-            if self.layoutMode.get() == 'grid'
-            else LayoutMode.TARGET_PAGES
-        )
+    Yields:
+        CompactionProgress after each output page, then the CompactionResult
         
-        # Get output folder
-        outputDir = self.outputFolder.get()
-        if not outputDir or outputDir in [
-            self._translate('default_folder'),
-            TRANSLATIONS['en']['default_folder'],
-            TRANSLATIONS['fr']['default_folder']
-        ]:
-            outputDir = None
-        
-        # Get filename
-        filename = self.pdfName.get()
-        if not filename or filename in [
-            self._translate('default_filename'),
-            TRANSLATIONS['en']['default_filename'],
-            TRANSLATIONS['fr']['default_filename']
-        ]:
-            filename = None
-        
-        return CompactionConfig(
-            rows=self.rows.get(),
-            columns=self.cols.get(),
-            targetPages=self.targetPages.get(),
-            layoutMode=layoutModeValue,
-            compression=self._applyQualityPreset(),
-            separationPages=self.separation.get(),
-            pageOrder=pageOrderValue,
-            maintainAspectRatio=self.maintainAspect.get(),
-            showGrid=(self.gridOption.get() == self._translate('show')),
-            gridColor=gridColor,
-            addPageNumbers=self.addPageNumbers.get(),
-            outputDir=outputDir,
-            outputFilename=filename
-        )
+    Raises:
+        Any exception raised by compactPdfs
+    """
+    with _asyncLock:
+        maxWorkers = _asyncMaxWorkers
+    config = replace(config) if config is not None else CompactionConfig()
+    config.workers = min(config.workers, maxWorkers)
+    config.composeWorkers = min(config.composeWorkers, maxWorkers)
     
-    def _previewPdf(self):
-        """Generate and display preview of first output page."""
-        inputPdfs = list(self.listboxFiles.get(0, tk.END))
-        if not inputPdfs:
-            messagebox.showerror(
-                self._translate('error'),
-                self._translate('no_files_error')
-            )
-            return
-            
-        try:
-            self._updateStatus(self._translate('preview_generating'))
-            
-            config = self._getConfigFromGui()
-            rows, columns = _getLayoutParameters(config, inputPdfs)
-            
-            cellWidth = A4_WIDTH / columns
-            cellHeight = A4_HEIGHT / rows
-            
-            # Open documents
-            docs = [fitz.open(pdf) for pdf in inputPdfs]
-            
-            # Merge pages
-            allPages = mergePdfPages(docs, config.compression, config.separationPages)
-            previewPages = allPages[:columns * rows]
-            
-            # Create preview document
-            newDoc = fitz.open()
-            newPage = newDoc.new_page(width=A4_WIDTH, height=A4_HEIGHT)
-            
-            # Place pages
-            for idx, pixmap in enumerate(previewPages):
-                if pixmap is not None:
-                    _placePageOnGrid(
-                        newPage,
-                        pixmap,
-                        idx,
-                        columns,
-                        rows,
-                        cellWidth,
-                        cellHeight,
-                        config.pageOrder,
-                        config.maintainAspectRatio,
-                        config.addPageNumbers
-                    )
-            
-            # Draw grid if enabled
-            if config.showGrid:
-                _drawGrid(newPage, columns, rows, cellWidth, cellHeight, config.gridColor)
-            
-            # Close input documents
-            for doc in docs:
-                doc.close()
-            
-            # Save to temp file and render
-            tempDir = tempfile.gettempdir()
-            tempPdf = os.path.join(tempDir, "preview_temp.pdf")
-            newDoc.save(tempPdf)
-            
-            pixPreview = newDoc[0].get_pixmap()
-            newDoc.close()
-            
-            # Create PIL image
-            img = Image.frombytes(
-                "RGB",
-                [pixPreview.width, pixPreview.height],
-                pixPreview.samples
-            )
-            img.thumbnail((800, 600), Image.Resampling.LANCZOS)
-            
-            # Show preview window
-            previewWin = Toplevel(self.root)
-            previewWin.title(self._translate('preview_title'))
-            previewWin.configure(bg="#2C3E50")
-            
-            canvas = Canvas(
-                previewWin,
-                width=img.width,
-                height=img.height,
-                bg="#2C3E50"
-            )
-            canvas.pack(padx=10, pady=10)
-            
-            imgTk = ImageTk.PhotoImage(img)
-            canvas.create_image(0, 0, anchor=tk.NW, image=imgTk)
-            canvas.image = imgTk
-            
-            # Clean up temp file
-            try:
-                os.remove(tempPdf)
-            except:
-                pass
-                
-            self._updateStatus(self._translate('preview_success'))
-            
-        except Exception as e:
-            messagebox.showerror(
-                self._translate('error'),
-                f"{self._translate('preview_failed')}:\n{str(e)}"
-            )
-            self._updateStatus(self._translate('preview_failed'))
-    
-    def _createFinalOutput(self):
-        """Create final PDF output using core library."""
-        inputPdfs = list(self.listboxFiles.get(0, tk.END))
-        if not inputPdfs:
-            messagebox.showerror(
-                self._translate('error'),
-                self._translate('no_files_error')
-            )
-            return
-            
-        try:
-            self._updateStatus(self._translate('creating_pdf'))
-            
-            config = self._getConfigFromGui()
-            outputPath = compactPdfs(inputPdfs, config)
-            
-            self._updateStatus(
-                self._translate('pdf_saved').format(os.path.basename(outputPath))
-            )
-            
-            messagebox.showinfo(
-                self._translate('success'),
-                f"{self._translate('pdf_created')}\n\n"
-                f"{self._translate('saved_to')}\n{outputPath}"
-            )
-            
-        except Exception as e:
-            messagebox.showerror(
-                self._translate('error'),
-                f"{self._translate('pdf_failed')}:\n{str(e)}"
-            )
-            self._updateStatus(self._translate('pdf_failed'))
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    cancelEvent = threading.Event()
+    
+    def onProgress(progress: CompactionProgress) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, progress)
+    
+    concurrentFuture = _runJob(
+        _asyncGate.acquire(),
+        compactPdfs,
+        inputPdfPaths,
+        config,
+        onProgress,
+        cancelEvent,
+        returnResult=True,
+        output=output
+    )
+    future = asyncio.wrap_future(concurrentFuture, loop=loop)
+    # Progress is queued before the job returns, so this marks the end
+    future.add_done_callback(lambda _: events.put_nowait(None))
+    
+    try:
+        while True:
+            progress = await events.get()
+            if progress is None:
+                break
+            yield progress
+        yield await future
+    finally:
+        if not future.done():
+            cancelEvent.set()
+            if not concurrentFuture.cancel():
+                # Already running: it stops at the next output page
+                await asyncio.wait({future})
+        if future.done() and not future.cancelled():
+            future.exception()  # Mark as retrieved
 
 
-def launchGui():
+async def compactPdfsAsync(
+    inputPdfPaths: Union[PdfSource, PdfInput, List[Union[PdfSource, PdfInput]]],
+    config: Optional[CompactionConfig] = None,
+    progressCallback: Optional[Callable[[CompactionProgress], object]] = None,
+    returnResult: bool = False,
+    output: Optional[BinaryIO] = None
+) -> Union[str, BinaryIO, CompactionResult]:
     """
-    Launch the PDF Compactor GUI application.
+    Async version of compactPdfs for event loops such as web services.
     
-    This is the main entry point for the GUI. Call this function to start
-    the interactive PDF compaction interface.
+    Runs under the global limits shared by all callers (see
+    setAsyncConcurrency and iterCompactPdfsAsync). Cancelling the awaiting
+    task cancels the compaction.
     
+    Args:
+        inputPdfPaths: Inputs, as for compactPdfs
+        config: CompactionConfig object (uses defaults if None)
+        progressCallback: Called on the event loop with a CompactionProgress
+            after each output page; may be a coroutine function
+        returnResult: If True, return a CompactionResult instead of the path
+        output: Writable binary stream to write the PDF to instead of a file
+        
+    Returns:
+        Path to the created output PDF file, the output stream when one was
+        given, or a CompactionResult if returnResult is True
+        
     Example:
-        >>> from vicutils.pdf import launchGui
-        >>> launchGui()
+        >>> async def handle(upload: bytes) -> bytes:
+        ...     buffer = io.BytesIO()
+        ...     await compactPdfsAsync(upload, CompactionConfig(rows=2, columns=2), output=buffer)
+        ...     return buffer.getvalue()
+    """
+    result = None
+    items = iterCompactPdfsAsync(inputPdfPaths, config, output)
+    try:
+        async for item in items:
+            if isinstance(item, CompactionResult):
+                result = item
+            elif progressCallback is not None:
+                outcome = progressCallback(item)
+                if inspect.isawaitable(outcome):
+                    await outcome
+    finally:
+        await items.aclose()
+    
+    if returnResult:
+        return result
+    return output if output is not None else result.outputPath
+
+
+# GUI names that used to live in this module, loaded from the gui module on
+# first access so the engine never imports tkinter or PIL
+_GUI_NAMES = ("TRANSLATIONS", "PREVIEW_CACHE_SIZE", "PdfCompactorApp", "launchGui")
+
+
+def __getattr__(name: str):
+    """
+    Resolve GUI names moved to the gui module.
+    
+    Args:
+        name: Attribute name
+        
+    Returns:
+        The attribute from vicutils.pdf.gui
+        
+    Raises:
+        AttributeError: If the name is not a GUI name either
     """
-    root = tk.Tk()
-    app = PdfCompactorApp(root)
-    root.mainloop()
\ No newline at end of file
+    if name in _GUI_NAMES:
+        from . import gui
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")